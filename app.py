@@ -6,17 +6,26 @@ This tool analyzes resumes and provides comprehensive recruiter-style feedback.
 """
 
 import streamlit as st
-import pandas as pd
-import numpy as np
-from collections import Counter
-import re
-from io import BytesIO
-import docx
-import PyPDF2
-from textblob import TextBlob
+import html
+import os
 import random
-import time
-from difflib import SequenceMatcher
+import sqlite3
+import uuid
+
+from resume_analyzer.cache import cached_analysis_stages, cached_analyze, cached_extract_upload
+from resume_analyzer.history import default_history
+from resume_analyzer.ingest import UploadLimits, UploadTooLarge, ingest
+from resume_analyzer.metrics import enable_log_lines, stage, trace
+from resume_analyzer.revisions import diff_reports
+from resume_analyzer.sandbox import ExtractionFailure
+from resume_analyzer.taxonomy import current_taxonomy
+
+# pandas and the NumPy-based ranking module are imported inside the views that
+# use them, so a worker serving single-resume analyses never loads them
+
+# Structured per-analysis timing lines on stderr
+if os.environ.get('RESUME_ANALYZER_METRICS_LOG'):
+    enable_log_lines()
 
 # Page Configuration
 st.set_page_config(
@@ -229,481 +238,607 @@ MOTIVATIONAL_QUOTES = [
     "💪 Your resume is not just a document, it's your career story!"
 ]
 
-# Tech Skills Database
-TECH_SKILLS = {
-    'programming_languages': ['python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'go', 'rust', 'scala', 'kotlin', 'typescript', 'php', 'swift', 'r', 'matlab', 'perl', 'bash', 'shell'],
-    'frontend': ['html', 'css', 'react', 'vue', 'angular', 'jquery', 'bootstrap', 'tailwind', 'sass', 'less', 'webpack', 'vite', 'nextjs', 'nuxt', 'svelte'],
-    'backend': ['node.js', 'express', 'django', 'flask', 'spring', 'laravel', 'rails', 'asp.net', 'fastapi', 'nestjs', 'gin', 'echo', 'play'],
-    'databases': ['sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch', 'cassandra', 'dynamodb', 'oracle', 'sqlite', 'mariadb', 'firebase'],
-    'cloud_devops': ['aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'terraform', 'ansible', 'ci/cd', 'git', 'github', 'gitlab', 'bitbucket', 'circleci', 'travis'],
-    'data_science': ['machine learning', 'deep learning', 'tensorflow', 'pytorch', 'pandas', 'numpy', 'scikit-learn', 'data analysis', 'statistics', 'nlp', 'computer vision', 'data visualization', 'tableau', 'power bi'],
-    'testing': ['unit testing', 'integration testing', 'selenium', 'pytest', 'jest', 'mocha', 'testing', 'test-driven development', 'tdd', 'BDD', 'cypress'],
-    'soft_skills': ['communication', 'teamwork', 'leadership', 'problem-solving', 'time management', 'agile', 'scrum', 'project management', 'collaboration', 'analytical', 'creative']
+# Verdict display styles (CSS class, icon)
+VERDICT_STYLES = {
+    "HIRE": ("verdict-hire", "✅"),
+    "BORDERLINE": ("verdict-borderline", "⚠️"),
+    "REJECT": ("verdict-reject", "❌")
 }
 
-# Job Role Categories
-JOB_ROLES = {
-    'Software Developer': {
-        'required_skills': ['python', 'java', 'javascript', 'git', 'sql', 'problem-solving'],
-        'preferred_skills': ['docker', 'aws', 'react', 'agile', 'ci/cd']
-    },
-    'Data Analyst': {
-        'required_skills': ['python', 'sql', 'data analysis', 'statistics', 'tableau'],
-        'preferred_skills': ['pandas', 'numpy', 'machine learning', 'power bi', 'excel']
-    },
-    'Data Scientist': {
-        'required_skills': ['python', 'machine learning', 'statistics', 'sql', 'data analysis'],
-        'preferred_skills': ['tensorflow', 'pytorch', 'deep learning', 'nlp', 'data visualization']
-    },
-    'Frontend Developer': {
-        'required_skills': ['html', 'css', 'javascript', 'react', 'git'],
-        'preferred_skills': ['vue', 'angular', 'typescript', 'webpack', 'testing']
-    },
-    'Backend Developer': {
-        'required_skills': ['python', 'java', 'sql', 'git', 'api'],
-        'preferred_skills': ['docker', 'aws', 'microservices', 'ci/cd', 'redis']
-    },
-    'Full Stack Developer': {
-        'required_skills': ['javascript', 'react', 'python', 'sql', 'git'],
-        'preferred_skills': ['docker', 'aws', 'node.js', 'mongodb', 'ci/cd']
-    },
-    'DevOps Engineer': {
-        'required_skills': ['docker', 'kubernetes', 'aws', 'ci/cd', 'terraform'],
-        'preferred_skills': ['python', 'linux', 'jenkins', 'ansible', 'git']
-    },
-    'Machine Learning Engineer': {
-        'required_skills': ['python', 'machine learning', 'tensorflow', 'sql', 'deep learning'],
-        'preferred_skills': ['pytorch', 'docker', 'aws', 'mlops', 'kubernetes']
-    }
-}
 
-# Comprehensive Action Verbs Organized by Category
-ACTION_VERBS = {
-    # Leadership & Management
-    'leadership': ['led', 'managed', 'directed', 'coordinated', 'supervised', 'mentored', 'coached', 'spearheaded', 'championed', 'overseen'],
-    
-    # Technical & Development
-    'technical': ['developed', 'created', 'designed', 'implemented', 'built', 'engineered', 'architected', 'coded', 'programmed', 'constructed', 'fabricated', 'assembled'],
-    
-    # Optimization & Improvement
-    'optimization': ['optimized', 'improved', 'enhanced', 'streamlined', 'refined', 'upgraded', 'transformed', 'modernized', 'revamped', 'restructured'],
-    
-    # Achievement & Results
-    'achievement': ['achieved', 'delivered', 'exceeded', 'accomplished', 'completed', 'finished', 'concluded', 'finalized', 'executed', 'produced'],
-    
-    # Analysis & Research
-    'analysis': ['analyzed', 'investigated', 'evaluated', 'assessed', 'examined', 'reviewed', 'studied', 'researched', 'audited', 'diagnosed', 'identified'],
-    
-    # Problem Solving
-    'problem_solving': ['solved', 'resolved', 'fixed', 'repaired', 'troubleshot', 'debugged', 'corrected', 'rectified', 'remedied', 'mitigated'],
-    
-    # Communication
-    'communication': ['communicated', 'presented', 'communicated', 'collaborated', 'negotiated', 'facilitated', 'mediated', 'presented', 'demonstrated', 'explained'],
-    
-    # Innovation & Creation
-    'innovation': ['innovated', 'pioneered', 'initiated', 'introduced', 'established', 'launched', 'instigated', 'originated', 'conceived', 'devised'],
-    
-    # Efficiency & Reduction
-    'efficiency': ['increased', 'decreased', 'reduced', 'lowered', 'minimized', 'maximized', 'eliminated', 'cut', 'slashed', 'condensed'],
-    
-    # Automation & Integration
-    'automation': ['automated', 'integrated', 'deployed', 'configured', 'installed', 'implemented', 'customized', 'modified', 'adapted', 'converted'],
-    
-    # Strategic & Planning
-    'strategic': ['planned', 'organized', 'strategized', 'prioritized', 'scheduled', 'forecasted', 'projected', 'budgeted', 'allocated', 'assigned'],
-    
-    # Training & Development
-    'training': ['trained', 'taught', 'educated', 'instructed', 'developed', 'certified', 'qualified', 'prepared', ' onboarded', 'guided']
+# What each kind of extraction failure means for the person who uploaded the file
+FAILURE_MESSAGES = {
+    'timeout': "took too long to read and was skipped. The file may be damaged; try exporting it again.",
+    'oom': "needed too much memory to read and was skipped. The file may be damaged; try exporting it again.",
+    'parse_error': "could not be read. Check that it is a valid PDF or DOCX file.",
+    'crash': "stopped the reader unexpectedly and was skipped. Try exporting it again."
 }
 
-# Flattened list for checking
-ACTION_VERBS_ALL = [verb for verbs in ACTION_VERBS.values() for verb in verbs]
-
-# Project Keywords
-PROJECT_KEYWORDS = ['project', 'developed', 'built', 'created', 'designed', 'implemented', 'launched', 'deployed', 'worked on']
 
-# Problem Solving Keywords
-PROBLEM_SOLVING_KEYWORDS = ['solved', 'optimized', 'improved', 'enhanced', 'reduced', 'increased', 'achieved', 'troubleshot', 'debugged', 'analyzed', 'identified', 'resolved']
+def failure_message(name, error):
+    """User-facing message for a file that could not be read"""
+    if isinstance(error, ExtractionFailure):
+        return f"{name} {FAILURE_MESSAGES.get(error.kind, 'could not be read.')} ({error})"
+    return f"Error reading {name}: {error}"
 
-# Learning Keywords
-LEARNING_KEYWORDS = ['learned', 'studied', 'certified', 'course', 'workshop', 'training', 'self-taught', 'bootcamp', 'mooc', 'udemy', 'coursera', 'internship']
 
-
-def extract_text_from_file(uploaded_file):
-    """Extract text from uploaded file (PDF or DOCX)"""
+def extract_text_from_file(upload, limits):
+    """Extract text from an ingested upload (PDF or DOCX)"""
     try:
-        if uploaded_file.name.endswith('.pdf'):
-            pdf_reader = PyPDF2.PdfReader(uploaded_file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-            return text
-        elif uploaded_file.name.endswith('.docx'):
-            doc = docx.Document(uploaded_file)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
-        else:
-            return str(uploaded_file.read(), 'utf-8')
+        return cached_extract_upload(upload, limits, workers=os.cpu_count())
     except Exception as e:
-        st.error(f"Error reading file: {e}")
+        st.error(failure_message(upload.name, e))
         return None
 
 
-def calculate_keyword_match(text, required_skills, preferred_skills):
-    """Calculate keyword matching with job description"""
-    text_lower = text.lower()
-    
-    matched_required = []
-    missing_required = []
-    matched_preferred = []
-    missing_preferred = []
-    
-    for skill in required_skills:
-        if skill.lower() in text_lower:
-            matched_required.append(skill)
+def render_score_section(report):
+    """ATS score card, verdict and experience level"""
+    ats_score = report.ats_score
+    shortlist_prob = report.shortlist_prob
+    experience_level = report.experience_level
+    verdict = report.verdict
+    verdict_class, verdict_icon = VERDICT_STYLES[verdict]
+    
+    st.markdown('<div class="section-header-green">📊 ATS Score & Recruiter Verdict</div>', unsafe_allow_html=True)
+    
+    # Score and Verdict
+    col_score, col_verdict = st.columns([1, 1.5])
+    
+    with col_score:
+        if ats_score >= 80:
+            score_color = '#38ef7d'
+            score_msg = '🌟 Excellent!'
+        elif ats_score >= 60:
+            score_color = '#f2c94c'
+            score_msg = '👍 Good!'
+        elif ats_score >= 40:
+            score_color = '#f2994a'
+            score_msg = '📝 Needs Work'
         else:
-            missing_required.append(skill)
+            score_color = '#f45c43'
+            score_msg = '🚨 Critical Issues'
+        
+        st.markdown(f"""
+        <div class="score-card" style="background: linear-gradient(135deg, {score_color} 0%, #11998e 100%);">
+            <h2>{ats_score}</h2>
+            <p>{score_msg}</p>
+            <p style="font-size: 0.9em;">/ 100</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.markdown(f"""
+        <div class="{verdict_class}" style="font-size: 1.8em;">
+            {verdict_icon} {verdict}
+        </div>
+        <p style="text-align: center; margin-top: 10px; font-weight: bold;">
+            Shortlist Probability: {shortlist_prob}%
+        </p>
+        """, unsafe_allow_html=True)
     
-    for skill in preferred_skills:
-        if skill.lower() in text_lower:
-            matched_preferred.append(skill)
+    with col_verdict:
+        # Experience Level
+        st.markdown(f"""
+        <div class="tip-card">
+            <h4>📈 Experience Level Assessment</h4>
+            <p style="font-size: 1.2em; font-weight: bold;">{experience_level}</p>
+            <p>Based on your skills and experience descriptions.</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Motivational quote
+        st.markdown(f"""
+        <div class="quote-box">
+            {random.choice(MOTIVATIONAL_QUOTES)}
+        </div>
+        """, unsafe_allow_html=True)
+
+
+def render_skill_section(report):
+    """Matched and missing skills with the skill and job description match"""
+    keyword_match = report.keyword_match
+    required_skills = report.required_skills
+    preferred_skills = report.preferred_skills
+    skill_match_pct = report.skill_match_pct
+    
+    # Skill Match Summary
+    st.markdown('<div class="section-header">🎯 Skill Match Analysis</div>', unsafe_allow_html=True)
+    
+    col_skills1, col_skills2 = st.columns(2)
+    
+    with col_skills1:
+        st.markdown("### ✅ Matched Skills")
+        if keyword_match['matched_required'] or keyword_match['matched_preferred']:
+            all_matched = keyword_match['matched_required'] + keyword_match['matched_preferred']
+            for skill in all_matched:
+                st.markdown(f'<span class="tech-term" style="background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);">{skill}</span>', unsafe_allow_html=True)
+        else:
+            st.info("No matching skills found")
+    
+    with col_skills2:
+        st.markdown("### ❌ Missing Skills")
+        all_missing = keyword_match['missing_required'] + keyword_match['missing_preferred']
+        if all_missing:
+            priority_missing = keyword_match['missing_required'][:5]
+            for skill in priority_missing:
+                st.markdown(f'<span class="tech-term" style="background: linear-gradient(135deg, #eb3349 0%, #f45c43 100%);">{skill}</span>', unsafe_allow_html=True)
         else:
-            missing_preferred.append(skill)
+            st.success("All required skills matched!")
+    
+    # Skill Match Progress Bar
+    st.markdown("### 📊 Skill Match Score")
+    st.progress(min(skill_match_pct / 100, 1.0))
+    st.caption(f"Skill Match: {int(skill_match_pct)}% ({len(keyword_match['matched_required'])}/{len(required_skills)} required, {len(keyword_match['matched_preferred'])}/{len(preferred_skills)} preferred)")
+    
+    # Job Description Match
+    if report.jd_similarity is not None:
+        st.markdown("### 📝 Job Description Match")
+        st.progress(min(report.jd_similarity, 1.0))
+        st.caption(f"Similarity to the pasted job description: {report.jd_similarity:.0%}")
+
+
+def render_project_section(report):
+    """Project strengths, gaps and quality score"""
+    found_skills = report.found_skills
+    project_indicators = report.project_indicators
+    action_usage = report.action_usage
+    quantified = report.quantified
+    project_quality = report.project_quality
+    
+    # Project & Experience Analysis
+    st.markdown('<div class="section-header-orange">📁 Project & Experience Analysis</div>', unsafe_allow_html=True)
+    
+    col_proj1, col_proj2 = st.columns(2)
+    
+    with col_proj1:
+        st.markdown("#### ✅ Strong Points")
+        strong_points = []
+        if project_indicators:
+            strong_points.append(f"• {len(project_indicators)} project descriptions found")
+        if action_usage:
+            strong_points.append(f"• {len(set([v[0] for v in action_usage]))} action verbs used")
+        if quantified:
+            strong_points.append(f"• {len(quantified)} quantified achievements")
+        if len(found_skills) >= 5:
+            strong_points.append(f"• {len(found_skills)} technical skills listed")
+        
+        if strong_points:
+            for point in strong_points:
+                st.markdown(f"<div class='recruiter-note'>{point}</div>", unsafe_allow_html=True)
+        else:
+            st.warning("No strong points detected")
+    
+    with col_proj2:
+        st.markdown("#### ⚠️ Areas for Improvement")
+        weak_points = []
+        if not project_indicators or len(project_indicators) < 2:
+            weak_points.append("• Add more project descriptions")
+        if not quantified:
+            weak_points.append("• Include quantified results/metrics")
+        if len(action_usage) < 3:
+            weak_points.append("• Use more action verbs")
+        if len(found_skills) < 5:
+            weak_points.append("• Expand technical skills section")
+        
+        if weak_points:
+            for point in weak_points:
+                st.markdown(f"<div class='tip-card'>{point}</div>", unsafe_allow_html=True)
+        else:
+            st.success("Excellent project descriptions!")
     
-    return {
-        'matched_required': matched_required,
-        'missing_required': missing_required,
-        'matched_preferred': matched_preferred,
-        'missing_preferred': missing_preferred
-    }
+    # Project Quality Score
+    st.markdown("### 📈 Project Quality Score")
+    st.progress(min(project_quality / 100, 1.0))
+    st.caption(f"Project Quality: {int(project_quality)}%")
 
 
-def analyze_tech_skills(text):
-    """Analyze and extract technical skills from text"""
-    text_lower = text.lower()
-    found_skills = []
-    skill_categories = {}
+def render_quality_section(report):
+    """Formatting feedback and ATS safety checks"""
+    formatting_feedback = report.formatting_feedback
+    text = report.text
+    
+    # Resume Quality Review
+    st.markdown('<div class="section-header-purple">📝 Resume Quality Review</div>', unsafe_allow_html=True)
+    
+    col_qual1, col_qual2 = st.columns(2)
+    
+    with col_qual1:
+        st.markdown("#### 🏆 Formatting & Structure")
+        for feedback in formatting_feedback:
+            if '✅' in feedback:
+                st.success(feedback)
+            elif '❌' in feedback:
+                st.error(feedback)
+            else:
+                st.warning(feedback)
+    
+    with col_qual2:
+        st.markdown("#### 📋 ATS Safety Check")
+        word_count = report.word_count
+        if 300 <= word_count <= 1000:
+            st.success(f"✅ Optimal length ({word_count} words)")
+        else:
+            st.warning(f"⚠️ Word count: {word_count} (aim for 300-1000)")
+        
+        # Check for common issues
+        if '|' not in text and '  ' * 5 not in text:
+            st.success("✅ No tables/columns detected (ATS safe)")
+        else:
+            st.error("❌ Potential table formatting (ATS risk)")
+
+
+def render_checklist_section(report):
+    """Pass/fail checklist of the resume sections recruiters look for"""
+    keyword_match = report.keyword_match
+    found_skills = report.found_skills
+    project_indicators = report.project_indicators
+    action_usage = report.action_usage
+    quantified = report.quantified
+    text = report.text
+    
+    # Detailed Checklist
+    st.markdown("#### 📊 Detailed Checklist")
+    
+    checklist_items = [
+        ("Contact Information", "Complete" if len(keyword_match['matched_required']) > 0 else "Missing", len(keyword_match['matched_required']) > 0),
+        ("Skills Section", f"{len(found_skills)} skills found", len(found_skills) >= 3),
+        ("Project Descriptions", f"{len(project_indicators)} projects", len(project_indicators) >= 2),
+        ("Action Verbs", f"{len(action_usage)} used", len(action_usage) >= 3),
+        ("Quantified Results", f"{len(quantified)} metrics", len(quantified) >= 1),
+        ("ATS Formatting", "Clean" if '|' not in text else "Complex", '|' not in text),
+    ]
+    
+    for item_name, item_status, item_passed in checklist_items:
+        icon = '✅' if item_passed else '❌'
+        status_class = 'success-check' if item_passed else 'error-check'
+        st.markdown(f"""
+        <div class="checklist-item {status_class}">
+            <span style="font-size: 1.4em; margin-right: 10px;">{icon}</span>
+            <strong>{item_name}:</strong> {item_status}
+        </div>
+        """, unsafe_allow_html=True)
+
+
+def render_improvements_section(report):
+    """Top five prioritized improvements"""
+    suggestions = report.suggestions
     
-    for category, skills in TECH_SKILLS.items():
-        found_in_category = []
-        for skill in skills:
-            if skill.lower() in text_lower:
-                found_in_category.append(skill)
-                found_skills.append(skill)
-        if found_in_category:
-            skill_categories[category] = found_in_category
+    # Top 5 Improvements
+    st.markdown('<div class="section-header">🏆 Top 5 Improvements to Get Shortlisted Faster</div>', unsafe_allow_html=True)
     
-    return list(set(found_skills)), skill_categories
+    for i, improvement in enumerate(suggestions[:5], 1):
+        priority_icon = '🔴' if improvement['priority'] == 'high' else ('🟡' if improvement['priority'] == 'medium' else '🟢')
+        st.markdown(f"""
+        <div class="tip-card">
+            <h4>{priority_icon} {i}. {improvement['title']}</h4>
+            <p>{improvement['description']}</p>
+            <small><strong>Section:</strong> {improvement['section']}</small>
+        </div>
+        """, unsafe_allow_html=True)
 
 
-def analyze_projects(text):
-    """Analyze project descriptions"""
-    text_lower = text.lower()
-    lines = text.split('\n')
-    project_indicators = []
-    action_verb_usage = []
-    quantified_results = []
+def render_bullet_section(report):
+    """Before/after rewrites of weak bullets"""
+    bullet_improvements = report.bullet_improvements
     
-    # Check for project descriptions
-    for i, line in enumerate(lines):
-        line_lower = line.lower().strip()
-        if any(keyword in line_lower for keyword in PROJECT_KEYWORDS):
-            project_indicators.append(line.strip())
+    # Bullet Point Improvements
+    if bullet_improvements:
+        st.markdown('<div class="section-header-orange">💡 Optimized Resume Bullet Examples</div>', unsafe_allow_html=True)
         
-        # Check for action verbs
-        for verb in ACTION_VERBS_ALL:
-            if verb in line_lower:
-                action_verb_usage.append((verb, line.strip()))
-                break
+        for i, improvement in enumerate(bullet_improvements, 1):
+            st.markdown(f"""
+            <div style="margin: 15px 0;">
+                <div class="bullet-before">
+                    <strong>❌ Before:</strong><br>{improvement['before']}
+                </div>
+                <div class="bullet-after">
+                    <strong>✅ After:</strong><br>{improvement['after']}
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+
+
+def render_tech_skills_section(report):
+    """Detected technical skills grouped by category"""
+    found_skills = report.found_skills
+    skill_categories = report.skill_categories
+    
+    # Technical Skills Found
+    if found_skills:
+        st.markdown('<div class="section-header">🛠️ Technical Skills Detected</div>', unsafe_allow_html=True)
         
-        # Check for quantified results (numbers, percentages)
-        numbers = re.findall(r'\d+%|\$\d+|\d+\s*(?:x|times|users|clients)', line_lower)
-        if numbers:
-            quantified_results.append((line.strip(), numbers))
-    
-    return project_indicators, action_verb_usage, quantified_results
+        # Group by category
+        for category, skills in skill_categories.items():
+            category_name = category.replace('_', ' ').title()
+            st.markdown(f"**{category_name}:**")
+            skills_html = '<div style="margin-bottom: 15px;">'
+            for skill in skills:
+                skills_html += f'<span class="tech-term">{skill}</span>'
+            skills_html += '</div>'
+            st.markdown(skills_html, unsafe_allow_html=True)
 
 
-def analyze_formatting(text):
-    """Analyze resume formatting quality"""
-    score = 0
-    feedback = []
-    lines = text.split('\n')
-    non_empty_lines = [line.strip() for line in lines if line.strip()]
-    
-    # Check for section headers
-    section_headers = ['experience', 'education', 'skills', 'projects', 'summary', 'objective', 'certifications', 'work experience', 'professional experience', 'technical skills']
-    header_count = sum(1 for header in section_headers if header in text.lower())
-    
-    if header_count >= 4:
-        score += 20
-        feedback.append("✅ Excellent section organization")
-    elif header_count >= 2:
-        score += 12
-        feedback.append("⚠️ Basic section organization")
+def render_final_verdict_section(report):
+    """Verdict reasoning and final recommendation"""
+    ats_score = report.ats_score
+    skill_match_pct = report.skill_match_pct
+    project_quality = report.project_quality
+    shortlist_prob = report.shortlist_prob
+    verdict = report.verdict
+    verdict_class, verdict_icon = VERDICT_STYLES[verdict]
+    
+    # Recruiter's Final Verdict
+    st.markdown('<div class="section-header-green">🎯 Overall Recruiter Verdict</div>', unsafe_allow_html=True)
+    
+    # Generate verdict reasoning
+    reasons = []
+    if ats_score >= 70:
+        reasons.append("✅ Strong ATS score indicating good keyword optimization")
     else:
-        score += 5
-        feedback.append("❌ Missing clear section headers")
+        reasons.append("⚠️ ATS score below optimal - needs keyword improvements")
     
-    # Check for bullet points
-    bullet_patterns = ['•', '-', '*', '·', '○', '▪', '›', '→']
-    bullet_count = sum(1 for line in non_empty_lines[:30] if any(bullet in line for bullet in bullet_patterns))
-    
-    if bullet_count >= 10:
-        score += 15
-        feedback.append("✅ Good use of bullet points")
-    elif bullet_count >= 5:
-        score += 10
-        feedback.append("⚠️ Some bullet points used")
+    if skill_match_pct >= 70:
+        reasons.append("✅ Good skill alignment with job requirements")
     else:
-        score += 3
-        feedback.append("❌ Consider using bullet points")
-    
-    # Check for consistent formatting
-    line_lengths = [len(line) for line in non_empty_lines[:30] if len(line) < 100]
-    avg_length = np.mean(line_lengths) if line_lengths else 0
+        reasons.append("⚠️ Skill gaps identified that need addressing")
     
-    if 30 <= avg_length <= 80:
-        score += 15
-        feedback.append("✅ Good line length consistency")
+    if project_quality >= 60:
+        reasons.append("✅ Solid project experience demonstrated")
     else:
-        score += 7
-        feedback.append("⚠️ Varying line lengths")
+        reasons.append("⚠️ Project descriptions need more detail and metrics")
     
-    # Check for contact information
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    phone_pattern = r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-    linkedin_pattern = r'linkedin\.com/in/'
+    for reason in reasons:
+        st.markdown(f"<div class='recruiter-note'>{reason}</div>", unsafe_allow_html=True)
     
-    has_email = bool(re.search(email_pattern, text))
-    has_phone = bool(re.search(phone_pattern, text))
-    has_linkedin = bool(re.search(linkedin_pattern, text.lower()))
-    
-    contact_score = 0
-    if has_email:
-        contact_score += 7
-    if has_phone:
-        contact_score += 7
-    if has_linkedin:
-        contact_score += 6
-    score += contact_score
+    # Final recommendation
+    st.markdown(f"""
+    <div class="{verdict_class}" style="margin-top: 20px;">
+        <h2>{verdict_icon} {verdict}</h2>
+        <p>Shortlisting Probability: {shortlist_prob}%</p>
+    </div>
+    """, unsafe_allow_html=True)
     
-    # Check for graphics/tables (basic detection)
-    if '|' in text or '  ' * 5 in text:
-        score -= 10
-        feedback.append("⚠️ Potential table/column structure detected (ATS risk)")
+    if verdict == "HIRE":
+        st.success("🎉 Congratulations! Your resume is well-positioned for this role. Consider tailoring it slightly for each application.")
+    elif verdict == "BORDERLINE":
+        st.warning("📝 Your resume has potential but needs improvements. Focus on the suggestions above to increase your chances.")
+    else:
+        st.error("📚 Your resume needs significant improvements. Don't be discouraged - follow the actionable suggestions above to transform your resume!")
     
-    return score, feedback
+    # Encouragement
+    st.markdown(f"""
+    <div class="quote-box">
+        {random.choice(MOTIVATIONAL_QUOTES)}
+    </div>
+    """, unsafe_allow_html=True)
 
 
-def analyze_experience_level(text, found_skills):
-    """Estimate experience level based on skills and content"""
-    text_lower = text.lower()
-    word_count = len(text.split())
-    
-    # Experience indicators
-    junior_keywords = ['intern', 'trainee', 'junior', 'entry', 'fresher', 'graduate', 'student']
-    senior_keywords = ['senior', 'lead', 'architect', 'manager', 'director', 'principal', 'staff']
-    
-    junior_count = sum(1 for keyword in junior_keywords if keyword in text_lower)
-    senior_count = sum(1 for keyword in senior_keywords if keyword in text_lower)
-    
-    # Skill depth analysis
-    skill_depth = len(found_skills)
-    
-    if junior_count > senior_count:
-        level = "Fresher/Entry Level"
-    elif senior_count > junior_count:
-        level = "Senior/Experienced Level"
-    else:
-        if skill_depth >= 10 and word_count >= 500:
-            level = "Mid to Senior Level"
-        elif skill_depth >= 5 and word_count >= 300:
-            level = "Junior to Mid Level"
-        else:
-            level = "Fresher/Entry Level"
-    
-    return level
+# Report sections in page order, with the analysis stage each one waits for
+REPORT_SECTIONS = [
+    (render_score_section, 'score'),
+    (render_skill_section, 'score'),
+    (render_project_section, 'score'),
+    (render_quality_section, 'formatting'),
+    (render_checklist_section, 'projects'),
+    (render_improvements_section, 'suggestions'),
+    (render_bullet_section, 'bullets'),
+    (render_tech_skills_section, 'skills'),
+    (render_final_verdict_section, 'score'),
+]
 
 
-def generate_improvements(checks, keyword_match, project_analysis, improvements_list):
-    """Generate prioritized improvement suggestions"""
-    suggestions = []
-    
-    # High priority
-    if keyword_match['missing_required']:
-        suggestions.append({
-            'priority': 'high',
-            'title': '🎯 Add Missing Required Skills',
-            'description': f"Critical skills missing from your resume: {', '.join(keyword_match['missing_required'][:5])}. Add these to your skills section or highlight in experience.",
-            'section': 'Skills'
-        })
-    
-    if not project_analysis[0] or len(project_analysis[0]) < 2:
-        suggestions.append({
-            'priority': 'high',
-            'title': '📁 Strengthen Project Section',
-            'description': 'Add at least 2-3 detailed project descriptions with measurable outcomes. Use the STAR method.',
-            'section': 'Projects'
-        })
-    
-    if checks['contact']['score'] < 14:
-        suggestions.append({
-            'priority': 'high',
-            'title': '📞 Complete Contact Information',
-            'description': 'Ensure your email, phone, and LinkedIn URL are present and professional.',
-            'section': 'Contact'
-        })
-    
-    # Medium priority
-    if keyword_match['missing_preferred']:
-        suggestions.append({
-            'priority': 'medium',
-            'title': '⭐ Add Preferred Skills',
-            'description': f"Consider adding these nice-to-have skills: {', '.join(keyword_match['missing_preferred'][:5])}",
-            'section': 'Skills'
-        })
-    
-    if not project_analysis[2]:
-        suggestions.append({
-            'priority': 'medium',
-            'title': '📈 Quantify Your Achievements',
-            'description': 'Add specific metrics, percentages, or numbers to demonstrate impact (e.g., "Improved performance by 40%").',
-            'section': 'Experience'
-        })
-    
-    if not project_analysis[1]:
-        suggestions.append({
-            'priority': 'medium',
-            'title': '💪 Use Action Verbs',
-            'description': 'Start bullet points with strong action verbs like "Developed," "Optimized," "Led," "Achieved."',
-            'section': 'Experience'
-        })
-    
-    # Format suggestions
-    if len(suggestions) > 5:
-        suggestions = suggestions[:5]
-    
-    return suggestions
+def render_report_stream(stages):
+    """Render a report section by section as ``(stage, report)`` pairs arrive
 
+    Every section gets a placeholder in page order up front and is drawn as
+    soon as the stage it needs has finished. A cached report arrives as the
+    single stage 'report' and is drawn in one pass.
+    """
+    st.markdown("---")
+    slots = [st.empty() for _ in REPORT_SECTIONS]
+    finished = set()
+    drawn = set()
+    report = None
+    for stage_name, report in stages:
+        finished.add(stage_name)
+        for i, (render_section, needs) in enumerate(REPORT_SECTIONS):
+            if i not in drawn and (needs in finished or 'report' in finished):
+                with slots[i].container():
+                    render_section(report)
+                drawn.add(i)
+    return report
 
-def generate_bullet_improvements(text):
-    """Generate specific bullet point improvements"""
-    improvements = []
-    lines = text.split('\n')
-    
-    weak_bullets = []
-    strong_bullets = []
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        # Check for weak patterns
-        weak_patterns = [
-            r'(responsible for|duties include|task was|job involved)',
-            r'(helped|assisted|participated in)',
-            r'(some|various|different)',
-            r'^[^•\-\*]*[a-z]',  # Not starting with action or bullet
-        ]
-        
-        is_weak = any(re.search(pattern, line.lower()) for pattern in weak_patterns)
-        
-        # Check for strong patterns
-        strong_patterns = [
-            r'(developed|created|designed|implemented|led|managed)',
-            r'\d+%|\$\d+|\d+\s*(?:users|clients|hours|days)',
-            r'(improved|optimized|increased|decreased|reduced)',
-        ]
-        
-        is_strong = any(re.search(pattern, line.lower()) for pattern in strong_patterns)
-        
-        if is_weak and not is_strong:
-            weak_bullets.append(line)
-        elif is_strong:
-            strong_bullets.append(line)
-    
-    # Generate improvements
-    for weak in weak_bullets[:3]:
-        improved = weak
-        
-        # Add action verb if missing
-        if not any(verb in weak.lower() for verb in ACTION_VERBS_ALL):
-            improved = f"Developed and {improved.lower()}"
-        
-        # Add metric placeholder if missing
-        if not re.search(r'\d+%|\$\d+|\d+', weak):
-            improved = improved + " resulting in measurable impact"
-        
-        improvements.append({
-            'before': weak,
-            'after': improved
-        })
-    
-    return improvements[:3]
 
+def render_report(report):
+    """Render a full analysis report"""
+    render_report_stream([('report', report)])
 
-def calculate_ats_score(text, keyword_match, formatting_score):
-    """Calculate overall ATS score"""
-    score = 0
-    max_score = 100
-    
-    # Keyword matching (30 points)
-    required_match_rate = len(keyword_match['matched_required']) / max(len(keyword_match['matched_required']) + len(keyword_match['missing_required']), 1)
-    preferred_match_rate = len(keyword_match['matched_preferred']) / max(len(keyword_match['matched_preferred']) + len(keyword_match['missing_preferred']), 1)
-    
-    keyword_score = (required_match_rate * 20) + (preferred_match_rate * 10)
-    score += keyword_score
-    
-    # Formatting (20 points)
-    score += min(formatting_score, 20)
-    
-    # Skills coverage (20 points)
-    found_skills, _ = analyze_tech_skills(text)
-    skill_score = min(len(found_skills) * 2, 20)
-    score += skill_score
-    
-    # Experience/Projects (20 points)
-    project_indicators, action_usage, quantified = analyze_projects(text)
-    exp_score = min(len(project_indicators) * 5 + len(quantified) * 3 + len(action_usage) * 2, 20)
-    score += exp_score
-    
-    # Contact & Completeness (10 points)
-    word_count = len(text.split())
-    if 300 <= word_count <= 1000:
-        score += 10
-    elif 200 <= word_count < 300 or 1000 < word_count <= 1500:
-        score += 7
-    else:
-        score += 3
-    
-    return min(int(score), 100)
 
+def render_performance_panel(perf):
+    """Show how long each pipeline stage of the last run took"""
+    import pandas as pd
+    
+    with st.expander(f"⏱️ Performance: {perf.seconds * 1000:.0f} ms total", expanded=True):
+        rows = []
+        for row in perf.stage_table():
+            rows.append({
+                'Stage': "\u2003" * row['depth'] + row['stage'],
+                'Time (ms)': row['ms'],
+                'Cache': {True: "hit", False: "miss"}.get(row.get('cache_hit'), ""),
+                'Input': ", ".join(f"{value:,} {unit}" for unit, value in row.get('sizes', {}).items())
+            })
+        st.dataframe(pd.DataFrame(rows), hide_index=True)
+        st.caption(f"Trace {perf.trace_id}. Indented stages run inside the stage above them.")
 
-def calculate_shortlist_probability(ats_score, skill_match, project_quality):
-    """Calculate shortlisting probability"""
-    base_score = ats_score
-    
-    # Adjust for skill match
-    if skill_match >= 80:
-        base_score += 10
-    elif skill_match >= 60:
-        base_score += 5
-    elif skill_match < 40:
-        base_score -= 10
+
+def render_revision_section(report):
+    """Highlight the lines that changed since the last upload for the same role in this session"""
+    # (previous report, current report) per role; reruns with the same text keep the pair
+    revisions = st.session_state.setdefault('revisions', {})
+    previous, current = revisions.get(report.role, (None, None))
+    if current is None or current.text != report.text:
+        previous, current = current, report
+        revisions[report.role] = (previous, current)
+    if previous is None:
+        return
+    
+    with stage('diff_reports'):
+        changes = diff_reports(previous, report)
+    if not changes:
+        return
+    
+    added = sum(change.points for change in changes if change.kind == 'added')
+    removed = sum(change.points for change in changes if change.kind == 'removed')
+    with st.expander(f"🔁 What changed since your last upload ({len(changes)} lines)", expanded=True):
+        st.caption(
+            f"Project quality {previous.project_quality} → {report.project_quality}: "
+            f"+{added} points from new lines, -{removed} from removed lines (capped at 100)."
+        )
+        for change in changes:
+            sign = "+" if change.kind == 'added' else "-"
+            color = "#2e7d32" if change.kind == 'added' else "#c62828"
+            labels = ", ".join(sorted(change.categories - {'number', 'bullet'}))
+            points = f" <b>({sign}{change.points} pts)</b>" if change.points else ""
+            st.markdown(
+                f'<div style="color: {color};">{sign} {html.escape(change.line)}{points}'
+                f'<span style="color: #888;"> {labels}</span></div>',
+                unsafe_allow_html=True
+            )
+
+
+def render_history_section(report, digest, filename):
+    """Record the analysis and show how the score moved since earlier uploads in this session"""
+    try:
+        history = default_history()
+        if history is None:
+            return
+        # Keyed to the browser session, not to anything in the resume, so no
+        # one sees the scores of someone whose email or file name they share
+        candidate = st.session_state.setdefault('history_session', f"session:{uuid.uuid4().hex}")
+        with stage('history'):
+            recorded = history.record(report, digest, filename, candidate=candidate)
+            trend = history.trend(recorded.candidate, report.role, limit=20)
+    except (sqlite3.Error, OSError) as e:
+        st.caption(f"Analysis history unavailable: {e}")
+        return
+    if len(trend) < 2:
+        st.caption("📈 Saved to this session's history. Re-upload after improving your resume to track progress.")
+        return
+    
+    import pandas as pd
+    
+    st.markdown('<div class="section-header-purple">📈 Your Progress</div>', unsafe_allow_html=True)
+    previous = trend[-2]
+    col_score, col_skills, col_shortlist = st.columns(3)
+    col_score.metric("ATS Score", report.ats_score, report.ats_score - previous.ats_score)
+    col_skills.metric(
+        "Skill Match %", f"{report.skill_match_pct:.1f}", f"{report.skill_match_pct - previous.skill_match_pct:.1f}"
+    )
+    col_shortlist.metric("Shortlist Probability %", report.shortlist_prob, report.shortlist_prob - previous.shortlist_prob)
+    chart = pd.DataFrame(
+        {'ATS Score': [record.ats_score for record in trend]},
+        index=pd.to_datetime([record.analyzed_at for record in trend], unit='s')
+    )
+    st.line_chart(chart)
+    st.caption(f"{len(trend)} analyses for {report.role} in this session.")
+
+
+def render_leaderboard(uploaded_files, role, job_description=None):
+    """Score many resumes at once and show a sortable leaderboard with drill-down"""
+    import pandas as pd
+    from resume_analyzer.ranking import extract_texts, score_candidates
     
-    # Adjust for project quality
-    if project_quality >= 80:
-        base_score += 10
-    elif project_quality >= 60:
-        base_score += 5
-    elif project_quality < 40:
-        base_score -= 10
+    limits = UploadLimits.from_env()
+    uploads = []
+    try:
+        for f in uploaded_files:
+            # Size-checked, hashed and spooled as it streams, like a single upload
+            try:
+                with stage('ingest', bytes=f.size):
+                    uploads.append(ingest(f, limits=limits))
+            except UploadTooLarge as e:
+                st.error(str(e))
+        if not uploads:
+            return
+        with st.spinner(f'🔍 Scoring {len(uploads)} candidates...'):
+            with stage('extract_texts', files=len(uploads), bytes=sum(upload.size for upload in uploads)):
+                texts = extract_texts(
+                    uploads,
+                    workers=os.cpu_count(),
+                    max_pages=limits.max_pages,
+                    max_chars=limits.max_chars
+                )
+    finally:
+        for upload in uploads:
+            upload.close()
+    
+    scored = []
+    for i, (upload, text) in enumerate(zip(uploads, texts)):
+        if isinstance(text, Exception):
+            st.error(failure_message(upload.name, text))
+        elif not text or not text.strip():
+            st.error(f"No text could be extracted from {upload.name}")
+        else:
+            scored.append(i)
+    if not scored:
+        return
+    
+    with stage('score_candidates', candidates=len(scored)):
+        scores = score_candidates(
+            [texts[i] for i in scored],
+            role,
+            names=[uploads[i].name for i in scored],
+            job_description=job_description
+        )
     
-    return min(max(base_score, 5), 95)
+    st.markdown("---")
+    st.markdown('<div class="section-header-green">🏆 Candidate Leaderboard</div>', unsafe_allow_html=True)
+    leaderboard = pd.DataFrame({
+        'Candidate': scores.names,
+        'ATS Score': scores.ats_score,
+        'Skill Match %': scores.skill_match_pct.round(1),
+        'Project Quality': scores.project_quality,
+        'Shortlist Probability %': scores.shortlist_prob,
+        'Verdict': scores.verdict
+    })
+    if scores.jd_similarity is not None:
+        leaderboard['JD Match %'] = (scores.jd_similarity * 100).round(1)
+    leaderboard = leaderboard.sort_values(['ATS Score', 'Shortlist Probability %'], ascending=False)
+    st.dataframe(leaderboard, hide_index=True)
+    st.caption("Click a column header to sort.")
+    
+    verdict_counts = leaderboard['Verdict'].value_counts()
+    col_hire, col_border, col_reject = st.columns(3)
+    col_hire.metric("✅ Hire", int(verdict_counts.get("HIRE", 0)))
+    col_border.metric("⚠️ Borderline", int(verdict_counts.get("BORDERLINE", 0)))
+    col_reject.metric("❌ Reject", int(verdict_counts.get("REJECT", 0)))
+    
+    if scores.skills:
+        st.markdown("### 📊 Skill Coverage")
+        coverage = pd.DataFrame(scores.skill_matrix, index=scores.names, columns=scores.skills)
+        st.dataframe(coverage)
+    
+    # Drill-down into a single candidate
+    st.markdown('<div class="section-header-purple">🔎 Candidate Drill-Down</div>', unsafe_allow_html=True)
+    ranked = list(leaderboard.index)
+    choice = st.selectbox(
+        "View full report for",
+        ranked,
+        format_func=lambda row: f"{scores.names[row]} (ATS {scores.ats_score[row]})"
+    )
+    # The leaderboard's text is reused, so the closed upload need not be read again
+    upload = uploads[scored[choice]]
+    report = cached_analyze(
+        None,
+        upload.name,
+        role,
+        digest=upload.digest,
+        job_description=job_description,
+        max_pages=limits.max_pages,
+        max_chars=limits.max_chars,
+        text=texts[scored[choice]]
+    )
+    with stage('render'):
+        render_report(report)
 
 
 def main():
@@ -717,6 +852,9 @@ def main():
     </div>
     """, unsafe_allow_html=True)
     
+    # Roles and verbs of the taxonomy in effect for this run
+    taxonomy = current_taxonomy()
+    
     # Sidebar
     with st.sidebar:
         st.header("📋 Instructions")
@@ -726,13 +864,13 @@ def main():
         3. Upload your resume (PDF/DOCX)
         4. Wait for recruiter analysis
         5. Implement improvements
-        6. Re-upload to check progress!
+        6. Re-upload to track your progress!
         """)
         
         st.header("💼 Select Job Role")
         job_role = st.selectbox(
             "Target Position",
-            list(JOB_ROLES.keys()) + ["Custom"]
+            list(taxonomy.job_roles.keys()) + ["Custom"]
         )
         
         if job_role == "Custom":
@@ -742,6 +880,9 @@ def main():
                 'preferred_skills': []
             }
         
+        st.header("🔀 Analysis Mode")
+        mode = st.radio("Analysis Mode", ["Single Resume", "Compare Candidates"], label_visibility="collapsed")
+        
         st.header("📝 Job Description (Optional)")
         job_description = st.text_area("Paste job description for better analysis", height=150)
         
@@ -749,28 +890,30 @@ def main():
         
         # Create expander for each category
         with st.expander("🎯 Leadership & Management", expanded=False):
-            st.write(", ".join(ACTION_VERBS['leadership']))
+            st.write(", ".join(taxonomy.action_verbs.get('leadership', [])))
         
         with st.expander("💻 Technical & Development", expanded=False):
-            st.write(", ".join(ACTION_VERBS['technical']))
+            st.write(", ".join(taxonomy.action_verbs.get('technical', [])))
         
         with st.expander("⚡ Optimization & Improvement", expanded=False):
-            st.write(", ".join(ACTION_VERBS['optimization']))
+            st.write(", ".join(taxonomy.action_verbs.get('optimization', [])))
         
         with st.expander("🏆 Achievement & Results", expanded=False):
-            st.write(", ".join(ACTION_VERBS['achievement']))
+            st.write(", ".join(taxonomy.action_verbs.get('achievement', [])))
         
         with st.expander("🔍 Analysis & Research", expanded=False):
-            st.write(", ".join(ACTION_VERBS['analysis']))
+            st.write(", ".join(taxonomy.action_verbs.get('analysis', [])))
         
         with st.expander("🧠 Problem Solving", expanded=False):
-            st.write(", ".join(ACTION_VERBS['problem_solving']))
+            st.write(", ".join(taxonomy.action_verbs.get('problem_solving', [])))
         
         with st.expander("📢 Communication", expanded=False):
-            st.write(", ".join(ACTION_VERBS['communication']))
+            st.write(", ".join(taxonomy.action_verbs.get('communication', [])))
         
         with st.expander("🚀 Innovation & Creation", expanded=False):
-            st.write(", ".join(ACTION_VERBS['innovation']))
+            st.write(", ".join(taxonomy.action_verbs.get('innovation', [])))
+        
+        show_performance = st.checkbox("⏱️ Show performance panel", value=False)
         
         st.header("💡 Quick Tips")
         st.markdown("""
@@ -782,348 +925,64 @@ def main():
         - ATS-friendly formatting
         """)
     
-    # Main content area
-    col1, col2 = st.columns([2, 1])
-    
-    with col1:
-        st.markdown('<div class="section-header-purple">📤 Upload Your Resume</div>', unsafe_allow_html=True)
-        uploaded_file = st.file_uploader("Drag and drop your resume here", type=['pdf', 'docx'])
-    
     # Get job role skills
-    if job_role != "Custom" and job_role in JOB_ROLES:
-        role_skills = JOB_ROLES[job_role]
-        required_skills = role_skills['required_skills']
-        preferred_skills = role_skills['preferred_skills']
+    if job_role != "Custom" and job_role in taxonomy.job_roles:
+        role = job_role
     elif 'custom_role' in st.session_state:
-        required_skills = st.session_state['custom_role']['required_skills']
-        preferred_skills = st.session_state['custom_role']['preferred_skills']
+        role = st.session_state['custom_role']
     else:
-        required_skills = ['python', 'java', 'sql', 'git', 'communication']
-        preferred_skills = ['docker', 'aws', 'agile']
+        role = None
     
-    if uploaded_file is not None:
-        with st.spinner('🔍 Conducting recruiter-style analysis...'):
-            # Extract text
-            text = extract_text_from_file(uploaded_file)
+    # Main content area
+    col1, col2 = st.columns([2, 1])
+    
+    if mode == "Compare Candidates":
+        with col1:
+            st.markdown('<div class="section-header-purple">📤 Upload Candidate Resumes</div>', unsafe_allow_html=True)
+            uploaded_files = st.file_uploader("Drag and drop all resumes here", type=['pdf', 'docx'], accept_multiple_files=True)
+        uploaded_file = None
+    else:
+        with col1:
+            st.markdown('<div class="section-header-purple">📤 Upload Your Resume</div>', unsafe_allow_html=True)
+            uploaded_file = st.file_uploader("Drag and drop your resume here", type=['pdf', 'docx'])
+        uploaded_files = []
+    
+    perf = None
+    if uploaded_files:
+        with trace('leaderboard', candidates=len(uploaded_files)) as perf:
+            render_leaderboard(uploaded_files, role, job_description)
+    
+    elif uploaded_file is not None:
+        with trace('analysis', file=uploaded_file.name) as perf:
+            limits = UploadLimits.from_env()
+            text = upload = None
+            with st.spinner('🔍 Reading your resume...'):
+                # Hash, size-check and extract without holding extra copies of the file
+                try:
+                    with stage('ingest', bytes=uploaded_file.size):
+                        upload = ingest(uploaded_file, limits=limits)
+                except UploadTooLarge as e:
+                    st.error(str(e))
+                if upload is not None:
+                    with upload:
+                        text = extract_text_from_file(upload, limits)
             
             if text:
-                time.sleep(1.5)  # For dramatic effect
-                
-                # Perform all analyses
-                keyword_match = calculate_keyword_match(text, required_skills, preferred_skills)
-                found_skills, skill_categories = analyze_tech_skills(text)
-                project_indicators, action_usage, quantified = analyze_projects(text)
-                formatting_score, formatting_feedback = analyze_formatting(text)
-                ats_score = calculate_ats_score(text, keyword_match, formatting_score)
-                
-                # Calculate skill match percentage
-                total_required = len(required_skills) + len(preferred_skills)
-                matched = len(keyword_match['matched_required']) + len(keyword_match['matched_preferred'])
-                skill_match_pct = (matched / total_required * 100) if total_required > 0 else 50
-                
-                # Project quality score
-                project_quality = min(len(project_indicators) * 20 + len(quantified) * 15 + len(action_usage) * 10, 100)
-                
-                # Shortlist probability
-                shortlist_prob = calculate_shortlist_probability(ats_score, skill_match_pct, project_quality)
-                
-                # Experience level
-                experience_level = analyze_experience_level(text, found_skills)
-                
-                # Generate improvements
-                improvements_list = []
-                suggestions = generate_improvements(
-                    {'contact': {'score': formatting_score // 3}},
-                    keyword_match,
-                    (project_indicators, action_usage, quantified),
-                    improvements_list
+                # Sections appear as their analysis stages finish
+                stages = cached_analysis_stages(
+                    None,
+                    upload.name,
+                    role,
+                    digest=upload.digest,
+                    job_description=job_description,
+                    text=text,
+                    max_pages=limits.max_pages,
+                    max_chars=limits.max_chars
                 )
-                
-                # Generate bullet improvements
-                bullet_improvements = generate_bullet_improvements(text)
-                
-                # Determine verdict
-                if shortlist_prob >= 70:
-                    verdict = "HIRE"
-                    verdict_class = "verdict-hire"
-                    verdict_icon = "✅"
-                elif shortlist_prob >= 50:
-                    verdict = "BORDERLINE"
-                    verdict_class = "verdict-borderline"
-                    verdict_icon = "⚠️"
-                else:
-                    verdict = "REJECT"
-                    verdict_class = "verdict-reject"
-                    verdict_icon = "❌"
-                
-                # Display results
-                st.markdown("---")
-                st.markdown('<div class="section-header-green">📊 ATS Score & Recruiter Verdict</div>', unsafe_allow_html=True)
-                
-                # Score and Verdict
-                col_score, col_verdict = st.columns([1, 1.5])
-                
-                with col_score:
-                    if ats_score >= 80:
-                        score_color = '#38ef7d'
-                        score_msg = '🌟 Excellent!'
-                    elif ats_score >= 60:
-                        score_color = '#f2c94c'
-                        score_msg = '👍 Good!'
-                    elif ats_score >= 40:
-                        score_color = '#f2994a'
-                        score_msg = '📝 Needs Work'
-                    else:
-                        score_color = '#f45c43'
-                        score_msg = '🚨 Critical Issues'
-                    
-                    st.markdown(f"""
-                    <div class="score-card" style="background: linear-gradient(135deg, {score_color} 0%, #11998e 100%);">
-                        <h2>{ats_score}</h2>
-                        <p>{score_msg}</p>
-                        <p style="font-size: 0.9em;">/ 100</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    st.markdown(f"""
-                    <div class="{verdict_class}" style="font-size: 1.8em;">
-                        {verdict_icon} {verdict}
-                    </div>
-                    <p style="text-align: center; margin-top: 10px; font-weight: bold;">
-                        Shortlist Probability: {shortlist_prob}%
-                    </p>
-                    """, unsafe_allow_html=True)
-                
-                with col_verdict:
-                    # Experience Level
-                    st.markdown(f"""
-                    <div class="tip-card">
-                        <h4>📈 Experience Level Assessment</h4>
-                        <p style="font-size: 1.2em; font-weight: bold;">{experience_level}</p>
-                        <p>Based on your skills and experience descriptions.</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Motivational quote
-                    st.markdown(f"""
-                    <div class="quote-box">
-                        {random.choice(MOTIVATIONAL_QUOTES)}
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                # Skill Match Summary
-                st.markdown('<div class="section-header">🎯 Skill Match Analysis</div>', unsafe_allow_html=True)
-                
-                col_skills1, col_skills2 = st.columns(2)
-                
-                with col_skills1:
-                    st.markdown("### ✅ Matched Skills")
-                    if keyword_match['matched_required'] or keyword_match['matched_preferred']:
-                        all_matched = keyword_match['matched_required'] + keyword_match['matched_preferred']
-                        for skill in all_matched:
-                            st.markdown(f'<span class="tech-term" style="background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);">{skill}</span>', unsafe_allow_html=True)
-                    else:
-                        st.info("No matching skills found")
-                
-                with col_skills2:
-                    st.markdown("### ❌ Missing Skills")
-                    all_missing = keyword_match['missing_required'] + keyword_match['missing_preferred']
-                    if all_missing:
-                        priority_missing = keyword_match['missing_required'][:5]
-                        for skill in priority_missing:
-                            st.markdown(f'<span class="tech-term" style="background: linear-gradient(135deg, #eb3349 0%, #f45c43 100%);">{skill}</span>', unsafe_allow_html=True)
-                    else:
-                        st.success("All required skills matched!")
-                
-                # Skill Match Progress Bar
-                st.markdown("### 📊 Skill Match Score")
-                st.progress(min(skill_match_pct / 100, 1.0))
-                st.caption(f"Skill Match: {int(skill_match_pct)}% ({len(keyword_match['matched_required'])}/{len(required_skills)} required, {len(keyword_match['matched_preferred'])}/{len(preferred_skills)} preferred)")
-                
-                # Project & Experience Analysis
-                st.markdown('<div class="section-header-orange">📁 Project & Experience Analysis</div>', unsafe_allow_html=True)
-                
-                col_proj1, col_proj2 = st.columns(2)
-                
-                with col_proj1:
-                    st.markdown("#### ✅ Strong Points")
-                    strong_points = []
-                    if project_indicators:
-                        strong_points.append(f"• {len(project_indicators)} project descriptions found")
-                    if action_usage:
-                        strong_points.append(f"• {len(set([v[0] for v in action_usage]))} action verbs used")
-                    if quantified:
-                        strong_points.append(f"• {len(quantified)} quantified achievements")
-                    if len(found_skills) >= 5:
-                        strong_points.append(f"• {len(found_skills)} technical skills listed")
-                    
-                    if strong_points:
-                        for point in strong_points:
-                            st.markdown(f"<div class='recruiter-note'>{point}</div>", unsafe_allow_html=True)
-                    else:
-                        st.warning("No strong points detected")
-                
-                with col_proj2:
-                    st.markdown("#### ⚠️ Areas for Improvement")
-                    weak_points = []
-                    if not project_indicators or len(project_indicators) < 2:
-                        weak_points.append("• Add more project descriptions")
-                    if not quantified:
-                        weak_points.append("• Include quantified results/metrics")
-                    if len(action_usage) < 3:
-                        weak_points.append("• Use more action verbs")
-                    if len(found_skills) < 5:
-                        weak_points.append("• Expand technical skills section")
-                    
-                    if weak_points:
-                        for point in weak_points:
-                            st.markdown(f"<div class='tip-card'>{point}</div>", unsafe_allow_html=True)
-                    else:
-                        st.success("Excellent project descriptions!")
-                
-                # Project Quality Score
-                st.markdown("### 📈 Project Quality Score")
-                st.progress(min(project_quality / 100, 1.0))
-                st.caption(f"Project Quality: {int(project_quality)}%")
-                
-                # Resume Quality Review
-                st.markdown('<div class="section-header-purple">📝 Resume Quality Review</div>', unsafe_allow_html=True)
-                
-                col_qual1, col_qual2 = st.columns(2)
-                
-                with col_qual1:
-                    st.markdown("#### 🏆 Formatting & Structure")
-                    for feedback in formatting_feedback:
-                        if '✅' in feedback:
-                            st.success(feedback)
-                        elif '❌' in feedback:
-                            st.error(feedback)
-                        else:
-                            st.warning(feedback)
-                
-                with col_qual2:
-                    st.markdown("#### 📋 ATS Safety Check")
-                    word_count = len(text.split())
-                    if 300 <= word_count <= 1000:
-                        st.success(f"✅ Optimal length ({word_count} words)")
-                    else:
-                        st.warning(f"⚠️ Word count: {word_count} (aim for 300-1000)")
-                    
-                    # Check for common issues
-                    if '|' not in text and '  ' * 5 not in text:
-                        st.success("✅ No tables/columns detected (ATS safe)")
-                    else:
-                        st.error("❌ Potential table formatting (ATS risk)")
-                
-                # Detailed Checklist
-                st.markdown("#### 📊 Detailed Checklist")
-                
-                checklist_items = [
-                    ("Contact Information", "Complete" if len(keyword_match['matched_required']) > 0 else "Missing", len(keyword_match['matched_required']) > 0),
-                    ("Skills Section", f"{len(found_skills)} skills found", len(found_skills) >= 3),
-                    ("Project Descriptions", f"{len(project_indicators)} projects", len(project_indicators) >= 2),
-                    ("Action Verbs", f"{len(action_usage)} used", len(action_usage) >= 3),
-                    ("Quantified Results", f"{len(quantified)} metrics", len(quantified) >= 1),
-                    ("ATS Formatting", "Clean" if '|' not in text else "Complex", '|' not in text),
-                ]
-                
-                for item_name, item_status, item_passed in checklist_items:
-                    icon = '✅' if item_passed else '❌'
-                    status_class = 'success-check' if item_passed else 'error-check'
-                    st.markdown(f"""
-                    <div class="checklist-item {status_class}">
-                        <span style="font-size: 1.4em; margin-right: 10px;">{icon}</span>
-                        <strong>{item_name}:</strong> {item_status}
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                # Top 5 Improvements
-                st.markdown('<div class="section-header">🏆 Top 5 Improvements to Get Shortlisted Faster</div>', unsafe_allow_html=True)
-                
-                for i, improvement in enumerate(suggestions[:5], 1):
-                    priority_icon = '🔴' if improvement['priority'] == 'high' else ('🟡' if improvement['priority'] == 'medium' else '🟢')
-                    st.markdown(f"""
-                    <div class="tip-card">
-                        <h4>{priority_icon} {i}. {improvement['title']}</h4>
-                        <p>{improvement['description']}</p>
-                        <small><strong>Section:</strong> {improvement['section']}</small>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                # Bullet Point Improvements
-                if bullet_improvements:
-                    st.markdown('<div class="section-header-orange">💡 Optimized Resume Bullet Examples</div>', unsafe_allow_html=True)
-                    
-                    for i, improvement in enumerate(bullet_improvements, 1):
-                        st.markdown(f"""
-                        <div style="margin: 15px 0;">
-                            <div class="bullet-before">
-                                <strong>❌ Before:</strong><br>{improvement['before']}
-                            </div>
-                            <div class="bullet-after">
-                                <strong>✅ After:</strong><br>{improvement['after']}
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                
-                # Technical Skills Found
-                if found_skills:
-                    st.markdown('<div class="section-header">🛠️ Technical Skills Detected</div>', unsafe_allow_html=True)
-                    
-                    # Group by category
-                    for category, skills in skill_categories.items():
-                        category_name = category.replace('_', ' ').title()
-                        st.markdown(f"**{category_name}:**")
-                        skills_html = '<div style="margin-bottom: 15px;">'
-                        for skill in skills:
-                            skills_html += f'<span class="tech-term">{skill}</span>'
-                        skills_html += '</div>'
-                        st.markdown(skills_html, unsafe_allow_html=True)
-                
-                # Recruiter's Final Verdict
-                st.markdown('<div class="section-header-green">🎯 Overall Recruiter Verdict</div>', unsafe_allow_html=True)
-                
-                # Generate verdict reasoning
-                reasons = []
-                if ats_score >= 70:
-                    reasons.append("✅ Strong ATS score indicating good keyword optimization")
-                else:
-                    reasons.append("⚠️ ATS score below optimal - needs keyword improvements")
-                
-                if skill_match_pct >= 70:
-                    reasons.append("✅ Good skill alignment with job requirements")
-                else:
-                    reasons.append("⚠️ Skill gaps identified that need addressing")
-                
-                if project_quality >= 60:
-                    reasons.append("✅ Solid project experience demonstrated")
-                else:
-                    reasons.append("⚠️ Project descriptions need more detail and metrics")
-                
-                for reason in reasons:
-                    st.markdown(f"<div class='recruiter-note'>{reason}</div>", unsafe_allow_html=True)
-                
-                # Final recommendation
-                st.markdown(f"""
-                <div class="{verdict_class}" style="margin-top: 20px;">
-                    <h2>{verdict_icon} {verdict}</h2>
-                    <p>Shortlisting Probability: {shortlist_prob}%</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                if verdict == "HIRE":
-                    st.success("🎉 Congratulations! Your resume is well-positioned for this role. Consider tailoring it slightly for each application.")
-                elif verdict == "BORDERLINE":
-                    st.warning("📝 Your resume has potential but needs improvements. Focus on the suggestions above to increase your chances.")
-                else:
-                    st.error("📚 Your resume needs significant improvements. Don't be discouraged - follow the actionable suggestions above to transform your resume!")
-                
-                # Encouragement
-                st.markdown(f"""
-                <div class="quote-box">
-                    {random.choice(MOTIVATIONAL_QUOTES)}
-                </div>
-                """, unsafe_allow_html=True)
+                with stage('render'):
+                    report = render_report_stream(stages)
+                render_revision_section(report)
+                render_history_section(report, upload.digest, upload.name)
     
     else:
         # Welcome message
@@ -1164,6 +1023,9 @@ def main():
         </div>
         """, unsafe_allow_html=True)
     
+    if show_performance and perf is not None:
+        render_performance_panel(perf)
+    
     # Footer
     st.markdown("---")
     st.markdown("""
@@ -0,0 +1 @@
+"""Performance benchmarks for resume_analyzer (run with ``python -m benchmarks.run``)."""
@@ -0,0 +1,234 @@
+"""
+Deterministic synthetic resume corpus.
+
+Resumes vary in length, skill density and bullet style and are rendered as
+plain text, DOCX and PDF, so every extractor and analyzer sees realistic
+input. The same seed always produces the same resumes::
+
+    python -m benchmarks.corpus out/ --count 200 --seed 7
+"""
+
+import argparse
+import os
+import random
+import sys
+from dataclasses import dataclass
+from io import BytesIO
+
+import docx
+
+from resume_analyzer.data import ACTION_VERBS_ALL, JOB_ROLES, TECH_SKILLS
+
+FORMATS = ('txt', 'docx', 'pdf')
+
+# Resume shapes: (experience entries, bullets per entry)
+LENGTHS = {
+    'short': (1, 3),
+    'medium': (3, 4),
+    'long': (6, 6),
+}
+
+# Bullet styles mix in the phrasing the analyzers look for
+BULLET_STYLES = ('strong', 'weak', 'plain', 'mixed')
+
+_MARKERS = ('• ', '- ', '* ', '')
+
+_FIRST_NAMES = ['Asha', 'Ravi', 'Maria', 'Chen', 'Fatima', 'John', 'Priya', 'Lucas', 'Amara', 'Kenji']
+_LAST_NAMES = ['Kumar', 'Silva', 'Okafor', 'Nguyen', 'Schmidt', 'Patel', 'Haddad', 'Lee', 'Moreau', 'Ivanova']
+_COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Stark Industries', 'Wayne Tech', 'Hooli', 'Vandelay']
+_TITLES = ['Software Engineer', 'Data Analyst', 'Senior Developer', 'Intern', 'Lead Engineer', 'Junior Developer']
+_OBJECTS = [
+    'the payment service', 'an internal analytics dashboard', 'a customer onboarding flow',
+    'the recommendation pipeline', 'CI/CD for 12 services', 'a REST API gateway', 'the data warehouse',
+    'a mobile checkout project', 'monitoring and alerting', 'the search backend'
+]
+_METRICS = [
+    'reducing latency by {n}%', 'serving {n} users', 'saving ${n}k per year', 'for {n} clients',
+    'cutting build time {n}x', 'increasing conversion by {n}%'
+]
+_WEAK_OPENERS = ['Responsible for', 'Helped with', 'Assisted in', 'Participated in', 'Duties include']
+
+_ALL_SKILLS = sorted({skill for skills in TECH_SKILLS.values() for skill in skills})
+
+
+@dataclass
+class SyntheticResume:
+    """One generated resume and how it was generated"""
+    name: str
+    length: str
+    skill_density: float
+    bullet_style: str
+    text: str
+
+
+@dataclass
+class CorpusDocument:
+    """A generated resume rendered in one file format"""
+    filename: str
+    format: str
+    data: bytes
+    resume: SyntheticResume
+
+
+def _bullet(rng, style):
+    """One experience bullet in the given style"""
+    if style == 'mixed':
+        style = rng.choice(BULLET_STYLES[:3])
+    thing = rng.choice(_OBJECTS)
+    metric = rng.choice(_METRICS).format(n=rng.randint(2, 95))
+    if style == 'strong':
+        text = f"{rng.choice(ACTION_VERBS_ALL).strip().capitalize()} {thing}, {metric}"
+    elif style == 'weak':
+        text = f"{rng.choice(_WEAK_OPENERS)} {thing} and various other tasks"
+    else:
+        text = f"work on {thing} with the team"
+    return rng.choice(_MARKERS) + text
+
+
+def generate_resume(seed, length='medium', skill_density=0.5, bullet_style='mixed'):
+    """Generate one resume as a list of lines
+
+    ``skill_density`` is the share of a role's skills (plus extra skills from
+    the taxonomy) that the resume mentions.
+    """
+    rng = random.Random(seed)
+    entries, bullets = LENGTHS[length]
+    role = JOB_ROLES[rng.choice(sorted(JOB_ROLES))]
+    role_skills = role['required_skills'] + role['preferred_skills']
+    skills = rng.sample(role_skills, round(len(role_skills) * skill_density))
+    skills += rng.sample(_ALL_SKILLS, round(20 * skill_density))
+    name = f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}"
+
+    lines = [
+        name,
+        f"{name.lower().replace(' ', '.')}@example.com | +1 555 {rng.randint(1000000, 9999999)} | linkedin.com/in/{name.split()[0].lower()}",
+        "",
+        "SUMMARY",
+        f"{rng.choice(_TITLES)} with {rng.randint(0, 12)} years of experience building software for {rng.choice(_COMPANIES)}.",
+        "",
+        "SKILLS",
+        ", ".join(dict.fromkeys(skills)),
+        "",
+        "EXPERIENCE",
+    ]
+    for _ in range(entries):
+        lines.append(f"{rng.choice(_TITLES)} - {rng.choice(_COMPANIES)} ({rng.randint(2012, 2024)})")
+        lines.extend(_bullet(rng, bullet_style) for _ in range(bullets))
+        lines.append("")
+    lines.append("PROJECTS")
+    for _ in range(max(1, entries // 2)):
+        lines.append(f"{rng.choice(_MARKERS)}Built {rng.choice(_OBJECTS)} using {', '.join(rng.sample(skills or _ALL_SKILLS, 2))}")
+    lines.extend([
+        "",
+        "EDUCATION",
+        f"B.Tech in Computer Science, {rng.randint(2010, 2024)}",
+        "",
+        "CERTIFICATIONS",
+        rng.choice(["AWS Certified Developer", "Coursera Machine Learning", "Udemy Docker Mastery"]),
+    ])
+    return lines
+
+
+def render_docx(lines):
+    """Render lines as a DOCX file, bullets as list paragraphs"""
+    document = docx.Document()
+    for line in lines:
+        if line[:2] in ('• ', '- ', '* '):
+            document.add_paragraph(line[2:], style='List Bullet')
+        else:
+            document.add_paragraph(line)
+    buffer = BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _pdf_escape(line):
+    # Standard Type 1 fonts only cover Latin-1; bullets become hyphens
+    line = line.replace('•', '-').encode('latin-1', 'replace').decode('latin-1')
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def render_pdf(lines, lines_per_page=60, wrap=95):
+    """Render lines as a minimal text PDF using the built-in Helvetica font"""
+    wrapped = []
+    for line in lines:
+        wrapped.extend([line[i:i + wrap] for i in range(0, len(line), wrap)] or [""])
+    pages = [wrapped[i:i + lines_per_page] for i in range(0, len(wrapped), lines_per_page)] or [[]]
+
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page_lines in pages:
+        ops = ["BT /F1 10 Tf 50 780 Td 12 TL"]
+        ops.extend(f"({_pdf_escape(line)}) Tj T*" for line in page_lines)
+        ops.append("ET")
+        stream = "\n".join(ops).encode('latin-1')
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 3 0 R >> >> >>" % len(objects)
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % kid for kid in kids), len(kids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def render(lines, file_format):
+    """Render resume lines in one of FORMATS"""
+    if file_format == 'txt':
+        return "\n".join(lines).encode('utf-8')
+    if file_format == 'docx':
+        return render_docx(lines)
+    if file_format == 'pdf':
+        return render_pdf(lines)
+    raise ValueError(f"Unknown format: {file_format}")
+
+
+def generate_corpus(count=60, seed=0, formats=FORMATS):
+    """Generate ``count`` resumes, each rendered in every requested format
+
+    Lengths, skill densities and bullet styles cycle so every combination
+    is represented in even a small corpus.
+    """
+    rng = random.Random(seed)
+    documents = []
+    for i in range(count):
+        length = sorted(LENGTHS)[i % len(LENGTHS)]
+        density = (0.2, 0.5, 0.9)[(i // len(LENGTHS)) % 3]
+        style = BULLET_STYLES[(i // (len(LENGTHS) * 3)) % len(BULLET_STYLES)]
+        lines = generate_resume(rng.getrandbits(32), length, density, style)
+        resume = SyntheticResume(f"resume_{i:04d}", length, density, style, "\n".join(lines))
+        for file_format in formats:
+            documents.append(CorpusDocument(f"{resume.name}.{file_format}", file_format, render(lines, file_format), resume))
+    return documents
+
+
+def main(argv=None):
+    """Write a corpus to a directory"""
+    parser = argparse.ArgumentParser(description="Write a deterministic synthetic resume corpus.")
+    parser.add_argument('directory', help="output directory")
+    parser.add_argument('-n', '--count', type=int, default=60, help="resumes to generate (default: 60)")
+    parser.add_argument('--seed', type=int, default=0, help="random seed (default: 0)")
+    parser.add_argument('--formats', default=','.join(FORMATS), help="comma-separated formats (default: txt,docx,pdf)")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.directory, exist_ok=True)
+    documents = generate_corpus(args.count, args.seed, tuple(args.formats.split(',')))
+    for document in documents:
+        with open(os.path.join(args.directory, document.filename), 'wb') as f:
+            f.write(document.data)
+    print(f"Wrote {len(documents)} files to {args.directory}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,346 @@
+"""
+Benchmark harness for the extractors, analyzers and full pipeline.
+
+Every benchmark runs over a synthetic corpus (see ``benchmarks.corpus``) and
+reports throughput and p50/p95/p99 latency per document. Results are
+compared with a stored baseline; the run fails when a benchmark is slower
+than the baseline by more than the tolerance, or when the scores the
+pipeline produces for the corpus have changed.
+
+The regression gate uses each document's best time over the repeats and
+scales the baseline by a fixed calibration workload timed in the same run,
+so load or clock-speed drift on a shared machine does not read as a
+regression::
+
+    python -m benchmarks.run                      # compare with benchmarks/baseline.json
+    python -m benchmarks.run --update-baseline    # record a new baseline on this machine
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+from dataclasses import asdict, dataclass
+from io import BytesIO
+
+from resume_analyzer.analysis import (
+    analyze_experience_level, analyze_formatting, analyze_projects, analyze_resume, analyze_tech_skills,
+    calculate_ats_score, calculate_keyword_match, generate_bullet_improvements, resolve_role
+)
+from resume_analyzer.context import AnalysisContext
+from resume_analyzer.extraction import extract_text
+from resume_analyzer.rules import default_rules
+
+from .corpus import FORMATS, generate_corpus
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Allowed slowdown over the baseline before a benchmark counts as a regression
+DEFAULT_TOLERANCE = 0.25
+
+# Slowdowns smaller than this are timer noise on microsecond-scale benchmarks
+MIN_DELTA_MS = 0.02
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing summary for one benchmark"""
+    name: str
+    documents: int
+    docs_per_sec: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    best_p50_ms: float
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(name, timings):
+    """Build a BenchmarkResult from per-document lists of timings in seconds"""
+    ordered = sorted(seconds for per_document in timings for seconds in per_document)
+    best = sorted(min(per_document) for per_document in timings)
+    total = sum(ordered)
+    return BenchmarkResult(
+        name=name,
+        documents=len(ordered),
+        docs_per_sec=len(ordered) / total if total else 0.0,
+        p50_ms=percentile(ordered, 50) * 1000,
+        p95_ms=percentile(ordered, 95) * 1000,
+        p99_ms=percentile(ordered, 99) * 1000,
+        best_p50_ms=percentile(best, 50) * 1000
+    )
+
+
+def time_calls(func, inputs, repeat, prepare=None):
+    """Time ``func`` once per input, ``repeat`` times over, after a short warm-up
+
+    ``prepare`` builds the argument for each call outside the timed region.
+    Returns one list of timings per input.
+    """
+    for item in inputs[:3]:
+        func(prepare(item) if prepare else item)
+    timings = [[] for _ in inputs]
+    for _ in range(repeat):
+        for i, item in enumerate(inputs):
+            argument = prepare(item) if prepare else item
+            start = time.perf_counter()
+            func(argument)
+            timings[i].append(time.perf_counter() - start)
+    return timings
+
+
+def calibrate(rounds=5):
+    """Best time in milliseconds of a fixed pure-Python workload
+
+    Used to scale baseline timings to how fast this machine is right now.
+    """
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        counts = {}
+        for i in range(200_000):
+            key = str(i % 997)
+            counts[key] = counts.get(key, 0) + 1
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def prepared_context(text):
+    """Context with the shared derived data (lines, words, matcher and rule passes) already computed
+
+    Analyzer benchmarks use these so each one is timed on its own work,
+    while the shared pass is timed separately as 'context'.
+    """
+    ctx = AnalysisContext(text)
+    for name in ('lower', 'lines', 'lines_lower', 'non_empty_lines', 'words', 'word_count', 'line_starts', 'term_hits', 'terms', 'line_classes'):
+        getattr(ctx, name)
+    return ctx
+
+
+def python_docx_text(item):
+    """DOCX text through python-docx's object model, the reference for 'extract:docx'"""
+    import docx
+
+    return "".join(paragraph.text + "\n" for paragraph in docx.Document(BytesIO(item[0])).paragraphs)
+
+
+def build_benchmarks(documents):
+    """(name, func, inputs, prepare) for every benchmark over a corpus"""
+    _, required_skills, preferred_skills = resolve_role(None)
+    texts = [document.resume.text for document in documents if document.format == FORMATS[0]]
+    if not texts:
+        texts = list(dict.fromkeys(document.resume.text for document in documents))
+
+    def keyword_match(ctx):
+        return calculate_keyword_match(ctx, required_skills, preferred_skills)
+
+    def experience_level(ctx):
+        return analyze_experience_level(ctx, ctx.results['found_skills'])
+
+    def with_found_skills(text):
+        ctx = prepared_context(text)
+        ctx.results['found_skills'] = analyze_tech_skills(prepared_context(text))[0]
+        return ctx
+
+    def ats_score(ctx):
+        return calculate_ats_score(ctx, ctx.results['keyword_match'], ctx.results['formatting_score'])
+
+    def with_ats_inputs(text):
+        # ATS scoring reuses cached analyzer results, so time it on a context
+        # where only the keyword match and formatting score are known
+        scratch = prepared_context(text)
+        ctx = prepared_context(text)
+        ctx.results['keyword_match'] = keyword_match(scratch)
+        ctx.results['formatting_score'] = analyze_formatting(scratch)[0]
+        return ctx
+
+    edits = itertools.count()
+
+    def revised(text):
+        # A re-upload of an already analyzed resume with one line edited
+        lines = text.split('\n')
+        middle = len(lines) // 2
+        lines[middle] = f"{lines[middle]} (revision {next(edits)})"
+        return '\n'.join(lines)
+
+    def cold_context(text):
+        default_rules().clear_memo()
+        return AnalysisContext(text)
+
+    def revised_context(text):
+        return AnalysisContext(revised(text))
+
+    def line_classes(ctx):
+        return ctx.line_classes
+
+    benchmarks = []
+    for file_format in FORMATS:
+        files = [(document.data, document.filename) for document in documents if document.format == file_format]
+        if files:
+            benchmarks.append((f"extract:{file_format}", lambda item: extract_text(*item), files, None))
+        if files and file_format == 'docx':
+            benchmarks.append(("extract:docx:python-docx", python_docx_text, files, None))
+    benchmarks.extend([
+        ('context', prepared_context, texts, None),
+        ('analyzer:calculate_keyword_match', keyword_match, texts, prepared_context),
+        ('analyzer:analyze_tech_skills', analyze_tech_skills, texts, prepared_context),
+        ('analyzer:analyze_projects', analyze_projects, texts, prepared_context),
+        ('analyzer:analyze_formatting', analyze_formatting, texts, prepared_context),
+        ('analyzer:analyze_experience_level', experience_level, texts, with_found_skills),
+        ('analyzer:generate_bullet_improvements', generate_bullet_improvements, texts, prepared_context),
+        ('analyzer:calculate_ats_score', ats_score, texts, with_ats_inputs),
+        ('pipeline:analyze_resume', analyze_resume, texts, None),
+        # Only line classification is memoized per line; the rest of the
+        # pipeline re-reads the whole revised resume
+        ('rules:line_classes:cold', line_classes, texts, cold_context),
+        ('rules:line_classes:one_line_edited', line_classes, texts, revised_context),
+        ('pipeline:analyze_resume:one_line_edited', analyze_resume, texts, revised),
+    ])
+    for file_format in FORMATS:
+        files = [(document.data, document.filename) for document in documents if document.format == file_format]
+        if files:
+            benchmarks.append((
+                f"pipeline:end_to_end:{file_format}",
+                lambda item: analyze_resume(item[0], filename=item[1]),
+                files,
+                None
+            ))
+    return benchmarks
+
+
+def result_fingerprint(documents):
+    """Hash of the scores the pipeline gives every resume in the corpus
+
+    A change in this value means an analyzer's output changed, not just
+    its speed.
+    """
+    scores = []
+    for document in documents:
+        report = analyze_resume(document.data, filename=document.filename)
+        scores.append([
+            document.filename, report.ats_score, round(report.skill_match_pct, 3), report.project_quality,
+            report.shortlist_prob, report.verdict, report.experience_level, sorted(report.found_skills)
+        ])
+    return hashlib.sha256(json.dumps(scores).encode('utf-8')).hexdigest()
+
+
+def run_benchmarks(count=30, seed=0, repeat=5, only=None):
+    """Run every benchmark and return (results, fingerprint)"""
+    documents = generate_corpus(count, seed)
+    results = []
+    for name, func, inputs, prepare in build_benchmarks(documents):
+        if only and not any(pattern in name for pattern in only):
+            continue
+        results.append(summarize(name, time_calls(func, inputs, repeat, prepare)))
+        print(f"  {name:<42} {results[-1].p50_ms:9.3f} ms p50", file=sys.stderr)
+    return results, result_fingerprint(documents)
+
+
+def compare(results, fingerprint, baseline, tolerance=DEFAULT_TOLERANCE, calibration_ms=None):
+    """List human-readable regressions against a baseline dict
+
+    A benchmark regresses when its best-of-repeats median latency is more
+    than ``tolerance`` (and more than ``MIN_DELTA_MS``) above the baseline's,
+    after scaling the baseline by the ratio of calibration times.
+    """
+    problems = []
+    scale = 1.0
+    if calibration_ms and baseline.get('calibration_ms'):
+        scale = calibration_ms / baseline['calibration_ms']
+    if baseline.get('fingerprint') and fingerprint != baseline['fingerprint']:
+        problems.append("pipeline scores for the benchmark corpus differ from the baseline")
+    recorded = {entry['name']: entry for entry in baseline.get('results', [])}
+    for result in results:
+        base = recorded.get(result.name)
+        if base is None:
+            continue
+        expected = base['best_p50_ms'] * scale
+        if result.best_p50_ms > expected * (1 + tolerance) and result.best_p50_ms - expected > MIN_DELTA_MS:
+            problems.append(f"{result.name}: best p50 {result.best_p50_ms:.3f} ms vs {expected:.3f} ms expected from baseline")
+    return problems
+
+
+def format_table(results, baseline=None):
+    """Plain-text results table, with the change in best p50 when a baseline is known"""
+    recorded = {entry['name']: entry for entry in (baseline or {}).get('results', [])}
+    header = f"{'benchmark':<42} {'docs/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'vs base':>8}"
+    rows = [header, '-' * len(header)]
+    for result in results:
+        base = recorded.get(result.name)
+        change = f"{(result.best_p50_ms / base['best_p50_ms'] - 1) * 100:+7.1f}%" if base and base['best_p50_ms'] else ''
+        rows.append(
+            f"{result.name:<42} {result.docs_per_sec:>10.1f} {result.p50_ms:>9.3f} "
+            f"{result.p95_ms:>9.3f} {result.p99_ms:>9.3f} {change:>8}"
+        )
+    return "\n".join(rows)
+
+
+def build_parser():
+    """Create the command-line parser"""
+    parser = argparse.ArgumentParser(description="Benchmark resume extraction and analysis.")
+    parser.add_argument('-n', '--count', type=int, default=30, help="synthetic resumes per format (default: 30)")
+    parser.add_argument('--seed', type=int, default=0, help="corpus seed (default: 0)")
+    parser.add_argument('-r', '--repeat', type=int, default=5, help="timed passes over the corpus (default: 5)")
+    parser.add_argument('-k', '--only', action='append', help="run only benchmarks whose name contains this text")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="baseline file (default: benchmarks/baseline.json)")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help="allowed slowdown, e.g. 0.25 for 25%%")
+    parser.add_argument('--update-baseline', action='store_true', help="write these results as the new baseline")
+    parser.add_argument('--json', help="also write the results to this JSON file")
+    return parser
+
+
+def main(argv=None):
+    """Command-line entry point; exits 1 on regression"""
+    args = build_parser().parse_args(argv)
+    calibration_ms = calibrate()
+    results, fingerprint = run_benchmarks(args.count, args.seed, args.repeat, args.only)
+    calibration_ms = min(calibration_ms, calibrate())
+    report = {
+        'corpus': {'count': args.count, 'seed': args.seed, 'repeat': args.repeat},
+        'machine': {'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count()},
+        'calibration_ms': calibration_ms,
+        'fingerprint': fingerprint,
+        'results': [asdict(result) for result in results]
+    }
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print(format_table(results, baseline))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+    if baseline is None:
+        print("No baseline found; run with --update-baseline to record one", file=sys.stderr)
+        return 0
+
+    if baseline.get('corpus') != report['corpus']:
+        print("Warning: corpus settings differ from the baseline; timings may not be comparable", file=sys.stderr)
+        baseline = dict(baseline, fingerprint=None)
+    problems = compare(results, fingerprint, baseline, args.tolerance, calibration_ms)
+    for problem in problems:
+        print(f"REGRESSION {problem}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
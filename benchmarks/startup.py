@@ -0,0 +1,183 @@
+"""
+Cold-start import report and startup regression check.
+
+Each entry point is imported in a fresh interpreter with ``-X importtime``.
+The report lists what the import cost, module by module, and the check
+fails when an entry point starts importing one of the heavy libraries that
+are meant to load lazily, or when its import time grows past the stored
+baseline::
+
+    python -m benchmarks.startup                    # check against benchmarks/startup_baseline.json
+    python -m benchmarks.startup --report app       # per-module cost of importing the Streamlit app
+    python -m benchmarks.startup --update-baseline
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'startup_baseline.json')
+
+# Modules whose import is timed: what Streamlit, batch workers and library users load
+TARGETS = ('resume_analyzer', 'resume_analyzer.batch', 'resume_analyzer.skill_index', 'app')
+
+# Libraries that must only load when the code path that needs them runs
+LAZY_MODULES = ('numpy', 'pandas', 'scipy', 'sklearn', 'PyPDF2', 'docx', 'textblob', 'nltk')
+
+# Allowed growth over the baseline, relative and absolute
+DEFAULT_TOLERANCE = 0.5
+MIN_DELTA_MS = 25.0
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+@dataclass
+class ModuleCost:
+    """Import cost of one module, in milliseconds"""
+    name: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int
+
+
+@dataclass
+class StartupResult:
+    """Best-of-N startup measurement for one target"""
+    target: str
+    import_ms: float
+    process_ms: float
+    modules: list
+
+    def imported(self):
+        """Names of every module imported at startup"""
+        return {module.name for module in self.modules}
+
+    def lazy_violations(self, lazy_modules=LAZY_MODULES):
+        """Heavy libraries that were imported eagerly"""
+        loaded = {name.split('.')[0] for name in self.imported()}
+        return sorted(loaded.intersection(lazy_modules))
+
+
+def parse_importtime(stderr):
+    """ModuleCost for each ``-X importtime`` line, in the order they were printed"""
+    modules = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append(ModuleCost(name, int(self_us) / 1000, int(cumulative_us) / 1000, (len(indent) - 1) // 2))
+    return modules
+
+
+def measure(target, runs=5):
+    """Import ``target`` in ``runs`` fresh interpreters and keep the fastest run"""
+    best = None
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    for _ in range(runs):
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {target}'],
+            cwd=ROOT, env=env, capture_output=True, text=True
+        )
+        process_ms = (time.perf_counter() - start) * 1000
+        if completed.returncode != 0:
+            raise RuntimeError(f"import {target} failed:\n{completed.stderr[-2000:]}")
+        modules = parse_importtime(completed.stderr)
+        top = next((module for module in modules if module.name == target and module.depth == 0), None)
+        import_ms = top.cumulative_ms if top else 0.0
+        if best is None or import_ms < best.import_ms:
+            best = StartupResult(target, import_ms, process_ms, modules)
+    return best
+
+
+def package_costs(result):
+    """Self time summed per top-level package, most expensive first"""
+    totals = {}
+    for module in result.modules:
+        package = module.name.split('.')[0]
+        totals[package] = totals.get(package, 0.0) + module.self_ms
+    return sorted(totals.items(), key=lambda item: -item[1])
+
+
+def format_report(result, top=15):
+    """Per-package and per-module cost of importing one target"""
+    lines = [f"{result.target}: {result.import_ms:.1f} ms import, {result.process_ms:.1f} ms process start to exit", ""]
+    lines.append(f"{'package':<40} {'self ms':>9}")
+    for package, self_ms in package_costs(result)[:top]:
+        lines.append(f"{package:<40} {self_ms:>9.1f}")
+    lines += ["", f"{'module':<40} {'cumulative ms':>14} {'self ms':>9}"]
+    for module in sorted(result.modules, key=lambda module: -module.cumulative_ms)[:top]:
+        lines.append(f"{module.name:<40} {module.cumulative_ms:>14.1f} {module.self_ms:>9.1f}")
+    return "\n".join(lines)
+
+
+def check(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """List startup problems: eager heavy imports and import-time regressions"""
+    problems = []
+    recorded = baseline.get('targets', {}) if baseline else {}
+    for result in results:
+        violations = result.lazy_violations()
+        if violations:
+            problems.append(f"{result.target} imports {', '.join(violations)} at startup")
+        base = recorded.get(result.target)
+        if base is not None:
+            limit = base['import_ms'] * (1 + tolerance)
+            if result.import_ms > limit and result.import_ms - base['import_ms'] > MIN_DELTA_MS:
+                problems.append(f"{result.target}: import {result.import_ms:.1f} ms vs baseline {base['import_ms']:.1f} ms")
+    return problems
+
+
+def build_parser():
+    """Create the command-line parser"""
+    parser = argparse.ArgumentParser(description="Measure and check cold-start import time.")
+    parser.add_argument('targets', nargs='*', help=f"modules to import (default: {', '.join(TARGETS)})")
+    parser.add_argument('--runs', type=int, default=5, help="fresh interpreters per target; the fastest counts (default: 5)")
+    parser.add_argument('--report', action='store_true', help="print the per-package and per-module breakdown")
+    parser.add_argument('--top', type=int, default=15, help="rows in the breakdown (default: 15)")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="baseline file (default: benchmarks/startup_baseline.json)")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help="allowed import-time growth, e.g. 0.5 for 50%%")
+    parser.add_argument('--update-baseline', action='store_true', help="write these timings as the new baseline")
+    return parser
+
+
+def main(argv=None):
+    """Command-line entry point; exits 1 when a check fails"""
+    args = build_parser().parse_args(argv)
+    results = [measure(target, args.runs) for target in (args.targets or TARGETS)]
+
+    for result in results:
+        if args.report:
+            print(format_report(result, args.top))
+            print()
+        else:
+            print(f"{result.target:<32} {result.import_ms:9.1f} ms import {result.process_ms:9.1f} ms process")
+
+    baseline = {'targets': {}}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    if args.update_baseline:
+        # Only the measured targets are replaced
+        for result in results:
+            baseline['targets'][result.target] = {'import_ms': round(result.import_ms, 1), 'process_ms': round(result.process_ms, 1)}
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        baseline = None
+
+    problems = check(results, baseline, args.tolerance)
+    for problem in problems:
+        print(f"STARTUP REGRESSION {problem}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,29 @@
+"""
+Headless ATS resume analysis engine.
+
+Import ``analyze_resume`` to score a resume without the Streamlit UI::
+
+    from resume_analyzer import analyze_resume
+    report = analyze_resume(text, 'Data Scientist')
+    print(report.ats_score, report.verdict)
+"""
+
+from .analysis import (
+    ResumeReport,
+    analyze_experience_level,
+    analyze_formatting,
+    analyze_projects,
+    analyze_resume,
+    analyze_tech_skills,
+    calculate_ats_score,
+    calculate_keyword_match,
+    calculate_project_quality,
+    calculate_shortlist_probability,
+    calculate_skill_match,
+    determine_verdict,
+    generate_bullet_improvements,
+    generate_improvements,
+    resolve_role,
+)
+from .data import ACTION_VERBS, ACTION_VERBS_ALL, DEFAULT_ROLE, JOB_ROLES, TECH_SKILLS
+from .extraction import extract_text, extract_text_from_file
@@ -0,0 +1,533 @@
+"""
+Headless resume analysis engine.
+
+Every scorer used by the Streamlit app lives here so the analysis can run
+in-process (batch jobs, services) without importing Streamlit. The single
+entry point is ``analyze_resume()``, which returns a ``ResumeReport``.
+"""
+
+import re
+from dataclasses import asdict, dataclass, field
+
+from .data import DEFAULT_ROLE, JUNIOR_KEYWORDS, SENIOR_KEYWORDS
+from .context import as_context, cached_analysis
+from .extraction import extract_text
+from .jd_match import has_job_description, jd_matcher, jd_points
+from .metrics import stage
+from .rules import default_rules
+from .taxonomy import current_taxonomy
+
+
+@cached_analysis
+def calculate_keyword_match(ctx, required_skills, preferred_skills):
+    """Calculate keyword matching with job description"""
+    found = ctx.find_terms(list(required_skills) + list(preferred_skills))
+    canonical = ctx.taxonomy.matcher.canonical
+    
+    matched_required = []
+    missing_required = []
+    matched_preferred = []
+    missing_preferred = []
+    
+    for skill in required_skills:
+        if canonical(skill) in found:
+            matched_required.append(skill)
+        else:
+            missing_required.append(skill)
+    
+    for skill in preferred_skills:
+        if canonical(skill) in found:
+            matched_preferred.append(skill)
+        else:
+            missing_preferred.append(skill)
+    
+    return {
+        'matched_required': matched_required,
+        'missing_required': missing_required,
+        'matched_preferred': matched_preferred,
+        'missing_preferred': missing_preferred
+    }
+
+
+@cached_analysis
+def analyze_tech_skills(ctx):
+    """Analyze and extract technical skills from text"""
+    taxonomy = ctx.taxonomy
+    found_skills = []
+    skill_categories = {}
+    
+    # Visit only the skills that were found, then restore the table's order
+    found = set()
+    for term in ctx.terms:
+        found.update(taxonomy.skill_positions.get(term, ()))
+    for position in sorted(found):
+        category, skill = taxonomy.skill_table[position]
+        skill_categories.setdefault(category, []).append(skill)
+        found_skills.append(skill)
+    
+    return list(set(found_skills)), skill_categories
+
+
+@cached_analysis
+def analyze_projects(ctx):
+    """Analyze project descriptions"""
+    project_indicators = []
+    action_verb_usage = []
+    quantified_results = []
+    
+    # Keep the first action verb on each line from the shared matcher pass
+    first_verbs = {}
+    for start, term in ctx.term_hits:
+        if term in ctx.taxonomy.action_verb_terms:
+            first_verbs.setdefault(ctx.line_index(start), term)
+    
+    # Check for project descriptions and quantified results (numbers, percentages)
+    rules = default_rules()
+    for i, (line, categories) in enumerate(zip(ctx.lines, ctx.line_classes)):
+        if 'project' in categories:
+            project_indicators.append(line.strip())
+        
+        # Check for action verbs
+        if i in first_verbs:
+            action_verb_usage.append((first_verbs[i], line.strip()))
+        
+        if 'quantified' in categories:
+            quantified_results.append((line.strip(), rules.findall('quantified', ctx.lines_lower[i])))
+    
+    return project_indicators, action_verb_usage, quantified_results
+
+
+@cached_analysis
+def analyze_formatting(ctx):
+    """Analyze resume formatting quality"""
+    text = ctx.text
+    score = 0
+    feedback = []
+    non_empty_lines = ctx.non_empty_lines
+    
+    # Check for section headers
+    section_headers = ['experience', 'education', 'skills', 'projects', 'summary', 'objective', 'certifications', 'work experience', 'professional experience', 'technical skills']
+    header_count = sum(1 for header in section_headers if header in ctx.lower)
+    
+    if header_count >= 4:
+        score += 20
+        feedback.append("✅ Excellent section organization")
+    elif header_count >= 2:
+        score += 12
+        feedback.append("⚠️ Basic section organization")
+    else:
+        score += 5
+        feedback.append("❌ Missing clear section headers")
+    
+    # Check for bullet points
+    bullet_count = sum(1 for categories in ctx.non_empty_line_classes[:30] if 'bullet' in categories)
+    
+    if bullet_count >= 10:
+        score += 15
+        feedback.append("✅ Good use of bullet points")
+    elif bullet_count >= 5:
+        score += 10
+        feedback.append("⚠️ Some bullet points used")
+    else:
+        score += 3
+        feedback.append("❌ Consider using bullet points")
+    
+    # Check for consistent formatting
+    line_lengths = [len(line) for line in non_empty_lines[:30] if len(line) < 100]
+    avg_length = sum(line_lengths) / len(line_lengths) if line_lengths else 0
+    
+    if 30 <= avg_length <= 80:
+        score += 15
+        feedback.append("✅ Good line length consistency")
+    else:
+        score += 7
+        feedback.append("⚠️ Varying line lengths")
+    
+    # Check for contact information
+    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+    phone_pattern = r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
+    linkedin_pattern = r'linkedin\.com/in/'
+    
+    has_email = bool(re.search(email_pattern, text))
+    has_phone = bool(re.search(phone_pattern, text))
+    has_linkedin = bool(re.search(linkedin_pattern, ctx.lower))
+    
+    contact_score = 0
+    if has_email:
+        contact_score += 7
+    if has_phone:
+        contact_score += 7
+    if has_linkedin:
+        contact_score += 6
+    score += contact_score
+    
+    # Check for graphics/tables (basic detection)
+    if '|' in text or '  ' * 5 in text:
+        score -= 10
+        feedback.append("⚠️ Potential table/column structure detected (ATS risk)")
+    
+    return score, feedback
+
+
+@cached_analysis
+def analyze_experience_level(ctx, found_skills):
+    """Estimate experience level based on skills and content"""
+    text_lower = ctx.lower
+    word_count = ctx.word_count
+    
+    # Experience indicators
+    junior_count = sum(1 for keyword in JUNIOR_KEYWORDS if keyword in text_lower)
+    senior_count = sum(1 for keyword in SENIOR_KEYWORDS if keyword in text_lower)
+    
+    # Skill depth analysis
+    skill_depth = len(found_skills)
+    
+    if junior_count > senior_count:
+        level = "Fresher/Entry Level"
+    elif senior_count > junior_count:
+        level = "Senior/Experienced Level"
+    else:
+        if skill_depth >= 10 and word_count >= 500:
+            level = "Mid to Senior Level"
+        elif skill_depth >= 5 and word_count >= 300:
+            level = "Junior to Mid Level"
+        else:
+            level = "Fresher/Entry Level"
+    
+    return level
+
+
+def generate_improvements(checks, keyword_match, project_analysis, improvements_list):
+    """Generate prioritized improvement suggestions"""
+    suggestions = []
+    
+    # High priority
+    if keyword_match['missing_required']:
+        suggestions.append({
+            'priority': 'high',
+            'title': '🎯 Add Missing Required Skills',
+            'description': f"Critical skills missing from your resume: {', '.join(keyword_match['missing_required'][:5])}. Add these to your skills section or highlight in experience.",
+            'section': 'Skills'
+        })
+    
+    if not project_analysis[0] or len(project_analysis[0]) < 2:
+        suggestions.append({
+            'priority': 'high',
+            'title': '📁 Strengthen Project Section',
+            'description': 'Add at least 2-3 detailed project descriptions with measurable outcomes. Use the STAR method.',
+            'section': 'Projects'
+        })
+    
+    if checks['contact']['score'] < 14:
+        suggestions.append({
+            'priority': 'high',
+            'title': '📞 Complete Contact Information',
+            'description': 'Ensure your email, phone, and LinkedIn URL are present and professional.',
+            'section': 'Contact'
+        })
+    
+    # Medium priority
+    if keyword_match['missing_preferred']:
+        suggestions.append({
+            'priority': 'medium',
+            'title': '⭐ Add Preferred Skills',
+            'description': f"Consider adding these nice-to-have skills: {', '.join(keyword_match['missing_preferred'][:5])}",
+            'section': 'Skills'
+        })
+    
+    if not project_analysis[2]:
+        suggestions.append({
+            'priority': 'medium',
+            'title': '📈 Quantify Your Achievements',
+            'description': 'Add specific metrics, percentages, or numbers to demonstrate impact (e.g., "Improved performance by 40%").',
+            'section': 'Experience'
+        })
+    
+    if not project_analysis[1]:
+        suggestions.append({
+            'priority': 'medium',
+            'title': '💪 Use Action Verbs',
+            'description': 'Start bullet points with strong action verbs like "Developed," "Optimized," "Led," "Achieved."',
+            'section': 'Experience'
+        })
+    
+    # Format suggestions
+    if len(suggestions) > 5:
+        suggestions = suggestions[:5]
+    
+    return suggestions
+
+
+@cached_analysis
+def generate_bullet_improvements(ctx):
+    """Generate specific bullet point improvements"""
+    improvements = []
+    
+    weak_bullets = []
+    strong_bullets = []
+    
+    # Weak and strong phrasing come from the shared line classification
+    for line, categories in zip(ctx.lines, ctx.line_classes):
+        line = line.strip()
+        if not line:
+            continue
+        
+        if 'weak' in categories and 'strong' not in categories:
+            weak_bullets.append((line, categories))
+        elif 'strong' in categories:
+            strong_bullets.append(line)
+    
+    # Generate improvements
+    for weak, categories in weak_bullets[:3]:
+        improved = weak
+        
+        # Add action verb if missing
+        if not ctx.taxonomy.action_verb_terms & ctx.taxonomy.matcher.find_terms(weak.lower()):
+            improved = f"Developed and {improved.lower()}"
+        
+        # Add metric placeholder if missing
+        if 'number' not in categories:
+            improved = improved + " resulting in measurable impact"
+        
+        improvements.append({
+            'before': weak,
+            'after': improved
+        })
+    
+    return improvements[:3]
+
+
+def calculate_ats_score(text, keyword_match, formatting_score, jd_similarity=None):
+    """Calculate overall ATS score
+
+    When a job description similarity is given, it takes 10 of the 30
+    keyword points (required skills 15, preferred skills 5).
+    """
+    ctx = as_context(text)
+    score = 0
+    max_score = 100
+    
+    # Keyword matching (30 points)
+    required_match_rate = len(keyword_match['matched_required']) / max(len(keyword_match['matched_required']) + len(keyword_match['missing_required']), 1)
+    preferred_match_rate = len(keyword_match['matched_preferred']) / max(len(keyword_match['matched_preferred']) + len(keyword_match['missing_preferred']), 1)
+    
+    if jd_similarity is None:
+        keyword_score = (required_match_rate * 20) + (preferred_match_rate * 10)
+    else:
+        keyword_score = (required_match_rate * 15) + (preferred_match_rate * 5) + jd_points(jd_similarity)
+    score += keyword_score
+    
+    # Formatting (20 points)
+    score += min(formatting_score, 20)
+    
+    # Skills coverage (20 points)
+    found_skills, _ = analyze_tech_skills(ctx)
+    skill_score = min(len(found_skills) * 2, 20)
+    score += skill_score
+    
+    # Experience/Projects (20 points)
+    project_indicators, action_usage, quantified = analyze_projects(ctx)
+    exp_score = min(len(project_indicators) * 5 + len(quantified) * 3 + len(action_usage) * 2, 20)
+    score += exp_score
+    
+    # Contact & Completeness (10 points)
+    word_count = ctx.word_count
+    if 300 <= word_count <= 1000:
+        score += 10
+    elif 200 <= word_count < 300 or 1000 < word_count <= 1500:
+        score += 7
+    else:
+        score += 3
+    
+    return min(int(score), 100)
+
+
+def calculate_shortlist_probability(ats_score, skill_match, project_quality):
+    """Calculate shortlisting probability"""
+    base_score = ats_score
+    
+    # Adjust for skill match
+    if skill_match >= 80:
+        base_score += 10
+    elif skill_match >= 60:
+        base_score += 5
+    elif skill_match < 40:
+        base_score -= 10
+    
+    # Adjust for project quality
+    if project_quality >= 80:
+        base_score += 10
+    elif project_quality >= 60:
+        base_score += 5
+    elif project_quality < 40:
+        base_score -= 10
+    
+    return min(max(base_score, 5), 95)
+
+
+def calculate_skill_match(keyword_match, required_skills, preferred_skills):
+    """Calculate the percentage of role skills found in the resume"""
+    total_required = len(required_skills) + len(preferred_skills)
+    matched = len(keyword_match['matched_required']) + len(keyword_match['matched_preferred'])
+    return (matched / total_required * 100) if total_required > 0 else 50
+
+
+def calculate_project_quality(project_indicators, action_usage, quantified):
+    """Calculate project quality score"""
+    return min(len(project_indicators) * 20 + len(quantified) * 15 + len(action_usage) * 10, 100)
+
+
+def determine_verdict(shortlist_prob):
+    """Determine recruiter verdict from shortlist probability"""
+    if shortlist_prob >= 70:
+        return "HIRE"
+    elif shortlist_prob >= 50:
+        return "BORDERLINE"
+    else:
+        return "REJECT"
+
+
+def resolve_role(role=None, taxonomy=None):
+    """Resolve a job role name or skills dict to (name, required_skills, preferred_skills)
+
+    Role names are looked up in ``taxonomy`` (default: the current one).
+    """
+    if role is None:
+        return "Default", list(DEFAULT_ROLE['required_skills']), list(DEFAULT_ROLE['preferred_skills'])
+    if isinstance(role, str):
+        job_roles = (taxonomy or current_taxonomy()).job_roles
+        if role not in job_roles:
+            raise ValueError(f"Unknown job role: {role!r}")
+        skills = job_roles[role]
+        return role, list(skills['required_skills']), list(skills['preferred_skills'])
+    return (
+        role.get('name', "Custom"),
+        list(role.get('required_skills', [])),
+        list(role.get('preferred_skills', []))
+    )
+
+
+@dataclass
+class ResumeReport:
+    """Everything the analyzer computes for one resume and one role
+
+    While ``iter_analysis`` is running, fields of stages that have not
+    finished yet are still None.
+    """
+    role: str
+    required_skills: list
+    preferred_skills: list
+    word_count: int
+    keyword_match: dict = None
+    found_skills: list = None
+    skill_categories: dict = None
+    project_indicators: list = None
+    action_usage: list = None
+    quantified: list = None
+    formatting_score: int = None
+    formatting_feedback: list = None
+    ats_score: int = None
+    skill_match_pct: float = None
+    project_quality: int = None
+    shortlist_prob: int = None
+    experience_level: str = None
+    verdict: str = None
+    jd_similarity: float = None
+    suggestions: list = field(default_factory=list)
+    bullet_improvements: list = field(default_factory=list)
+    text: str = field(default="", repr=False)
+
+    def to_dict(self, include_text=False):
+        """Convert the report to JSON-serializable primitives"""
+        data = asdict(self)
+        if not include_text:
+            data.pop('text')
+        return data
+
+
+# Stages yielded by iter_analysis, in order ('jd_similarity' only with a job description)
+ANALYSIS_STAGES = ('keywords', 'skills', 'projects', 'formatting', 'jd_similarity', 'score', 'suggestions', 'bullets')
+
+
+def iter_analysis(source, role=None, filename=None, job_description=None):
+    """Run the analysis pipeline one stage at a time
+
+    Yields ``(stage, report)`` after each stage in ``ANALYSIS_STAGES``; the
+    same ResumeReport is filled in as stages finish, so a UI can draw each
+    section as soon as its data exists. Arguments are as for
+    ``analyze_resume``.
+    """
+    if isinstance(source, bytes):
+        if filename is None:
+            raise ValueError("filename is required when analyzing raw bytes")
+        text = extract_text(source, filename)
+    else:
+        text = source
+    ctx = as_context(text)
+
+    # Shared per-document work: lowercasing, line splitting and the matcher pass
+    with stage('context', chars=len(ctx.text)) as record:
+        ctx.term_hits
+        record.sizes['lines'] = len(ctx.lines)
+        record.sizes['words'] = ctx.word_count
+
+    role_name, required_skills, preferred_skills = resolve_role(role, ctx.taxonomy)
+    report = ResumeReport(
+        role=role_name,
+        required_skills=required_skills,
+        preferred_skills=preferred_skills,
+        word_count=ctx.word_count,
+        text=ctx.text
+    )
+
+    report.keyword_match = calculate_keyword_match(ctx, required_skills, preferred_skills)
+    yield 'keywords', report
+
+    report.found_skills, report.skill_categories = analyze_tech_skills(ctx)
+    report.experience_level = analyze_experience_level(ctx, report.found_skills)
+    yield 'skills', report
+
+    report.project_indicators, report.action_usage, report.quantified = analyze_projects(ctx)
+    yield 'projects', report
+
+    report.formatting_score, report.formatting_feedback = analyze_formatting(ctx)
+    yield 'formatting', report
+
+    if has_job_description(job_description):
+        with stage('jd_similarity'):
+            report.jd_similarity = jd_matcher(job_description).similarity(ctx.text)
+        yield 'jd_similarity', report
+
+    with stage('calculate_ats_score'):
+        report.ats_score = calculate_ats_score(ctx, report.keyword_match, report.formatting_score, report.jd_similarity)
+    report.skill_match_pct = calculate_skill_match(report.keyword_match, required_skills, preferred_skills)
+    report.project_quality = calculate_project_quality(report.project_indicators, report.action_usage, report.quantified)
+    report.shortlist_prob = calculate_shortlist_probability(report.ats_score, report.skill_match_pct, report.project_quality)
+    report.verdict = determine_verdict(report.shortlist_prob)
+    yield 'score', report
+
+    with stage('generate_improvements'):
+        report.suggestions = generate_improvements(
+            {'contact': {'score': report.formatting_score // 3}},
+            report.keyword_match,
+            (report.project_indicators, report.action_usage, report.quantified),
+            []
+        )
+    yield 'suggestions', report
+
+    report.bullet_improvements = generate_bullet_improvements(ctx)
+    yield 'bullets', report
+
+
+def analyze_resume(source, role=None, filename=None, job_description=None):
+    """Run the full analysis pipeline on one resume
+
+    ``source`` is either the extracted resume text or the raw file bytes, in
+    which case ``filename`` selects the extractor. ``role`` is a job role of
+    the current taxonomy (``JOB_ROLES`` by default), a dict with ``required_skills``/``preferred_skills``
+    (and optionally ``name``), or None for the default role. A pasted
+    ``job_description`` adds TF-IDF similarity to the ATS score.
+    """
+    for _, report in iter_analysis(source, role, filename, job_description):
+        pass
+    return report
@@ -0,0 +1,140 @@
+"""
+Streaming ingestion of ZIP archives of resumes.
+
+Members are decompressed one at a time straight from the archive, never
+unpacked to disk, and handed to a process pool for extraction and scoring.
+At most ``depth`` members are in flight (read but not yet scored), so
+reading the next member overlaps with scoring the earlier ones while peak
+memory stays proportional to the pipeline depth rather than the archive
+size::
+
+    python -m resume_analyzer.batch exports/ats-export.zip --role "Data Scientist" > scores.jsonl
+
+Records are named ``<archive>/<member>``.
+"""
+
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+
+from .batch import SUPPORTED_EXTENSIONS, score_data
+from .ingest import UploadLimits, UploadTooLarge
+from .metrics import enable_log_lines, trace
+
+# Members in flight per worker process
+DEPTH_PER_WORKER = 2
+
+# Members are read in chunks of this many bytes
+CHUNK_BYTES = 64 * 1024
+
+
+def is_archive(path):
+    """Whether ``path`` is a ZIP file"""
+    return os.path.isfile(path) and zipfile.is_zipfile(path)
+
+
+def _member_is_resume(info, extensions):
+    name = info.filename
+    if info.is_dir() or name.startswith('__MACOSX/') or os.path.basename(name).startswith('.'):
+        return False
+    return name.lower().endswith(extensions)
+
+
+def _read_member(archive, info, max_bytes):
+    """Decompress one member, refusing to go past ``max_bytes`` whatever its header claims"""
+    if info.file_size > max_bytes:
+        raise UploadTooLarge(info.filename, max_bytes)
+    parts = []
+    size = 0
+    with archive.open(info) as member:
+        while True:
+            chunk = member.read(CHUNK_BYTES)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLarge(info.filename, max_bytes)
+            parts.append(chunk)
+    return b"".join(parts)
+
+
+def iter_archive_members(path, extensions=SUPPORTED_EXTENSIONS, max_member_bytes=None):
+    """Yield ``(member_name, bytes_or_exception)`` for each resume in a ZIP archive, in archive order
+
+    Directories, macOS metadata and unsupported file types are skipped.
+    A member that cannot be read (encrypted, corrupt, or over
+    ``max_member_bytes``, default: the upload limit) is yielded with the
+    exception instead of its bytes.
+    """
+    max_member_bytes = max_member_bytes or UploadLimits.from_env().max_bytes
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            if not _member_is_resume(info, extensions):
+                continue
+            try:
+                yield info.filename, _read_member(archive, info, max_member_bytes)
+            except (ValueError, RuntimeError, OSError, zipfile.BadZipFile, EOFError) as e:
+                yield info.filename, e
+
+
+def score_member(data, path, role=None, cache_dir=None, job_description=None, log_metrics=False):
+    """Extract and score one archive member's bytes; never raises, like ``score_file``"""
+    if log_metrics:
+        enable_log_lines()
+    with trace('batch', path=path):
+        return score_data(data, path, role, cache_dir, job_description)
+
+
+def _error_record(path, error):
+    return {'path': path, 'error': f"{type(error).__name__}: {error}"}
+
+
+def score_archive(path, role=None, workers=None, depth=None, ordered=True, cache_dir=None, job_description=None,
+                  log_metrics=False, max_member_bytes=None):
+    """Score every resume in a ZIP archive, yielding one record per member as it finishes
+
+    ``workers`` defaults to the number of CPU cores and ``depth`` (members
+    read ahead of scoring) to ``DEPTH_PER_WORKER`` per worker. With
+    ``ordered=False`` records are yielded in completion order.
+    """
+    workers = workers or os.cpu_count() or 1
+    depth = max(depth or workers * DEPTH_PER_WORKER, 1)
+    options = dict(role=role, cache_dir=cache_dir, job_description=job_description, log_metrics=log_metrics)
+    members = iter_archive_members(path, max_member_bytes=max_member_bytes)
+    if workers == 1:
+        for name, data in members:
+            member_path = os.path.join(path, name)
+            if isinstance(data, Exception):
+                yield _error_record(member_path, data)
+            else:
+                yield score_member(data, member_path, **options)
+        return
+
+    with ProcessPoolExecutor(workers) as pool:
+        in_flight = deque()
+        for name, data in members:
+            member_path = os.path.join(path, name)
+            if isinstance(data, Exception):
+                future = Future()
+                future.set_result(_error_record(member_path, data))
+            else:
+                future = pool.submit(score_member, data, member_path, **options)
+            # Drop our reference so only the pending task holds the bytes
+            data = None
+            in_flight.append(future)
+            while len(in_flight) >= depth:
+                yield from _drain(in_flight, ordered)
+        while in_flight:
+            yield from _drain(in_flight, ordered)
+
+
+def _drain(in_flight, ordered):
+    """Wait for the oldest record (ordered) or any finished ones, and remove them from ``in_flight``"""
+    if ordered:
+        yield in_flight.popleft().result()
+        return
+    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+    for future in [future for future in in_flight if future in done]:
+        in_flight.remove(future)
+        yield future.result()
@@ -0,0 +1,200 @@
+"""
+Batch scoring of resume directories.
+
+Walks a directory, scores every resume across a process pool and streams
+one JSON line per resume as it finishes. A ZIP archive is streamed member
+by member instead (see ``archive``)::
+
+    python -m resume_analyzer.batch resumes/ --role "Data Scientist" --workers 8 > scores.jsonl
+    python -m resume_analyzer.batch resumes.zip --role "Data Scientist" > scores.jsonl
+"""
+
+import argparse
+import json
+import os
+import sys
+from functools import lru_cache, partial
+from multiprocessing import Pool
+
+from .cache import ResultCache, cached_analyze, cached_extract_text, default_cache, hash_bytes
+from .metrics import enable_log_lines, trace
+from .sandbox import ExtractionFailure
+from .skill_index import SkillIndex, index_terms
+from .taxonomy import current_taxonomy
+
+# File types the extractors understand
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+
+def iter_resume_files(directory, extensions=SUPPORTED_EXTENSIONS):
+    """Yield resume file paths under a directory in a stable order"""
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(extensions):
+                yield os.path.join(root, name)
+
+
+def summarize_report(path, report):
+    """Build the JSON record written for one scored resume"""
+    return {
+        'path': path,
+        'role': report.role,
+        'ats_score': report.ats_score,
+        'skill_match_pct': round(report.skill_match_pct, 1),
+        'project_quality': report.project_quality,
+        'shortlist_prob': report.shortlist_prob,
+        'verdict': report.verdict,
+        'experience_level': report.experience_level,
+        'word_count': report.word_count,
+        'missing_required': report.keyword_match['missing_required'],
+        'jd_similarity': report.jd_similarity,
+        'terms': sorted(index_terms(report))
+    }
+
+
+@lru_cache(maxsize=None)
+def disk_cache(directory):
+    """One cache per worker process and directory"""
+    return ResultCache(directory=directory)
+
+
+def score_file(path, role=None, cache_dir=None, job_description=None, log_metrics=False):
+    """Extract and score one resume file
+
+    Never raises: failures are reported in the record's ``error`` field so
+    one bad file cannot stop a batch. Extraction failures also set
+    ``failure`` to 'timeout', 'oom', 'parse_error' or 'crash'. With ``cache_dir`` set, unchanged
+    files are served from the on-disk result cache. With ``log_metrics``,
+    per-stage timings are written to stderr as one JSON line per file.
+    """
+    if log_metrics:
+        enable_log_lines()
+    with trace('batch', path=path):
+        return _score_file(path, role, cache_dir, job_description)
+
+
+def _score_file(path, role, cache_dir, job_description):
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        return {'path': path, 'error': f"{type(e).__name__}: {e}"}
+    return score_data(data, path, role, cache_dir, job_description)
+
+
+def score_data(data, path, role=None, cache_dir=None, job_description=None):
+    """Extract and score resume bytes named ``path``; never raises, like ``score_file``"""
+    try:
+        cache = disk_cache(cache_dir) if cache_dir else default_cache()
+        digest = hash_bytes(data)
+        text = cached_extract_text(data, path, cache, digest)
+        if not text or not text.strip():
+            return {'path': path, 'error': "No text could be extracted"}
+        return summarize_report(path, cached_analyze(data, path, role, cache, digest, job_description=job_description))
+    except ExtractionFailure as e:
+        return {'path': path, 'error': str(e), 'failure': e.kind}
+    except Exception as e:
+        return {'path': path, 'error': f"{type(e).__name__}: {e}"}
+
+
+def run_batch(paths, role=None, workers=None, chunksize=4, ordered=True, cache_dir=None, job_description=None, log_metrics=False):
+    """Score resume files in parallel, yielding one record per file as it finishes
+
+    ``workers`` defaults to the number of CPU cores. With ``ordered=False``
+    records are yielded in completion order, which keeps every worker busy
+    when file sizes vary a lot.
+    """
+    workers = workers or os.cpu_count() or 1
+    score = partial(score_file, role=role, cache_dir=cache_dir, job_description=job_description, log_metrics=log_metrics)
+    if workers == 1:
+        yield from map(score, paths)
+        return
+    with Pool(workers) as pool:
+        imap = pool.imap if ordered else pool.imap_unordered
+        yield from imap(score, paths, chunksize)
+
+
+def parse_role(args):
+    """Build the role argument for analyze_resume from CLI options"""
+    if args.required_skills or args.preferred_skills:
+        return {
+            'name': args.role or "Custom",
+            'required_skills': [s.strip() for s in (args.required_skills or '').split(',') if s.strip()],
+            'preferred_skills': [s.strip() for s in (args.preferred_skills or '').split(',') if s.strip()]
+        }
+    return args.role
+
+
+def build_parser():
+    """Create the command-line parser"""
+    parser = argparse.ArgumentParser(description="Score a directory or ZIP archive of resumes and write JSON lines.")
+    parser.add_argument('directory', help="directory to scan recursively, or ZIP archive to stream, for PDF/DOCX/TXT resumes")
+    parser.add_argument('--role', choices=list(current_taxonomy().job_roles), metavar='ROLE', help="target job role (default: generic role)")
+    parser.add_argument('--required-skills', help="comma-separated required skills for a custom role")
+    parser.add_argument('--preferred-skills', help="comma-separated preferred skills for a custom role")
+    parser.add_argument('--job-description', help="text file with a job description to score similarity against")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('-c', '--chunksize', type=int, default=4, help="files handed to a worker at a time (default: 4)")
+    parser.add_argument('--depth', type=int, default=None,
+                        help="archive members read ahead of scoring (default: 2 per worker)")
+    parser.add_argument('--unordered', action='store_true', help="write records as they finish instead of in file order")
+    parser.add_argument('-o', '--output', help="output file (default: stdout)")
+    parser.add_argument('--cache-dir', help="reuse results for unchanged files from this cache directory")
+    parser.add_argument('--log-metrics', action='store_true', help="write per-stage timings to stderr as JSON lines")
+    parser.add_argument('--index', help="add scored resumes to this skill index file (created if missing)")
+    return parser
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    from .archive import is_archive, score_archive
+
+    args = build_parser().parse_args(argv)
+    archive = is_archive(args.directory)
+    if not archive and not os.path.isdir(args.directory):
+        print(f"Not a directory or ZIP archive: {args.directory}", file=sys.stderr)
+        return 2
+
+    job_description = None
+    if args.job_description:
+        with open(args.job_description, encoding='utf-8') as f:
+            job_description = f.read()
+
+    index = SkillIndex.open(args.index) if args.index else None
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    scored = failed = 0
+    try:
+        options = dict(
+            role=parse_role(args),
+            workers=args.workers,
+            ordered=not args.unordered,
+            cache_dir=args.cache_dir,
+            job_description=job_description,
+            log_metrics=args.log_metrics
+        )
+        if archive:
+            records = score_archive(args.directory, depth=args.depth, **options)
+        else:
+            records = run_batch(iter_resume_files(args.directory), chunksize=args.chunksize, **options)
+        for record in records:
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            if 'error' in record:
+                failed += 1
+            else:
+                scored += 1
+                if index is not None:
+                    index.add(record['path'], record['terms'])
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if index is not None:
+            index.save(args.index)
+
+    print(f"Scored {scored} resumes, {failed} failed", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
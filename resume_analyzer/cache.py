@@ -0,0 +1,336 @@
+"""
+Content-addressed cache for extracted text and analysis reports.
+
+Extraction results are keyed by the SHA-256 of the uploaded bytes; reports
+by the bytes plus the role's skill lists, any job description and the
+taxonomy version. Entries live in an in-memory LRU and, optionally, in a
+size-bounded directory on disk shared by processes.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+
+from .analysis import analyze_resume, iter_analysis, resolve_role
+from .extraction import DEFAULT_MAX_CHARS, DEFAULT_MAX_PAGES
+from .ingest import UploadLimits, extract_upload
+from .metrics import stage
+from .sandbox import extract_isolated
+from .taxonomy import current_taxonomy
+
+# Bump whenever extraction or analyzer output changes so stale entries are ignored
+CACHE_VERSION = 6
+
+_MISSING = object()
+
+logger = logging.getLogger(__name__)
+
+
+def hash_bytes(data):
+    """SHA-256 hex digest of file contents"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class LRUCache:
+    """Thread-safe in-memory least-recently-used cache"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            except KeyError:
+                return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskCache:
+    """Pickle-per-entry cache directory, evicting least recently used files past ``max_bytes``"""
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._size = self._scan_size()
+
+    def _path(self, key):
+        name = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, name[:2], name + '.pkl')
+
+    def _entries(self):
+        """Yield (path, size, mtime) for every cache file"""
+        for sub in os.scandir(self.directory):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                yield entry.path, stat.st_size, stat.st_mtime
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def get(self, key, default=None):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return default
+        try:
+            # Refresh mtime so eviction sees this entry as recently used
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key, value):
+        """Store an entry; best-effort, so a full or read-only disk only logs a warning"""
+        path = self._path(key)
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Could not write cache entry to %s: %s", self.directory, e)
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            return
+        with self._lock:
+            self._size += len(blob)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Delete the oldest entries until the directory is under 90% of the budget"""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+        self._size = total
+
+
+class ResultCache:
+    """Two-tier (memory, then optional disk) cache with hit/miss counters, safe to share between threads"""
+
+    def __init__(self, max_entries=256, directory=None, max_disk_bytes=256 * 1024 * 1024):
+        self.memory = LRUCache(max_entries)
+        self.disk = DiskCache(directory, max_disk_bytes) if directory else None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._counter_lock = threading.Lock()
+
+    def _count(self, counter):
+        with self._counter_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, key, default=None):
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            self._count('memory_hits')
+            return value
+        if self.disk is not None:
+            value = self.disk.get(key, _MISSING)
+            if value is not _MISSING:
+                self._count('disk_hits')
+                self.memory.put(key, value)
+                return value
+        self._count('misses')
+        return default
+
+    def put(self, key, value):
+        self.memory.put(key, value)
+        if self.disk is not None:
+            self.disk.put(key, value)
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for ``key``, computing and storing it on a miss"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def stats(self):
+        """Hit/miss counters for display or logging"""
+        with self._counter_lock:
+            memory_hits, disk_hits, misses = self.memory_hits, self.disk_hits, self.misses
+        lookups = memory_hits + disk_hits + misses
+        return {
+            'memory_hits': memory_hits,
+            'disk_hits': disk_hits,
+            'misses': misses,
+            'hit_rate': (memory_hits + disk_hits) / lookups if lookups else 0.0,
+            'memory_entries': len(self.memory)
+        }
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def default_cache():
+    """Process-wide cache, configured from the environment on first use
+
+    ``RESUME_ANALYZER_CACHE_DIR`` enables the disk tier,
+    ``RESUME_ANALYZER_CACHE_ENTRIES`` sizes the memory tier and
+    ``RESUME_ANALYZER_CACHE_MB`` bounds the disk tier.
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ResultCache(
+                max_entries=int(os.environ.get('RESUME_ANALYZER_CACHE_ENTRIES', 256)),
+                directory=os.environ.get('RESUME_ANALYZER_CACHE_DIR') or None,
+                max_disk_bytes=int(os.environ.get('RESUME_ANALYZER_CACHE_MB', 256)) * 1024 * 1024
+            )
+        return _default_cache
+
+
+def _extension(filename):
+    return os.path.splitext(filename)[1].lower()
+
+
+def _budget_suffix(max_pages, max_chars):
+    # Extraction budgets other than the defaults are part of a key
+    if (max_pages, max_chars) != (DEFAULT_MAX_PAGES, DEFAULT_MAX_CHARS):
+        return f":{max_pages}:{max_chars}"
+    return ""
+
+
+def text_cache_key(digest, filename, max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS):
+    """Cache key for text extracted within the given budgets"""
+    return f"text:v{CACHE_VERSION}:{digest}:{_extension(filename)}" + _budget_suffix(max_pages, max_chars)
+
+
+def report_cache_key(digest, filename, role=None, job_description=None, max_pages=DEFAULT_MAX_PAGES,
+                     max_chars=DEFAULT_MAX_CHARS):
+    """Cache key for an analysis report of a file, extracted within the given budgets, against a role and job description"""
+    taxonomy = current_taxonomy()
+    role_name, required_skills, preferred_skills = resolve_role(role, taxonomy)
+    role_part = hashlib.sha256(json.dumps([role_name, required_skills, preferred_skills, job_description or "", taxonomy.version]).encode('utf-8')).hexdigest()
+    return f"report:v{CACHE_VERSION}:{digest}:{_extension(filename)}:{role_part}" + _budget_suffix(max_pages, max_chars)
+
+
+def _staged_get_or_compute(name, cache, key, compute, **sizes):
+    """``cache.get_or_compute`` timed as a pipeline stage that records the cache hit"""
+    with stage(name, **sizes) as record:
+        value = cache.get(key, _MISSING)
+        record.cache_hit = value is not _MISSING
+        if not record.cache_hit:
+            value = compute()
+            cache.put(key, value)
+        return value
+
+
+def cached_extract_text(data, filename, cache=None, digest=None, workers=None, max_pages=DEFAULT_MAX_PAGES,
+                        max_chars=DEFAULT_MAX_CHARS):
+    """Extract text from file bytes, reusing earlier extractions of identical bytes
+
+    Extraction runs in the sandbox, so failures are raised as
+    ExtractionFailure. ``workers`` enables page-parallel extraction for
+    large PDFs.
+    """
+    cache = cache or default_cache()
+    digest = digest or hash_bytes(data)
+    return _staged_get_or_compute(
+        'extract', cache, text_cache_key(digest, filename, max_pages, max_chars),
+        lambda: extract_isolated(data, filename, max_pages, max_chars, workers),
+        bytes=len(data)
+    )
+
+
+def cached_extract_upload(upload, limits=None, cache=None, workers=None):
+    """Extract text from an ingested Upload, reusing earlier extractions of identical bytes"""
+    limits = limits or UploadLimits()
+    return _staged_get_or_compute(
+        'extract', cache or default_cache(), text_cache_key(upload.digest, upload.name, limits.max_pages, limits.max_chars),
+        lambda: extract_upload(upload, limits, workers),
+        bytes=upload.size
+    )
+
+
+def cached_analyze(data, filename, role=None, cache=None, digest=None, workers=None, job_description=None,
+                   max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS, text=None):
+    """Analyze file bytes, extracted within the given budgets, against a role, reusing earlier reports for identical inputs
+
+    Like ``cached_analysis_stages``, a caller with the ``digest`` and
+    extracted ``text`` may pass None for ``data``.
+    """
+    cache = cache or default_cache()
+    digest = digest or hash_bytes(data)
+    return _staged_get_or_compute(
+        'analyze', cache, report_cache_key(digest, filename, role, job_description, max_pages, max_chars),
+        lambda: analyze_resume(
+            text if text is not None else cached_extract_text(data, filename, cache, digest, workers, max_pages, max_chars),
+            role,
+            job_description=job_description
+        )
+    )
+
+
+def cached_analysis_stages(data, filename, role=None, cache=None, digest=None, workers=None, job_description=None,
+                           text=None, max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS):
+    """Like ``cached_analyze``, but yield ``(stage, report)`` as each analysis stage finishes
+
+    A cached report is yielded once as stage ``'report'``. Otherwise the
+    stages of ``iter_analysis`` are passed through and the finished report
+    is cached once the generator has been run to the end. A caller that
+    already has the ``digest`` and extracted ``text`` may pass None for
+    ``data``, along with the budgets the text was extracted within.
+    """
+    cache = cache or default_cache()
+    digest = digest or hash_bytes(data)
+    key = report_cache_key(digest, filename, role, job_description, max_pages, max_chars)
+    with stage('report_cache') as record:
+        report = cache.get(key, _MISSING)
+        record.cache_hit = report is not _MISSING
+    if report is not _MISSING:
+        yield 'report', report
+        return
+    if text is None:
+        text = cached_extract_text(data, filename, cache, digest, workers, max_pages, max_chars)
+    for name, report in iter_analysis(text, role, job_description=job_description):
+        yield name, report
+    cache.put(key, report)
@@ -0,0 +1,127 @@
+"""
+Per-document analysis context.
+
+Lowercasing, line splitting, tokenization and the keyword matcher pass are
+done once per document and shared by every analyzer. The context pins the
+taxonomy in effect when it was created, so a taxonomy reload never mixes
+two taxonomies in one analysis. Analyzer results are
+memoized on the context too, so ``calculate_ats_score`` reuses the skill
+and project analyses that ``analyze_resume`` already ran.
+"""
+
+from bisect import bisect_right
+from functools import cached_property, wraps
+
+from .matcher import find_terms
+from .metrics import stage
+from .rules import default_rules
+from .taxonomy import current_taxonomy
+
+
+class AnalysisContext:
+    """Text of one resume plus everything derived from it"""
+
+    def __init__(self, text, taxonomy=None):
+        self.text = text
+        self.taxonomy = taxonomy or current_taxonomy()
+        self.results = {}
+
+    @cached_property
+    def lower(self):
+        return self.text.lower()
+
+    @cached_property
+    def lines(self):
+        return self.text.split('\n')
+
+    @cached_property
+    def lines_lower(self):
+        return self.lower.split('\n')
+
+    @cached_property
+    def non_empty_lines(self):
+        return [line.strip() for line in self.lines if line.strip()]
+
+    @cached_property
+    def words(self):
+        return self.text.split()
+
+    @cached_property
+    def word_count(self):
+        return len(self.words)
+
+    @cached_property
+    def line_starts(self):
+        """Offset of each line in ``lower``"""
+        starts = []
+        offset = 0
+        for line in self.lines_lower:
+            starts.append(offset)
+            offset += len(line) + 1
+        return starts
+
+    @cached_property
+    def term_hits(self):
+        """(offset, term) for every skill/verb occurrence, in document order"""
+        return list(self.taxonomy.matcher.finditer(self.lower))
+
+    @cached_property
+    def terms(self):
+        """Set of skill/verb terms present anywhere in the document"""
+        return {term for _, term in self.term_hits}
+
+    @cached_property
+    def line_classes(self):
+        """Rule categories ('weak', 'strong', ...) matched by each line, memoized by line content"""
+        return default_rules().classify_lines(self.lines_lower)
+
+    @cached_property
+    def non_empty_line_classes(self):
+        """``line_classes`` of the lines in ``non_empty_lines``"""
+        return [categories for line, categories in zip(self.lines, self.line_classes) if line.strip()]
+
+    def line_index(self, offset):
+        """Line number containing an offset of ``lower``"""
+        return bisect_right(self.line_starts, offset) - 1
+
+    def find_terms(self, terms):
+        """Return which of ``terms`` occur in the document, normalized"""
+        return find_terms(self.lower, terms, found=self.terms, matcher=self.taxonomy.matcher)
+
+
+def as_context(text):
+    """Wrap text in an AnalysisContext unless it already is one"""
+    return text if isinstance(text, AnalysisContext) else AnalysisContext(text)
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(value)
+    return value
+
+
+def cached_analysis(func):
+    """Memoize an analyzer on the document context
+
+    The decorated function receives an ``AnalysisContext`` as its first
+    argument; callers may still pass plain text. Results are cached per
+    context and per (hashable) remaining arguments. Each computed (not
+    memoized) result is timed as a pipeline stage named after the function.
+    """
+    name = func.__name__
+
+    @wraps(func)
+    def wrapper(text, *args):
+        ctx = as_context(text)
+        key = (name,) + tuple(_freeze(arg) for arg in args)
+        try:
+            return ctx.results[key]
+        except KeyError:
+            pass
+        except TypeError:
+            with stage(name):
+                return func(ctx, *args)
+        with stage(name):
+            result = ctx.results[key] = func(ctx, *args)
+        return result
+    return wrapper
@@ -0,0 +1,142 @@
+"""
+Skill, role and keyword tables used by the resume analyzers.
+"""
+
+# Tech Skills Database
+TECH_SKILLS = {
+    'programming_languages': ['python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'go', 'rust', 'scala', 'kotlin', 'typescript', 'php', 'swift', 'r', 'matlab', 'perl', 'bash', 'shell'],
+    'frontend': ['html', 'css', 'react', 'vue', 'angular', 'jquery', 'bootstrap', 'tailwind', 'sass', 'less', 'webpack', 'vite', 'nextjs', 'nuxt', 'svelte'],
+    'backend': ['node.js', 'express', 'django', 'flask', 'spring', 'laravel', 'rails', 'asp.net', 'fastapi', 'nestjs', 'gin', 'echo', 'play'],
+    'databases': ['sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch', 'cassandra', 'dynamodb', 'oracle', 'sqlite', 'mariadb', 'firebase'],
+    'cloud_devops': ['aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'terraform', 'ansible', 'ci/cd', 'git', 'github', 'gitlab', 'bitbucket', 'circleci', 'travis'],
+    'data_science': ['machine learning', 'deep learning', 'tensorflow', 'pytorch', 'pandas', 'numpy', 'scikit-learn', 'data analysis', 'statistics', 'nlp', 'computer vision', 'data visualization', 'tableau', 'power bi'],
+    'testing': ['unit testing', 'integration testing', 'selenium', 'pytest', 'jest', 'mocha', 'testing', 'test-driven development', 'tdd', 'BDD', 'cypress'],
+    'soft_skills': ['communication', 'teamwork', 'leadership', 'problem-solving', 'time management', 'agile', 'scrum', 'project management', 'collaboration', 'analytical', 'creative']
+}
+
+# Other spellings of skills, mapped to the canonical name used above
+SKILL_ALIASES = {
+    'k8s': 'kubernetes',
+    'postgres': 'postgresql',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'node': 'node.js',
+    'nodejs': 'node.js',
+    'google cloud': 'gcp',
+    'google cloud platform': 'gcp',
+    'amazon web services': 'aws',
+    'microsoft azure': 'azure',
+    'scikit learn': 'scikit-learn',
+    'sklearn': 'scikit-learn',
+    'golang': 'go',
+    'vuejs': 'vue',
+    'vue.js': 'vue',
+    'angularjs': 'angular',
+    'next.js': 'nextjs',
+    'nest.js': 'nestjs',
+    'mongo': 'mongodb',
+    'elastic search': 'elasticsearch',
+    'powerbi': 'power bi',
+    'cicd': 'ci/cd',
+    'ci-cd': 'ci/cd',
+    'natural language processing': 'nlp',
+    'problem solving': 'problem-solving',
+    'test driven development': 'test-driven development'
+}
+
+# Job Role Categories
+JOB_ROLES = {
+    'Software Developer': {
+        'required_skills': ['python', 'java', 'javascript', 'git', 'sql', 'problem-solving'],
+        'preferred_skills': ['docker', 'aws', 'react', 'agile', 'ci/cd']
+    },
+    'Data Analyst': {
+        'required_skills': ['python', 'sql', 'data analysis', 'statistics', 'tableau'],
+        'preferred_skills': ['pandas', 'numpy', 'machine learning', 'power bi', 'excel']
+    },
+    'Data Scientist': {
+        'required_skills': ['python', 'machine learning', 'statistics', 'sql', 'data analysis'],
+        'preferred_skills': ['tensorflow', 'pytorch', 'deep learning', 'nlp', 'data visualization']
+    },
+    'Frontend Developer': {
+        'required_skills': ['html', 'css', 'javascript', 'react', 'git'],
+        'preferred_skills': ['vue', 'angular', 'typescript', 'webpack', 'testing']
+    },
+    'Backend Developer': {
+        'required_skills': ['python', 'java', 'sql', 'git', 'api'],
+        'preferred_skills': ['docker', 'aws', 'microservices', 'ci/cd', 'redis']
+    },
+    'Full Stack Developer': {
+        'required_skills': ['javascript', 'react', 'python', 'sql', 'git'],
+        'preferred_skills': ['docker', 'aws', 'node.js', 'mongodb', 'ci/cd']
+    },
+    'DevOps Engineer': {
+        'required_skills': ['docker', 'kubernetes', 'aws', 'ci/cd', 'terraform'],
+        'preferred_skills': ['python', 'linux', 'jenkins', 'ansible', 'git']
+    },
+    'Machine Learning Engineer': {
+        'required_skills': ['python', 'machine learning', 'tensorflow', 'sql', 'deep learning'],
+        'preferred_skills': ['pytorch', 'docker', 'aws', 'mlops', 'kubernetes']
+    }
+}
+
+# Comprehensive Action Verbs Organized by Category
+ACTION_VERBS = {
+    # Leadership & Management
+    'leadership': ['led', 'managed', 'directed', 'coordinated', 'supervised', 'mentored', 'coached', 'spearheaded', 'championed', 'overseen'],
+    
+    # Technical & Development
+    'technical': ['developed', 'created', 'designed', 'implemented', 'built', 'engineered', 'architected', 'coded', 'programmed', 'constructed', 'fabricated', 'assembled'],
+    
+    # Optimization & Improvement
+    'optimization': ['optimized', 'improved', 'enhanced', 'streamlined', 'refined', 'upgraded', 'transformed', 'modernized', 'revamped', 'restructured'],
+    
+    # Achievement & Results
+    'achievement': ['achieved', 'delivered', 'exceeded', 'accomplished', 'completed', 'finished', 'concluded', 'finalized', 'executed', 'produced'],
+    
+    # Analysis & Research
+    'analysis': ['analyzed', 'investigated', 'evaluated', 'assessed', 'examined', 'reviewed', 'studied', 'researched', 'audited', 'diagnosed', 'identified'],
+    
+    # Problem Solving
+    'problem_solving': ['solved', 'resolved', 'fixed', 'repaired', 'troubleshot', 'debugged', 'corrected', 'rectified', 'remedied', 'mitigated'],
+    
+    # Communication
+    'communication': ['communicated', 'presented', 'communicated', 'collaborated', 'negotiated', 'facilitated', 'mediated', 'presented', 'demonstrated', 'explained'],
+    
+    # Innovation & Creation
+    'innovation': ['innovated', 'pioneered', 'initiated', 'introduced', 'established', 'launched', 'instigated', 'originated', 'conceived', 'devised'],
+    
+    # Efficiency & Reduction
+    'efficiency': ['increased', 'decreased', 'reduced', 'lowered', 'minimized', 'maximized', 'eliminated', 'cut', 'slashed', 'condensed'],
+    
+    # Automation & Integration
+    'automation': ['automated', 'integrated', 'deployed', 'configured', 'installed', 'implemented', 'customized', 'modified', 'adapted', 'converted'],
+    
+    # Strategic & Planning
+    'strategic': ['planned', 'organized', 'strategized', 'prioritized', 'scheduled', 'forecasted', 'projected', 'budgeted', 'allocated', 'assigned'],
+    
+    # Training & Development
+    'training': ['trained', 'taught', 'educated', 'instructed', 'developed', 'certified', 'qualified', 'prepared', ' onboarded', 'guided']
+}
+
+# Flattened list for checking
+ACTION_VERBS_ALL = [verb for verbs in ACTION_VERBS.values() for verb in verbs]
+
+# Project Keywords
+PROJECT_KEYWORDS = ['project', 'developed', 'built', 'created', 'designed', 'implemented', 'launched', 'deployed', 'worked on']
+
+# Problem Solving Keywords
+PROBLEM_SOLVING_KEYWORDS = ['solved', 'optimized', 'improved', 'enhanced', 'reduced', 'increased', 'achieved', 'troubleshot', 'debugged', 'analyzed', 'identified', 'resolved']
+
+# Learning Keywords
+LEARNING_KEYWORDS = ['learned', 'studied', 'certified', 'course', 'workshop', 'training', 'self-taught', 'bootcamp', 'mooc', 'udemy', 'coursera', 'internship']
+
+# Experience level keywords
+JUNIOR_KEYWORDS = ['intern', 'trainee', 'junior', 'entry', 'fresher', 'graduate', 'student']
+SENIOR_KEYWORDS = ['senior', 'lead', 'architect', 'manager', 'director', 'principal', 'staff']
+
+# Fallback role used when no job role is selected
+DEFAULT_ROLE = {
+    'required_skills': ['python', 'java', 'sql', 'git', 'communication'],
+    'preferred_skills': ['docker', 'aws', 'agile']
+}
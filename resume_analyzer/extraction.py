@@ -0,0 +1,361 @@
+"""
+Text extraction for uploaded resumes (PDF, DOCX and plain text).
+
+PDF pages are extracted one at a time through a generator, so extraction
+stops as soon as the page or character budget is spent and the text is
+joined once at the end. Large PDFs can instead be split into page ranges
+extracted by a process pool.
+
+DOCX files are read without building a document object model: the XML
+parts are parsed incrementally straight from the ZIP package, so body
+paragraphs, table rows, text boxes and page headers all come out in
+reading order. PyPDF2 is imported the first time a PDF is extracted, so
+processes that never see one do not pay for it.
+"""
+
+import codecs
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from io import BytesIO
+
+from .metrics import stage
+
+# Extraction budgets: reading stops once either limit is reached
+DEFAULT_MAX_PAGES = 50
+DEFAULT_MAX_CHARS = 200_000
+
+# Plain-text uploads are decoded in chunks of this many bytes
+TEXT_CHUNK_BYTES = 64 * 1024
+
+# PDFs with fewer pages than this are always extracted serially; below it the
+# cost of starting workers and re-parsing the file outweighs the speedup
+PARALLEL_PAGE_THRESHOLD = 30
+
+
+@dataclass
+class PageText:
+    """Text of one PDF page and how long it took to extract"""
+    number: int
+    text: str
+    seconds: float
+
+
+@dataclass
+class ExtractionResult:
+    """Extracted text plus what the extractor read to produce it"""
+    text: str
+    pages: int = 0
+    total_pages: int = 0
+    page_seconds: list = field(default_factory=list)
+    truncated: bool = False
+
+
+def iter_pdf_pages(pdf_reader, max_pages=None):
+    """Yield PageText for each page of a PdfReader, stopping after ``max_pages``"""
+    for number, page in enumerate(pdf_reader.pages):
+        if max_pages is not None and number >= max_pages:
+            return
+        start = time.perf_counter()
+        text = page.extract_text() or ""
+        yield PageText(number, text, time.perf_counter() - start)
+
+
+def _truncate(text, max_chars):
+    """Cut text to the character budget, reporting whether anything was dropped"""
+    if max_chars is not None and len(text) > max_chars:
+        return text[:max_chars], True
+    return text, False
+
+
+def extract_page_range(data, start, stop):
+    """Extract pages [start, stop) of a PDF given as bytes (runs in a worker process)"""
+    import PyPDF2
+
+    pdf_reader = PyPDF2.PdfReader(BytesIO(data))
+    pages = []
+    for number in range(start, stop):
+        page_start = time.perf_counter()
+        text = pdf_reader.pages[number].extract_text() or ""
+        pages.append(PageText(number, text, time.perf_counter() - page_start))
+    return pages
+
+
+_page_pool = None
+_page_pool_lock = threading.Lock()
+
+
+def _forget_page_pool():
+    # A forked child cannot use its parent's pool
+    global _page_pool, _page_pool_lock
+    _page_pool = None
+    _page_pool_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_page_pool)
+
+
+def _get_page_pool():
+    """Process pool for page extraction, created once with one worker per core and shared by all threads
+
+    ``workers`` only limits how many shards a document is split into, so
+    callers asking for different counts share the pool instead of
+    replacing it under each other.
+    """
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            _page_pool = ProcessPoolExecutor(os.cpu_count() or 1)
+        return _page_pool
+
+
+def _read_all(uploaded_file):
+    if hasattr(uploaded_file, 'getvalue'):
+        return uploaded_file.getvalue()
+    uploaded_file.seek(0)
+    return uploaded_file.read()
+
+
+def shard_page_ranges(total_pages, max_pages, workers):
+    """Contiguous ``(start, stop)`` page ranges splitting the pages to read between ``workers``
+
+    Empty when the PDF is too short to be worth splitting.
+    """
+    page_count = total_pages if max_pages is None else min(total_pages, max_pages)
+    if not workers or workers < 2 or page_count < PARALLEL_PAGE_THRESHOLD:
+        return []
+    shards = min(workers, page_count)
+    bounds = [page_count * i // shards for i in range(shards + 1)]
+    return list(zip(bounds, bounds[1:]))
+
+
+def plan_pdf_shards(data, max_pages=DEFAULT_MAX_PAGES, workers=None):
+    """``(ranges, total_pages)`` of a PDF given as bytes, ranges as from ``shard_page_ranges``"""
+    import PyPDF2
+
+    total_pages = len(PyPDF2.PdfReader(BytesIO(data)).pages)
+    return shard_page_ranges(total_pages, max_pages, workers), total_pages
+
+
+def _extract_pdf_parallel(data, ranges):
+    """Extract page ranges of a PDF in the page pool, in document order"""
+    pool = _get_page_pool()
+    futures = [pool.submit(extract_page_range, data, start, stop) for start, stop in ranges]
+    # Collect in submission order so the pages come back in document order
+    return [page for future in futures for page in future.result()]
+
+
+def join_pdf_pages(pages, total_pages, max_chars):
+    """Join PageTexts in document order into an ExtractionResult, stopping once ``max_chars`` is spent"""
+    parts = []
+    page_seconds = []
+    length = -1  # length of the joined text so far, counting separators
+    for page in pages:
+        parts.append(page.text)
+        page_seconds.append(page.seconds)
+        length += len(page.text) + 1
+        if max_chars is not None and length >= max_chars:
+            break
+    text, cut = _truncate("\n".join(parts), max_chars)
+    return ExtractionResult(text, len(parts), total_pages, page_seconds, cut or len(parts) < total_pages)
+
+
+def _extract_pdf(uploaded_file, max_pages, max_chars, workers=None):
+    import PyPDF2
+
+    pdf_reader = PyPDF2.PdfReader(uploaded_file)
+    total_pages = len(pdf_reader.pages)
+    ranges = shard_page_ranges(total_pages, max_pages, workers)
+    if ranges:
+        pages = _extract_pdf_parallel(_read_all(uploaded_file), ranges)
+    else:
+        pages = iter_pdf_pages(pdf_reader, max_pages)
+    return join_pdf_pages(pages, total_pages, max_chars)
+
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_P, _T, _BR, _TBL, _TR, _TC = (_W + name for name in ('p', 't', 'br', 'tbl', 'tr', 'tc'))
+_BR_TYPE = _W + 'type'
+
+# Run content other than w:t that stands for a character
+_DOCX_RUN_CHARS = {_W + 'tab': "\t", _W + 'ptab': "\t", _W + 'cr': "\n", _W + 'noBreakHyphen': "-"}
+
+# Subtrees whose text is not part of the document as shown: the legacy copy
+# of a text box (mc:Fallback duplicates mc:Choice), moved-away revisions,
+# and paragraph and run properties (whose w:tab elements are tab stops)
+_DOCX_SKIPPED = frozenset({
+    '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback',
+    _W + 'moveFrom', _W + 'pPr', _W + 'rPr'
+})
+
+
+def _header_number(name):
+    digits = ''.join(character for character in name if character.isdigit())
+    return int(digits or 0)
+
+
+def _iter_docx_lines(part):
+    """Yield the lines of one WordprocessingML part in reading order
+
+    Each paragraph is a line, including those in text boxes, and each table
+    row is a line of tab-separated cells (paragraphs within a cell are
+    joined with spaces). The part is parsed incrementally, and elements are
+    cleared once their text is taken, so memory does not grow with the
+    document.
+    """
+    from xml.etree.ElementTree import iterparse
+
+    paragraphs = []  # text runs of each open paragraph (text boxes nest them)
+    tables = []  # [finished rows, cells of the open row, paragraphs of the open cell] per open table
+    skipping = 0
+    for event, element in iterparse(part, events=('start', 'end')):
+        tag = element.tag
+        if tag in _DOCX_SKIPPED:
+            skipping += 1 if event == 'start' else -1
+            if event == 'end':
+                element.clear()
+            continue
+        if skipping:
+            continue
+        if event == 'start':
+            if tag == _P:
+                paragraphs.append([])
+            elif tag == _TBL:
+                tables.append([[], [], []])
+            continue
+
+        if tag == _T:
+            if paragraphs:
+                paragraphs[-1].append(element.text or "")
+        elif tag in _DOCX_RUN_CHARS:
+            if paragraphs:
+                paragraphs[-1].append(_DOCX_RUN_CHARS[tag])
+        elif tag == _BR:
+            # Page and column breaks do not start a new line of text
+            if paragraphs and element.get(_BR_TYPE, 'textWrapping') == 'textWrapping':
+                paragraphs[-1].append("\n")
+        elif tag == _P:
+            text = "".join(paragraphs.pop())
+            element.clear()
+            if tables and not paragraphs:
+                tables[-1][2].append(text)
+            else:
+                yield text
+        elif tag == _TC:
+            rows, cells, cell = tables[-1]
+            cells.append(" ".join(text for text in cell if text))
+            cell.clear()
+        elif tag == _TR:
+            rows, cells, _ = tables[-1]
+            row = "\t".join(cells)
+            cells.clear()
+            if len(tables) == 1:
+                yield row
+            else:
+                rows.append(row)
+        elif tag == _TBL:
+            rows = tables.pop()[0]
+            element.clear()
+            if tables:
+                # A nested table's rows become text of the enclosing cell
+                tables[-1][2].extend(rows)
+
+
+def _iter_docx_package(package):
+    """Yield the lines of a DOCX package: distinct page headers first, then the body"""
+    names = package.namelist()
+    if 'word/document.xml' not in names:
+        raise ValueError("Not a Word document: word/document.xml is missing")
+    headers = sorted(
+        (name for name in names if name.startswith('word/header') and name.endswith('.xml')), key=_header_number
+    )
+    seen = set()
+    for name in headers:
+        with package.open(name) as part:
+            lines = tuple(_iter_docx_lines(part))
+        # First-page, even-page and default headers often repeat each other
+        if lines not in seen:
+            seen.add(lines)
+            yield from lines
+    with package.open('word/document.xml') as part:
+        yield from _iter_docx_lines(part)
+
+
+def _extract_docx(uploaded_file, max_chars):
+    import zipfile
+    from xml.etree.ElementTree import ParseError
+
+    parts = []
+    length = 0
+    exhausted = True
+    try:
+        with zipfile.ZipFile(uploaded_file) as package:
+            for line in _iter_docx_package(package):
+                parts.append(line + "\n")
+                length += len(parts[-1])
+                if max_chars is not None and length >= max_chars:
+                    exhausted = False
+                    break
+    except (zipfile.BadZipFile, ParseError) as e:
+        raise ValueError(f"Not a valid DOCX file: {e}") from e
+    text, cut = _truncate("".join(parts), max_chars)
+    return ExtractionResult(text, truncated=cut or not exhausted)
+
+
+def _extract_plain_text(uploaded_file, max_chars):
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    parts = []
+    length = 0
+    exhausted = False
+    while max_chars is None or length <= max_chars:
+        chunk = uploaded_file.read(TEXT_CHUNK_BYTES)
+        if not chunk:
+            parts.append(decoder.decode(b"", final=True))
+            exhausted = True
+            break
+        parts.append(decoder.decode(chunk))
+        length += len(parts[-1])
+    text, cut = _truncate("".join(parts), max_chars)
+    return ExtractionResult(text, truncated=cut or not exhausted)
+
+
+def extract_document(uploaded_file, max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS, workers=None):
+    """Extract text from an uploaded file within page and character budgets
+
+    Pass ``None`` for either budget to disable it. With ``workers`` > 1, PDFs
+    of at least ``PARALLEL_PAGE_THRESHOLD`` pages are extracted by that many
+    processes. Do not enable it inside daemonic pool workers, which cannot
+    start processes of their own.
+    """
+    name = uploaded_file.name.lower()
+    kind = 'pdf' if name.endswith('.pdf') else 'docx' if name.endswith('.docx') else 'text'
+    with stage(f'parse:{kind}') as record:
+        if kind == 'pdf':
+            result = _extract_pdf(uploaded_file, max_pages, max_chars, workers)
+            record.sizes['pages'] = result.pages
+        elif kind == 'docx':
+            result = _extract_docx(uploaded_file, max_chars)
+        else:
+            result = _extract_plain_text(uploaded_file, max_chars)
+        record.sizes['chars'] = len(result.text)
+    return result
+
+
+def extract_text_from_file(uploaded_file, max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS, workers=None):
+    """Extract text from uploaded file (PDF or DOCX)
+
+    ``uploaded_file`` is any binary file object with a ``name`` attribute,
+    such as a Streamlit ``UploadedFile`` or a file opened with ``open(path, 'rb')``.
+    Errors from the underlying parsers are propagated to the caller.
+    """
+    return extract_document(uploaded_file, max_pages, max_chars, workers).text
+
+
+def extract_text(data, filename, max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS, workers=None):
+    """Extract text from raw file bytes, using the filename to pick the format"""
+    buffer = BytesIO(data)
+    buffer.name = filename
+    return extract_text_from_file(buffer, max_pages, max_chars, workers)
@@ -0,0 +1,286 @@
+"""
+Persistent analysis history.
+
+Every analysis can be recorded in a local SQLite database: the document
+hash, role, scores, verdict and found skills with a timestamp. Besides the
+full history, a ``latest`` table keeps one row per candidate and role, so
+the three common questions are index lookups however large the history
+grows:
+
+- latest analysis of a candidate (``latest``)
+- top N candidates for a role (``top``)
+- a candidate's score over time (``trend``)
+
+::
+
+    python -m resume_analyzer.history history.db top "Data Scientist" -n 10
+    python -m resume_analyzer.history history.db trend jane.doe@example.com --role "Data Scientist"
+
+Candidates are identified by the first email address in the resume, or by
+the document hash when there is none; the app instead keys each analysis
+to the browser session that made it, so one user never sees another's
+scores. History is off unless ``RESUME_ANALYZER_HISTORY_DB`` names a
+database.
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+
+DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.resume_analyzer', 'history.db')
+
+_EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+
+_COLUMNS = (
+    'id', 'candidate', 'document_hash', 'filename', 'role', 'ats_score', 'skill_match_pct',
+    'project_quality', 'shortlist_prob', 'verdict', 'found_skills', 'analyzed_at'
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY,
+    candidate TEXT NOT NULL,
+    document_hash TEXT NOT NULL,
+    filename TEXT,
+    role TEXT NOT NULL,
+    ats_score INTEGER NOT NULL,
+    skill_match_pct REAL,
+    project_quality INTEGER,
+    shortlist_prob INTEGER,
+    verdict TEXT,
+    found_skills TEXT,
+    analyzed_at REAL NOT NULL
+);
+-- Score trend of a candidate for a role
+CREATE INDEX IF NOT EXISTS analyses_by_candidate ON analyses (candidate, role, analyzed_at);
+-- Earlier analyses of the same file
+CREATE INDEX IF NOT EXISTS analyses_by_document ON analyses (document_hash, role, analyzed_at);
+
+-- Most recent analysis per candidate and role
+CREATE TABLE IF NOT EXISTS latest (
+    candidate TEXT NOT NULL,
+    role TEXT NOT NULL,
+    analysis_id INTEGER NOT NULL,
+    ats_score INTEGER NOT NULL,
+    analyzed_at REAL NOT NULL,
+    PRIMARY KEY (candidate, role)
+) WITHOUT ROWID;
+-- Top candidates for a role
+CREATE INDEX IF NOT EXISTS latest_by_score ON latest (role, ats_score DESC, analyzed_at DESC);
+"""
+
+
+@dataclass
+class AnalysisRecord:
+    """One stored analysis"""
+    id: int
+    candidate: str
+    document_hash: str
+    filename: str
+    role: str
+    ats_score: int
+    skill_match_pct: float
+    project_quality: int
+    shortlist_prob: int
+    verdict: str
+    found_skills: list
+    analyzed_at: float
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def candidate_key(report, document_hash=None):
+    """Identify the person behind a resume: first email, else the document hash
+
+    File names are never used: everyone's "resume.pdf" would share a trend.
+    """
+    match = _EMAIL_PATTERN.search(report.text or "")
+    if match:
+        return match.group(0).lower()
+    return document_hash
+
+
+def _record(row):
+    values = dict(zip(_COLUMNS, row))
+    values['found_skills'] = json.loads(values['found_skills'] or '[]')
+    return AnalysisRecord(**values)
+
+
+_SELECT = "SELECT " + ", ".join(f"a.{column}" for column in _COLUMNS) + " FROM analyses a"
+
+
+class HistoryStore:
+    """SQLite-backed analysis history, safe to share between threads"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return [_record(row) for row in self._conn.execute(sql, params)]
+
+    def record(self, report, document_hash, filename=None, candidate=None, analyzed_at=None):
+        """Store a finished report and return its AnalysisRecord
+
+        Re-recording the same document with the same score for a candidate
+        and role returns the stored analysis instead of adding a duplicate
+        point to the trend.
+        """
+        candidate = candidate or candidate_key(report, document_hash)
+        analyzed_at = time.time() if analyzed_at is None else analyzed_at
+        previous = self.latest(candidate, report.role)
+        if previous and previous.document_hash == document_hash and previous.ats_score == report.ats_score:
+            return previous
+        values = (
+            candidate, document_hash, filename, report.role, report.ats_score, report.skill_match_pct,
+            report.project_quality, report.shortlist_prob, report.verdict,
+            json.dumps(sorted(report.found_skills or [])), analyzed_at
+        )
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                cursor = self._conn.execute(
+                    "INSERT INTO analyses (" + ", ".join(_COLUMNS[1:]) + ") VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    values
+                )
+                analysis_id = cursor.lastrowid
+                # Backfilled older analyses never replace a newer latest entry
+                self._conn.execute(
+                    "INSERT INTO latest (candidate, role, analysis_id, ats_score, analyzed_at) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (candidate, role) DO UPDATE SET analysis_id = excluded.analysis_id, "
+                    "ats_score = excluded.ats_score, analyzed_at = excluded.analyzed_at "
+                    "WHERE excluded.analyzed_at >= latest.analyzed_at",
+                    (candidate, report.role, analysis_id, report.ats_score, analyzed_at)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return AnalysisRecord(analysis_id, *values[:9], sorted(report.found_skills or []), analyzed_at)
+
+    def latest(self, candidate, role=None):
+        """Most recent analysis of a candidate (for one role, or any role), or None"""
+        sql = _SELECT + " JOIN latest l ON l.analysis_id = a.id WHERE l.candidate = ?"
+        params = [candidate]
+        if role is not None:
+            sql += " AND l.role = ?"
+            params.append(role)
+        rows = self._query(sql + " ORDER BY l.analyzed_at DESC LIMIT 1", params)
+        return rows[0] if rows else None
+
+    def top(self, role, limit=10):
+        """Latest analyses of the best-scoring candidates for a role, best first"""
+        return self._query(
+            _SELECT + " JOIN latest l ON l.analysis_id = a.id WHERE l.role = ? "
+            "ORDER BY l.ats_score DESC, l.analyzed_at DESC LIMIT ?",
+            (role, limit)
+        )
+
+    def trend(self, candidate, role, limit=None):
+        """A candidate's analyses for a role, oldest first (the most recent ``limit`` if given)"""
+        if limit is None:
+            return self._query(_SELECT + " WHERE a.candidate = ? AND a.role = ? ORDER BY a.analyzed_at", (candidate, role))
+        rows = self._query(
+            _SELECT + " WHERE a.candidate = ? AND a.role = ? ORDER BY a.analyzed_at DESC LIMIT ?", (candidate, role, limit)
+        )
+        return rows[::-1]
+
+    def find_document(self, document_hash, role):
+        """Most recent analysis of identical file bytes for a role, or None"""
+        rows = self._query(
+            _SELECT + " WHERE a.document_hash = ? AND a.role = ? ORDER BY a.analyzed_at DESC LIMIT 1",
+            (document_hash, role)
+        )
+        return rows[0] if rows else None
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+
+
+_default_history = None
+_default_lock = threading.Lock()
+
+
+def default_history():
+    """Process-wide history store, or None when disabled
+
+    History is opt-in: ``RESUME_ANALYZER_HISTORY_DB`` must name the database
+    file (for example ``~/.resume_analyzer/history.db``).
+    """
+    global _default_history
+    path = os.path.expanduser(os.environ.get('RESUME_ANALYZER_HISTORY_DB', ''))
+    if not path:
+        return None
+    with _default_lock:
+        if _default_history is None or _default_history.path != path:
+            _default_history = HistoryStore(path)
+        return _default_history
+
+
+def _format(record):
+    when = time.strftime('%Y-%m-%d %H:%M', time.localtime(record.analyzed_at))
+    return f"{when}  {record.ats_score:>3}  {record.verdict:<10} {record.candidate}  ({record.filename or record.document_hash[:12]})"
+
+
+def build_parser():
+    """Create the command-line parser"""
+    parser = argparse.ArgumentParser(description="Query the analysis history.")
+    parser.add_argument('database', help="history database (default location: ~/.resume_analyzer/history.db)")
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument('--json', action='store_true', help="print records as JSON lines")
+    commands = parser.add_subparsers(dest='command', required=True)
+    top = commands.add_parser('top', parents=[output], help="best-scoring candidates for a role")
+    top.add_argument('role')
+    top.add_argument('-n', '--limit', type=int, default=10, help="candidates to list (default: 10)")
+    latest = commands.add_parser('latest', parents=[output], help="a candidate's most recent analysis")
+    latest.add_argument('candidate', help="email address or document hash")
+    latest.add_argument('--role')
+    trend = commands.add_parser('trend', parents=[output], help="a candidate's scores over time")
+    trend.add_argument('candidate', help="email address or document hash")
+    trend.add_argument('--role', required=True)
+    return parser
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    args = build_parser().parse_args(argv)
+    if not os.path.exists(args.database):
+        print(f"No history database at {args.database}", file=sys.stderr)
+        return 2
+    store = HistoryStore(args.database)
+    try:
+        if args.command == 'top':
+            records = store.top(args.role, args.limit)
+        elif args.command == 'latest':
+            records = [record for record in [store.latest(args.candidate, args.role)] if record]
+        else:
+            records = store.trend(args.candidate, args.role)
+    finally:
+        store.close()
+    for record in records:
+        print(json.dumps(record.to_dict()) if args.json else _format(record))
+    return 0 if records else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
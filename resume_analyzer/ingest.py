@@ -0,0 +1,155 @@
+"""
+Memory-bounded ingestion of uploaded files.
+
+An upload is copied in fixed-size chunks into a spooled buffer that moves
+to a temporary file once it grows past ``spool_bytes``, hashing and
+counting bytes on the way. An upload over ``max_bytes`` is rejected as
+soon as the limit is crossed, without reading the rest. Extraction then
+reads from the buffer within the page and character budgets of the same
+``UploadLimits``, so memory per upload stays bounded whatever is sent::
+
+    limits = UploadLimits.from_env()
+    with ingest(uploaded_file, limits=limits) as upload:
+        text = extract_upload(upload, limits)
+"""
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+
+from .extraction import DEFAULT_MAX_CHARS, DEFAULT_MAX_PAGES
+
+# Bytes read from the source per step
+CHUNK_BYTES = 64 * 1024
+
+_MB = 1024 * 1024
+
+
+class UploadTooLarge(ValueError):
+    """An upload exceeded its byte limit"""
+
+    def __init__(self, name, max_bytes):
+        super().__init__(f"{name} is larger than the {max_bytes / _MB:g} MB upload limit")
+        self.name = name
+        self.max_bytes = max_bytes
+
+
+@dataclass(frozen=True)
+class UploadLimits:
+    """Byte, page and character budgets for one upload, and when it spills to disk"""
+    max_bytes: int = 10 * _MB
+    max_pages: int = DEFAULT_MAX_PAGES
+    max_chars: int = DEFAULT_MAX_CHARS
+    spool_bytes: int = 1 * _MB
+
+    @classmethod
+    def from_env(cls):
+        """Limits from ``RESUME_ANALYZER_MAX_UPLOAD_MB``, ``_MAX_PAGES``, ``_MAX_CHARS`` and ``_SPOOL_MB``"""
+        defaults = cls()
+        return cls(
+            max_bytes=int(float(os.environ.get('RESUME_ANALYZER_MAX_UPLOAD_MB', defaults.max_bytes / _MB)) * _MB),
+            max_pages=int(os.environ.get('RESUME_ANALYZER_MAX_PAGES', defaults.max_pages)),
+            max_chars=int(os.environ.get('RESUME_ANALYZER_MAX_CHARS', defaults.max_chars)),
+            spool_bytes=int(float(os.environ.get('RESUME_ANALYZER_SPOOL_MB', defaults.spool_bytes / _MB)) * _MB)
+        )
+
+    def check_size(self, size, name):
+        """Raise UploadTooLarge if ``size`` bytes is over the limit"""
+        if size > self.max_bytes:
+            raise UploadTooLarge(name, self.max_bytes)
+
+
+class Upload:
+    """An ingested file: its name, size, SHA-256 and a spooled copy of its bytes"""
+
+    def __init__(self, name, size, digest, buffer):
+        self.name = name
+        self.size = size
+        self.digest = digest
+        self._buffer = buffer
+
+    @property
+    def spilled(self):
+        """Whether the bytes were moved to a temporary file"""
+        return bool(getattr(self._buffer, '_rolled', False))
+
+    def open(self):
+        """The buffer rewound to the start, with a ``name`` for the extractors"""
+        self._buffer.seek(0)
+        return _NamedReader(self._buffer, self.name)
+
+    def read_bytes(self):
+        """All bytes of the upload (at most ``max_bytes``)"""
+        self._buffer.seek(0)
+        return self._buffer.read()
+
+    def close(self):
+        self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _NamedReader:
+    """Read-only view of a buffer that carries a file name"""
+
+    def __init__(self, buffer, name):
+        self._buffer = buffer
+        self.name = name
+
+    def __getattr__(self, attribute):
+        return getattr(self._buffer, attribute)
+
+    def seekable(self):
+        return True
+
+    def readable(self):
+        return True
+
+
+def ingest(source, name=None, limits=None):
+    """Copy a binary file object into a spooled Upload, hashing and size-checking as it streams
+
+    ``name`` defaults to ``source.name``. Raises UploadTooLarge as soon as
+    more than ``limits.max_bytes`` have been read.
+    """
+    limits = limits or UploadLimits()
+    name = name or getattr(source, 'name', None) or "upload"
+    declared = getattr(source, 'size', None)
+    if isinstance(declared, int):
+        # Streamlit and HTTP uploads know their size up front
+        limits.check_size(declared, name)
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    hasher = hashlib.sha256()
+    buffer = tempfile.SpooledTemporaryFile(max_size=limits.spool_bytes, suffix=os.path.splitext(name)[1])
+    size = 0
+    try:
+        while True:
+            chunk = source.read(CHUNK_BYTES)
+            if not chunk:
+                break
+            size += len(chunk)
+            limits.check_size(size, name)
+            hasher.update(chunk)
+            buffer.write(chunk)
+    except BaseException:
+        buffer.close()
+        raise
+    return Upload(name, size, hasher.hexdigest(), buffer)
+
+
+def extract_upload(upload, limits=None, workers=None):
+    """Extract an Upload's text within the page and character budgets of ``limits``
+
+    Extraction runs in the sandbox (see ``sandbox``), so failures are raised
+    as ExtractionFailure.
+    """
+    from .sandbox import extract_isolated
+
+    limits = limits or UploadLimits()
+    return extract_isolated(upload.open(), upload.name, limits.max_pages, limits.max_chars, workers)
@@ -0,0 +1,170 @@
+"""
+Job-description similarity scoring.
+
+``jd_matcher()`` fits a TF-IDF vectorizer on a pasted job description once
+and caches it, so one resume or a whole batch is scored with a single
+sparse matrix-vector product. ``ResumeCorpus`` keeps a precomputed TF-IDF
+matrix of stored resumes so a new job description can rank thousands of
+them without re-vectorizing any resume.
+
+scikit-learn, SciPy and NumPy are imported on first use: they take over a
+second to import and most processes never score a job description.
+"""
+
+import hashlib
+from functools import lru_cache
+
+# Token pattern that keeps skills like c++, c#, node.js and ci/cd intact
+TOKEN_PATTERN = r'(?u)\b\w[\w+#./-]*[\w+#]|\b\w'
+
+# Similarity at which the job-description component of the ATS score is maxed out
+JD_SIMILARITY_FULL_MARKS = 0.5
+
+
+class JobDescriptionMatcher:
+    """TF-IDF model fitted on one job description"""
+
+    def __init__(self, job_description):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        self.job_description = job_description
+        self.vectorizer = TfidfVectorizer(
+            stop_words='english',
+            sublinear_tf=True,
+            ngram_range=(1, 2),
+            token_pattern=TOKEN_PATTERN
+        )
+        # Rows are L2-normalized, so a dot product is the cosine similarity
+        try:
+            self.jd_vector = self.vectorizer.fit_transform([job_description]).T.tocsc()
+        except ValueError:
+            # Nothing left after stop-word removal ("empty vocabulary")
+            self.jd_vector = None
+
+    @property
+    def has_terms(self):
+        """Whether any terms survived stop-word removal"""
+        return self.jd_vector is not None
+
+    def transform(self, texts):
+        """Vectorize resume texts into the job description's term space"""
+        return self.vectorizer.transform(texts)
+
+    def similarities(self, texts):
+        """Cosine similarity of each resume to the job description
+
+        ``texts`` may be a list of strings or a matrix from ``transform``.
+        """
+        import numpy as np
+        import scipy.sparse as sp
+
+        matrix = texts if sp.issparse(texts) else self.transform(texts)
+        return np.asarray((matrix @ self.jd_vector).todense()).ravel()
+
+    def similarity(self, text):
+        """Cosine similarity of one resume to the job description"""
+        return float(self.similarities([text])[0])
+
+
+@lru_cache(maxsize=32)
+def _cached_matcher(digest, job_description):
+    return JobDescriptionMatcher(job_description)
+
+
+def jd_matcher(job_description):
+    """Fitted matcher for a job description, reused across calls"""
+    digest = hashlib.sha256(job_description.encode('utf-8')).hexdigest()
+    return _cached_matcher(digest, job_description)
+
+
+def has_job_description(job_description):
+    """True when a job description has enough text to score against
+
+    One made only of stop words ("the and of") has no terms and counts as
+    absent.
+    """
+    return bool(job_description and job_description.strip()) and jd_matcher(job_description).has_terms
+
+
+def jd_points(similarity):
+    """Convert a similarity into ATS points out of 10"""
+    return min(similarity / JD_SIMILARITY_FULL_MARKS, 1) * 10
+
+
+class ResumeCorpus:
+    """Stored resumes as a TF-IDF matrix, ready to rank against any job description
+
+    Resumes are vectorized once, when added, with a stateless hashing
+    vectorizer. IDF weights come from the corpus itself and are recomputed
+    only after new resumes are added.
+    """
+
+    def __init__(self, n_features=2 ** 20):
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features,
+            stop_words='english',
+            ngram_range=(1, 2),
+            token_pattern=TOKEN_PATTERN,
+            alternate_sign=False,
+            norm=None
+        )
+        self.ids = []
+        self._blocks = []
+        self._counts = None
+        self._weighted = None
+        self._idf = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, ids, texts):
+        """Add resumes to the corpus"""
+        ids = list(ids)
+        self._blocks.append(self.vectorizer.transform(texts).tocsr())
+        self.ids.extend(ids)
+        self._weighted = None
+
+    def _prepare(self):
+        if self._weighted is not None:
+            return
+        import numpy as np
+        import scipy.sparse as sp
+        from sklearn.preprocessing import normalize
+
+        if self._blocks:
+            self._counts = sp.vstack(([self._counts] if self._counts is not None else []) + self._blocks).tocsr()
+            self._blocks = []
+        counts = self._counts
+        n_docs = counts.shape[0]
+        doc_freq = np.bincount(counts.indices, minlength=counts.shape[1])
+        self._idf = np.log((1 + n_docs) / (1 + doc_freq)) + 1
+        tf = counts.copy()
+        tf.data = np.log(tf.data) + 1  # sublinear tf, as in JobDescriptionMatcher
+        self._weighted = normalize(tf.multiply(self._idf).tocsr())
+
+    def similarities(self, job_description):
+        """Cosine similarity of every stored resume to a job description"""
+        import numpy as np
+        from sklearn.preprocessing import normalize
+
+        if not self.ids:
+            return np.zeros(0)
+        self._prepare()
+        query = self.vectorizer.transform([job_description])
+        query.data = np.log(query.data) + 1
+        query = normalize(query.multiply(self._idf).tocsr())
+        return np.asarray((self._weighted @ query.T).todense()).ravel()
+
+    def rank(self, job_description, top_n=10):
+        """Return the ``top_n`` (resume_id, similarity) pairs, best first"""
+        import numpy as np
+
+        scores = self.similarities(job_description)
+        if not len(scores):
+            return []
+        top_n = min(top_n, len(scores))
+        best = np.argpartition(-scores, top_n - 1)[:top_n]
+        best = best[np.argsort(-scores[best])]
+        return [(self.ids[i], float(scores[i])) for i in best]
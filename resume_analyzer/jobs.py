@@ -0,0 +1,424 @@
+"""
+Durable bulk-analysis jobs.
+
+A job is a batch of resumes scored in the background. Jobs, their items and
+every finished record live in a local SQLite database, so progress can be
+polled from another process and a run that is stopped halfway picks up
+where it left off: only items without a stored result are scored again::
+
+    python -m resume_analyzer.jobs jobs.db submit resumes/ --role "Data Scientist"
+    python -m resume_analyzer.jobs jobs.db run --workers 8
+    python -m resume_analyzer.jobs jobs.db status 3f2a...
+    python -m resume_analyzer.jobs jobs.db results 3f2a... --limit 100 --after 0
+
+Items are scored with the batch scorer, so records have the same fields as
+``resume_analyzer.batch`` output.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass
+
+from .batch import iter_resume_files, parse_role, score_data, score_file
+from .taxonomy import current_taxonomy
+
+# Items read from the database per round trip while a job runs
+FETCH_SIZE = 256
+
+# Finished records are written in transactions of at most this many, or
+# after this many seconds, whichever comes first
+COMMIT_EVERY = 64
+COMMIT_SECONDS = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    created REAL NOT NULL,
+    status TEXT NOT NULL,
+    role TEXT,
+    job_description TEXT,
+    total INTEGER NOT NULL,
+    finished REAL,
+    run_started REAL,
+    run_base INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS items (
+    job_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    data BLOB,
+    status TEXT NOT NULL DEFAULT 'pending',
+    record TEXT,
+    PRIMARY KEY (job_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS items_by_status ON items (job_id, status, seq);
+"""
+
+# Job states; 'queued' and 'running' jobs still have pending items
+ACTIVE_STATES = ('queued', 'running')
+
+
+@dataclass
+class JobProgress:
+    """Where a job stands"""
+    job_id: str
+    status: str
+    total: int
+    done: int
+    failed: int
+    remaining: int
+    created: float
+    finished: float = None
+    throughput: float = None
+    eta_seconds: float = None
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def score_item(seq, name, data, role=None, job_description=None, cache_dir=None):
+    """Score one job item in a worker process; ``data`` is None for items stored as paths"""
+    if data is None:
+        return seq, score_file(name, role, cache_dir, job_description)
+    return seq, score_data(data, name, role, cache_dir, job_description)
+
+
+class JobStore:
+    """SQLite-backed jobs, items and results
+
+    Safe to share between threads; the database runs in WAL mode so other
+    processes can poll progress while a runner writes results.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def submit(self, items, role=None, job_description=None):
+        """Create a job and return its id
+
+        ``items`` holds file paths, read when the job runs, or
+        ``(filename, bytes)`` pairs, stored in the database until scored.
+        """
+        job_id = uuid.uuid4().hex
+        rows = (
+            (job_id, seq, item, None) if isinstance(item, str) else (job_id, seq, item[0], bytes(item[1]))
+            for seq, item in enumerate(items, 1)
+        )
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("INSERT INTO items (job_id, seq, name, data) VALUES (?, ?, ?, ?)", rows)
+                total = self._conn.execute("SELECT COUNT(*) FROM items WHERE job_id = ?", (job_id,)).fetchone()[0]
+                self._conn.execute(
+                    "INSERT INTO jobs (id, created, status, role, job_description, total) VALUES (?, ?, ?, ?, ?, ?)",
+                    (job_id, time.time(), 'queued' if total else 'done', json.dumps(role), job_description, total)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return job_id
+
+    def submit_directory(self, directory, role=None, job_description=None):
+        """Create a job for every resume file under a directory"""
+        return self.submit(iter_resume_files(directory), role, job_description)
+
+    def job(self, job_id):
+        """(status, role, job_description) of a job; KeyError if unknown"""
+        rows = self._execute("SELECT status, role, job_description FROM jobs WHERE id = ?", (job_id,))
+        if not rows:
+            raise KeyError(job_id)
+        status, role, job_description = rows[0]
+        return status, json.loads(role), job_description
+
+    def progress(self, job_id):
+        """JobProgress for a job; KeyError if unknown"""
+        rows = self._execute(
+            "SELECT status, total, created, finished, run_started, run_base FROM jobs WHERE id = ?", (job_id,)
+        )
+        if not rows:
+            raise KeyError(job_id)
+        status, total, created, finished, run_started, run_base = rows[0]
+        counts = dict(self._execute(
+            "SELECT status, COUNT(*) FROM items WHERE job_id = ? AND status != 'pending' GROUP BY status", (job_id,)
+        ))
+        done, failed = counts.get('done', 0), counts.get('failed', 0)
+        progress = JobProgress(job_id, status, total, done, failed, total - done - failed, created, finished)
+        # Throughput covers the current (or last) run only, so a restart does
+        # not count the time the job spent stopped
+        if run_started is not None:
+            elapsed = (finished or time.time()) - run_started
+            processed = done + failed - run_base
+            if elapsed > 0 and processed > 0:
+                progress.throughput = processed / elapsed
+                if status == 'running':
+                    progress.eta_seconds = progress.remaining / progress.throughput
+        return progress
+
+    def list_jobs(self):
+        """Progress of every job, oldest first"""
+        return [self.progress(job_id) for job_id, in self._execute("SELECT id FROM jobs ORDER BY created")]
+
+    def active_jobs(self):
+        """Ids of jobs with work left, oldest first"""
+        placeholders = ', '.join('?' * len(ACTIVE_STATES))
+        return [job_id for job_id, in self._execute(
+            f"SELECT id FROM jobs WHERE status IN ({placeholders}) ORDER BY created", ACTIVE_STATES
+        )]
+
+    def results(self, job_id, after=0, limit=100, status=None):
+        """One page of finished records in submission order
+
+        Returns ``(records, next_after)``; pass ``next_after`` back to get the
+        following page. ``next_after`` is None once no more records are stored
+        yet. ``status`` may be 'done' or 'failed' to filter.
+        """
+        sql = "SELECT seq, record FROM items WHERE job_id = ? AND seq > ? AND status "
+        params = [job_id, after]
+        if status:
+            sql += "= ?"
+            params.append(status)
+        else:
+            sql += "!= 'pending'"
+        rows = self._execute(sql + " ORDER BY seq LIMIT ?", params + [limit])
+        records = [dict(json.loads(record), seq=seq) for seq, record in rows]
+        next_after = rows[-1][0] if len(rows) == limit else None
+        return records, next_after
+
+    def pending_items(self, job_id, after=0, limit=FETCH_SIZE):
+        """(seq, name, data) of items without a result, in order"""
+        return self._execute(
+            "SELECT seq, name, data FROM items WHERE job_id = ? AND status = 'pending' AND seq > ? ORDER BY seq LIMIT ?",
+            (job_id, after, limit)
+        )
+
+    def start_run(self, job_id):
+        """Mark a job running and restart its throughput clock"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'running', run_started = ?, "
+                "run_base = (SELECT COUNT(*) FROM items WHERE job_id = ? AND status != 'pending') "
+                "WHERE id = ? AND status IN ('queued', 'running')",
+                (time.time(), job_id, job_id)
+            )
+
+    def record_results(self, job_id, results):
+        """Store finished ``(seq, record)`` pairs in one transaction"""
+        rows = [
+            ('failed' if 'error' in record else 'done', json.dumps(record), job_id, seq)
+            for seq, record in results
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                # The uploaded bytes are no longer needed once an item is scored
+                self._conn.executemany("UPDATE items SET status = ?, record = ?, data = NULL WHERE job_id = ? AND seq = ?", rows)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def pause(self, job_id):
+        """Put a running job back in the queue after its runner stopped"""
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET status = 'queued' WHERE id = ? AND status = 'running'", (job_id,))
+
+    def finish(self, job_id):
+        """Mark a job done once no items are pending"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'done', finished = ? WHERE id = ? AND status IN ('queued', 'running') "
+                "AND NOT EXISTS (SELECT 1 FROM items WHERE job_id = ? AND status = 'pending')",
+                (time.time(), job_id, job_id)
+            )
+
+    def cancel(self, job_id):
+        """Stop a job; its pending items are never scored"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'cancelled', finished = ? WHERE id = ? AND status IN ('queued', 'running')",
+                (time.time(), job_id)
+            )
+        return cursor.rowcount > 0
+
+
+class JobRunner:
+    """Scores pending job items on an executor, writing results as they finish
+
+    At most ``max_in_flight`` items are submitted at once, so a 20k-resume
+    job never holds more than that many uploads in memory.
+    """
+
+    def __init__(self, store, executor, max_in_flight=None, cache_dir=None):
+        self.store = store
+        self.executor = executor
+        self.max_in_flight = max_in_flight or 2 * (os.cpu_count() or 1)
+        self.cache_dir = cache_dir
+
+    def run_job(self, job_id, stop=None):
+        """Score every pending item of one job; returns False if stopped early
+
+        ``stop`` is an optional ``threading.Event`` checked between items.
+        """
+        status, role, job_description = self.store.job(job_id)
+        if status not in ACTIVE_STATES:
+            return True
+        self.store.start_run(job_id)
+        after = 0
+        queue = deque()
+        in_flight = set()
+        finished = []
+        cancelled = False
+        last_commit = time.monotonic()
+        try:
+            while True:
+                stopping = cancelled or (stop is not None and stop.is_set())
+                while not stopping and len(in_flight) < self.max_in_flight:
+                    if not queue:
+                        queue.extend(self.store.pending_items(job_id, after))
+                        if not queue:
+                            break
+                        after = queue[-1][0]
+                    seq, name, data = queue.popleft()
+                    in_flight.add(self.executor.submit(
+                        score_item, seq, name, data, role, job_description, self.cache_dir
+                    ))
+                if not in_flight:
+                    break
+                completed, in_flight = wait(in_flight, timeout=COMMIT_SECONDS, return_when=FIRST_COMPLETED)
+                finished.extend(future.result() for future in completed)
+                if len(finished) >= COMMIT_EVERY or (finished and time.monotonic() - last_commit >= COMMIT_SECONDS):
+                    self.store.record_results(job_id, finished)
+                    finished = []
+                    last_commit = time.monotonic()
+                    # A job cancelled from elsewhere stops taking new items
+                    cancelled = self.store.job(job_id)[0] == 'cancelled'
+        except BaseException:
+            # Interrupted or the pool broke: the job waits for the next run
+            self.store.pause(job_id)
+            raise
+        finally:
+            if finished:
+                self.store.record_results(job_id, finished)
+        if cancelled:
+            return True
+        if stop is not None and stop.is_set():
+            self.store.pause(job_id)
+            return False
+        self.store.finish(job_id)
+        return True
+
+    def run_pending(self, stop=None):
+        """Run every job with work left, oldest first, until none remain or ``stop`` is set"""
+        for job_id in self.store.active_jobs():
+            if not self.run_job(job_id, stop):
+                return False
+        return True
+
+
+def _print_json(value):
+    print(json.dumps(value, indent=2))
+
+
+def build_parser():
+    """Create the command-line parser"""
+    parser = argparse.ArgumentParser(description="Submit, run and inspect bulk-analysis jobs.")
+    parser.add_argument('database', help="SQLite job database (created if missing)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    submit = commands.add_parser('submit', help="create a job for a directory of resumes and print its id")
+    submit.add_argument('directory', help="directory to scan recursively for PDF/DOCX/TXT resumes")
+    submit.add_argument('--role', choices=list(current_taxonomy().job_roles), metavar='ROLE', help="target job role (default: generic role)")
+    submit.add_argument('--required-skills', help="comma-separated required skills for a custom role")
+    submit.add_argument('--preferred-skills', help="comma-separated preferred skills for a custom role")
+    submit.add_argument('--job-description', help="text file with a job description to score similarity against")
+
+    run = commands.add_parser('run', help="score pending items of every unfinished job")
+    run.add_argument('-w', '--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    run.add_argument('--cache-dir', help="reuse results for unchanged files from this cache directory")
+
+    status = commands.add_parser('status', help="print a job's progress (all jobs without an id)")
+    status.add_argument('job_id', nargs='?')
+
+    results = commands.add_parser('results', help="print a page of a job's records as JSON lines")
+    results.add_argument('job_id')
+    results.add_argument('--after', type=int, default=0, help="print records after this sequence number")
+    results.add_argument('-n', '--limit', type=int, default=100, help="records per page (default: 100)")
+    results.add_argument('--failed', action='store_true', help="only print failed items")
+
+    cancel = commands.add_parser('cancel', help="stop a job")
+    cancel.add_argument('job_id')
+    return parser
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    args = build_parser().parse_args(argv)
+    store = JobStore(args.database)
+    try:
+        if args.command == 'submit':
+            if not os.path.isdir(args.directory):
+                print(f"Not a directory: {args.directory}", file=sys.stderr)
+                return 2
+            job_description = None
+            if args.job_description:
+                with open(args.job_description, encoding='utf-8') as f:
+                    job_description = f.read()
+            print(store.submit_directory(args.directory, parse_role(args), job_description))
+        elif args.command == 'run':
+            workers = args.workers or os.cpu_count() or 1
+            with ProcessPoolExecutor(workers) as executor:
+                runner = JobRunner(store, executor, 2 * workers, args.cache_dir)
+                try:
+                    runner.run_pending()
+                except KeyboardInterrupt:
+                    print("Interrupted; run again to resume", file=sys.stderr)
+                    return 130
+        elif args.command == 'status':
+            if args.job_id:
+                _print_json(store.progress(args.job_id).to_dict())
+            else:
+                _print_json([progress.to_dict() for progress in store.list_jobs()])
+        elif args.command == 'results':
+            store.progress(args.job_id)
+            records, next_after = store.results(args.job_id, args.after, args.limit, 'failed' if args.failed else None)
+            for record in records:
+                print(json.dumps(record))
+            if next_after is not None:
+                print(f"More records: --after {next_after}", file=sys.stderr)
+        elif args.command == 'cancel':
+            store.progress(args.job_id)
+            if not store.cancel(args.job_id):
+                print(f"Job {args.job_id} has already finished", file=sys.stderr)
+    except KeyError as e:
+        print(f"No such job: {e.args[0]}", file=sys.stderr)
+        return 2
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,231 @@
+"""
+Single-pass keyword matcher.
+
+All skill and action-verb terms are compiled into one trie-shaped regular
+expression, so a document is scanned once no matter how many terms the
+taxonomy holds. Matches respect token boundaries: 'r' does not match inside
+'react' and 'go' does not match inside 'google', nor, since terms this short
+are easily part of a compound, in 'R&D' or 'go-to'. Aliases ('k8s',
+'postgres') are compiled into the same trie and reported under their
+canonical term, so they cost nothing extra per document however many
+there are. Terms inside longer ones are reported too: 'testing' in 'unit
+testing' and 'sql' in 'sql server'.
+
+Compiling that regular expression takes seconds for tens of thousands of
+terms, so large term sets walk the same trie in Python instead, starting
+only at positions where a term can begin. Both report the same matches, and
+a pickled matcher carries its trie rather than the compiled pattern.
+"""
+
+import re
+from functools import lru_cache
+
+# A term may not start right after a letter or digit, nor end right before a
+# letter (trailing digits are allowed so 'python3' and 'html5' still count).
+# Terms of up to SHORT_TERM_CHARS characters may not end before '&' or '-' and
+# a letter either, so 'r' is not found in 'r&d' nor 'go' in 'go-to'.
+_BOUNDARY_BEFORE = r'(?<![a-z0-9])'
+_BOUNDARY_AFTER = r'(?![a-z])'
+_SHORT_BOUNDARY_AFTER = r'(?![a-z])(?![&\-][a-z])'
+_JOINERS = '&-'
+
+SHORT_TERM_CHARS = 2
+
+_END = ''
+
+# Above this many terms the trie is walked in Python rather than compiled to a regex
+REGEX_MAX_TERMS = 2_000
+
+
+def normalize_term(term):
+    """Normalize a term the way matches are reported: lowercase, single-spaced"""
+    return ' '.join(term.lower().split())
+
+
+def _build_trie(terms, aliases=None):
+    """Build a character trie from normalized terms and aliases
+
+    The last node of each term maps ``_END`` to the term; that of an alias
+    to the term it stands for.
+    """
+    trie = {}
+    entries = [(term, term) for term in terms]
+    entries.extend((aliases or {}).items())
+    for surface, term in entries:
+        node = trie
+        for char in surface:
+            node = node.setdefault(char, {})
+        node[_END] = term
+    return trie
+
+
+def _trie_to_regex(node, depth=0):
+    """Turn a trie into an equivalent regex with shared prefixes factored out
+
+    Each term ends in its trailing boundary check, which is stricter for
+    short terms, so the regex needs no boundary of its own after the match.
+    """
+    alternatives = []
+    for char in sorted(node):
+        if char == _END:
+            continue
+        # Multi-word terms match across any run of whitespace, including line breaks
+        atom = r'\s+' if char == ' ' else re.escape(char)
+        alternatives.append(atom + _trie_to_regex(node[char], depth + 1))
+    if _END in node:
+        # Tried last, so the longest term at a position wins as before
+        alternatives.append(_SHORT_BOUNDARY_AFTER if depth <= SHORT_TERM_CHARS else _BOUNDARY_AFTER)
+    if len(alternatives) == 1:
+        return alternatives[0]
+    return '(?:' + '|'.join(alternatives) + ')'
+
+
+class TermMatcher:
+    """Finds every occurrence of a fixed set of terms in one linear pass"""
+
+    def __init__(self, terms, aliases=None):
+        self.terms = frozenset(t for t in (normalize_term(term) for term in terms) if t)
+        # Alias -> term, normalized; aliases of unknown terms, or that are terms themselves, are dropped
+        self.aliases = {}
+        for alias, term in (aliases or {}).items():
+            alias, term = normalize_term(alias), normalize_term(term)
+            if alias and term in self.terms and alias not in self.terms:
+                self.aliases[alias] = term
+        self.trie = _build_trie(self.terms, self.aliases)
+        self._compile()
+
+    def _compile(self):
+        if len(self.terms) <= REGEX_MAX_TERMS:
+            body = _trie_to_regex(self.trie) if self.terms else r'(?!)'
+            # The lookahead makes matches zero-width, so terms nested inside a longer
+            # match ('testing' in 'unit testing') are still reported.
+            self.pattern = re.compile(_BOUNDARY_BEFORE + '(?=(' + body + '))')
+            self._starts = None
+            # The regex reports the longest term at each start; those that begin with
+            # a shorter term or alias ('sql server') are walked for the rest
+            surfaces = self.terms | self.aliases.keys()
+            self._nested = frozenset(
+                surface for surface in surfaces if any(surface[:end] in surfaces for end in range(1, len(surface)))
+            )
+        else:
+            self.pattern = None
+            self._starts = re.compile(_BOUNDARY_BEFORE + '[' + re.escape(''.join(sorted(self.trie))) + ']')
+
+    def __getstate__(self):
+        return {'terms': self.terms, 'aliases': self.aliases, 'trie': self.trie}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._compile()
+
+    def __contains__(self, term):
+        return self.canonical(term) in self.terms
+
+    def canonical(self, term):
+        """Normalized form of a term, with an alias replaced by the term it stands for"""
+        term = normalize_term(term)
+        return self.aliases.get(term, term)
+
+    def finditer(self, text_lower):
+        """Yield (start, term) for every term occurrence in lowercased text
+
+        Every term starting at a position is reported, so 'sql' and 'sql
+        server' both are in 'sql server'.
+        """
+        if self.pattern is None:
+            yield from self._walk(text_lower)
+            return
+        aliases = self.aliases
+        nested = self._nested
+        for match in self.pattern.finditer(text_lower):
+            surface = ' '.join(match.group(1).split())
+            if surface in nested:
+                for term in self._terms_at(text_lower, match.start()):
+                    yield match.start(), term
+            else:
+                yield match.start(), aliases.get(surface, surface)
+
+    def _walk(self, text_lower):
+        """``finditer`` by walking the trie from each position where a term can begin"""
+        for start_match in self._starts.finditer(text_lower):
+            start = start_match.start()
+            for term in self._terms_at(text_lower, start):
+                yield start, term
+
+    def _terms_at(self, text_lower, start):
+        """Terms starting at ``start`` that end on a boundary, shortest first, each once"""
+        found = []
+        node = self.trie
+        n = len(text_lower)
+        i = start
+        depth = 0
+        while True:
+            term = node.get(_END)
+            if term is not None and term not in found and self._ends_term(text_lower, i, depth):
+                found.append(term)
+            if i == n:
+                break
+            char = text_lower[i]
+            if char.isspace():
+                # A space in a term matches any run of whitespace, as in the regex
+                node = node.get(' ')
+                i += 1
+                while i < n and text_lower[i].isspace():
+                    i += 1
+            else:
+                node = node.get(char)
+                i += 1
+            depth += 1
+            if node is None:
+                break
+        return found
+
+    @staticmethod
+    def _ends_term(text_lower, i, depth):
+        """Whether a term of ``depth`` characters may end at ``i``, the walker's trailing boundary"""
+        if i == len(text_lower):
+            return True
+        if 'a' <= text_lower[i] <= 'z':
+            return False
+        if depth <= SHORT_TERM_CHARS and text_lower[i] in _JOINERS:
+            return not (i + 1 < len(text_lower) and 'a' <= text_lower[i + 1] <= 'z')
+        return True
+
+    def find_terms(self, text_lower):
+        """Return the set of terms present in lowercased text"""
+        return {term for _, term in self.finditer(text_lower)}
+
+
+def default_matcher():
+    """Matcher over every skill, role skill and action verb of the current taxonomy"""
+    from .taxonomy import current_taxonomy
+
+    return current_taxonomy().matcher
+
+
+@lru_cache(maxsize=128)
+def _extra_matcher(terms):
+    """Matcher for ad-hoc terms (custom role skills) missing from the default matcher"""
+    return TermMatcher(terms)
+
+
+def find_terms(text_lower, terms=None, found=None, matcher=None):
+    """Return the normalized terms found in lowercased text
+
+    With ``terms`` given, only those terms are reported, aliases under their
+    canonical term; any that the taxonomy matcher (``matcher``, default: the
+    current taxonomy's) does not know are looked up with a small cached
+    matcher. ``found`` may carry that
+    matcher's result for this text when the caller already has it.
+    """
+    matcher = matcher or default_matcher()
+    if found is None:
+        found = matcher.find_terms(text_lower)
+    if terms is None:
+        return set(found)
+    wanted = {matcher.canonical(term) for term in terms}
+    found = found & wanted
+    extra = frozenset(term for term in wanted if term and term not in matcher.terms)
+    if extra:
+        found |= _extra_matcher(extra).find_terms(text_lower)
+    return found
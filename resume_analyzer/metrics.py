@@ -0,0 +1,305 @@
+"""
+Per-stage timing instrumentation.
+
+Pipeline stages run inside ``stage()``, which records wall time, input
+sizes and whether a cache served the result. Every record is aggregated
+into a process-wide registry that renders Prometheus text, and — when a
+``trace()`` is active — collected into that trace, which is logged as one
+structured JSON line when it finishes::
+
+    with trace('analysis', file='cv.pdf') as t:
+        report = cached_analyze(data, 'cv.pdf')
+    for row in t.stage_table():
+        print(row)
+
+Set ``RESUME_ANALYZER_METRICS_FILE`` to rewrite a Prometheus text file (for
+the node exporter's textfile collector) after every trace, and call
+``enable_log_lines()`` (or set ``RESUME_ANALYZER_METRICS_LOG=1`` for the
+app) to print the per-trace JSON lines.
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+# Histogram buckets in seconds, from sub-millisecond analyzers to slow PDFs
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_current_trace = ContextVar('resume_analyzer_trace', default=None)
+
+
+@dataclass
+class StageRecord:
+    """One timed run of a pipeline stage"""
+    name: str
+    seconds: float = 0.0
+    sizes: dict = field(default_factory=dict)
+    cache_hit: bool = None
+    depth: int = 0
+    failed: bool = False
+    started: float = 0.0
+
+    def to_dict(self):
+        data = {'stage': self.name, 'ms': round(self.seconds * 1000, 3), 'depth': self.depth}
+        if self.sizes:
+            data['sizes'] = self.sizes
+        if self.cache_hit is not None:
+            data['cache_hit'] = self.cache_hit
+        if self.failed:
+            data['failed'] = True
+        return data
+
+
+@dataclass
+class Trace:
+    """Stages recorded while analyzing one document"""
+    name: str
+    labels: dict = field(default_factory=dict)
+    trace_id: str = field(default_factory=lambda: uuid.uuid4().hex[:16])
+    stages: list = field(default_factory=list)
+    seconds: float = 0.0
+    _depth: int = 0
+
+    def to_dict(self):
+        return {
+            'event': self.name,
+            'trace_id': self.trace_id,
+            'ms': round(self.seconds * 1000, 3),
+            **self.labels,
+            'stages': self.stage_table()
+        }
+
+    def stage_table(self):
+        """Rows for display, in the order stages started"""
+        return [record.to_dict() for record in sorted(self.stages, key=lambda record: record.started)]
+
+
+class _Stats:
+    """Aggregated timings for one stage or trace name"""
+
+    def __init__(self, buckets):
+        self.count = 0
+        self.total = 0.0
+        self.buckets = [0] * len(buckets)
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.failures = 0
+        self.sizes = {}
+
+
+class MetricsRegistry:
+    """Thread-safe process-wide aggregation of stage and trace timings"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.bucket_bounds = tuple(buckets)
+        self._stages = {}
+        self._traces = {}
+        self._lock = threading.Lock()
+
+    def _observe(self, table, name, seconds):
+        stats = table.get(name)
+        if stats is None:
+            stats = table[name] = _Stats(self.bucket_bounds)
+        stats.count += 1
+        stats.total += seconds
+        for i, bound in enumerate(self.bucket_bounds):
+            if seconds <= bound:
+                stats.buckets[i] += 1
+                break
+        return stats
+
+    def observe(self, record):
+        """Add a finished stage"""
+        with self._lock:
+            stats = self._observe(self._stages, record.name, record.seconds)
+            if record.cache_hit is True:
+                stats.cache_hits += 1
+            elif record.cache_hit is False:
+                stats.cache_misses += 1
+            if record.failed:
+                stats.failures += 1
+            for unit, value in record.sizes.items():
+                if isinstance(value, (int, float)):
+                    stats.sizes[unit] = stats.sizes.get(unit, 0) + value
+
+    def observe_trace(self, trace):
+        """Add a finished trace"""
+        with self._lock:
+            self._observe(self._traces, trace.name, trace.seconds)
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._traces.clear()
+
+    def snapshot(self):
+        """Per-stage counters as plain dicts"""
+        with self._lock:
+            return {
+                name: {
+                    'count': stats.count,
+                    'seconds': stats.total,
+                    'cache_hits': stats.cache_hits,
+                    'cache_misses': stats.cache_misses,
+                    'failures': stats.failures,
+                    'sizes': dict(stats.sizes)
+                }
+                for name, stats in self._stages.items()
+            }
+
+    def _histogram(self, lines, metric, label, table):
+        for name, stats in sorted(table.items()):
+            labels = f'{label}="{_escape(name)}"'
+            cumulative = 0
+            for bound, count in zip(self.bucket_bounds, stats.buckets):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {stats.count}')
+            lines.append(f'{metric}_sum{{{labels}}} {stats.total:.6f}')
+            lines.append(f'{metric}_count{{{labels}}} {stats.count}')
+
+    def render_prometheus(self):
+        """Metrics in the Prometheus text exposition format"""
+        with self._lock:
+            lines = [
+                '# HELP resume_analyzer_stage_seconds Wall time of each pipeline stage.',
+                '# TYPE resume_analyzer_stage_seconds histogram',
+            ]
+            self._histogram(lines, 'resume_analyzer_stage_seconds', 'stage', self._stages)
+            lines += [
+                '# HELP resume_analyzer_trace_seconds Wall time of each traced analysis.',
+                '# TYPE resume_analyzer_trace_seconds histogram',
+            ]
+            self._histogram(lines, 'resume_analyzer_trace_seconds', 'trace', self._traces)
+            lines += [
+                '# HELP resume_analyzer_stage_cache_total Cache lookups made by a stage.',
+                '# TYPE resume_analyzer_stage_cache_total counter',
+            ]
+            for name, stats in sorted(self._stages.items()):
+                if stats.cache_hits or stats.cache_misses:
+                    lines.append(f'resume_analyzer_stage_cache_total{{stage="{_escape(name)}",result="hit"}} {stats.cache_hits}')
+                    lines.append(f'resume_analyzer_stage_cache_total{{stage="{_escape(name)}",result="miss"}} {stats.cache_misses}')
+            lines += [
+                '# HELP resume_analyzer_stage_failures_total Stage runs that raised an exception.',
+                '# TYPE resume_analyzer_stage_failures_total counter',
+            ]
+            for name, stats in sorted(self._stages.items()):
+                lines.append(f'resume_analyzer_stage_failures_total{{stage="{_escape(name)}"}} {stats.failures}')
+            lines += [
+                '# HELP resume_analyzer_stage_input_total Input processed by a stage (pages, chars, lines, bytes).',
+                '# TYPE resume_analyzer_stage_input_total counter',
+            ]
+            for name, stats in sorted(self._stages.items()):
+                for unit, value in sorted(stats.sizes.items()):
+                    lines.append(f'resume_analyzer_stage_input_total{{stage="{_escape(name)}",unit="{_escape(unit)}"}} {value:g}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Atomically write the Prometheus text to ``path``"""
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp_path, path)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+_registry = MetricsRegistry()
+
+
+def default_registry():
+    """Registry that every stage in this process reports to"""
+    return _registry
+
+
+def enable_log_lines(stream=None):
+    """Write each finished trace as a bare JSON line to ``stream`` (default stderr)"""
+    if not any(getattr(handler, '_metrics_lines', False) for handler in logger.handlers):
+        handler = logging.StreamHandler(stream or sys.stderr)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        handler._metrics_lines = True
+        logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def current_trace():
+    """The active trace, or None"""
+    return _current_trace.get()
+
+
+class _Stage:
+    """Context manager behind ``stage()``; a plain class keeps hot-path overhead low"""
+
+    __slots__ = ('record', 'trace')
+
+    def __init__(self, name, sizes):
+        self.record = StageRecord(name, sizes=sizes)
+
+    def __enter__(self):
+        self.trace = active = _current_trace.get()
+        record = self.record
+        if active is not None:
+            record.depth = active._depth
+            active._depth += 1
+        record.started = time.perf_counter()
+        return record
+
+    def __exit__(self, exc_type, exc, tb):
+        record = self.record
+        record.seconds = time.perf_counter() - record.started
+        record.failed = exc_type is not None
+        _registry.observe(record)
+        if self.trace is not None:
+            self.trace._depth -= 1
+            self.trace.stages.append(record)
+        return False
+
+
+def stage(name, **sizes):
+    """Time a pipeline stage
+
+    Returns a context manager yielding the StageRecord, so the stage can add
+    sizes learned while it runs (``record.sizes['pages'] = 3``) and mark
+    ``record.cache_hit``.
+    """
+    return _Stage(name, sizes)
+
+
+@contextmanager
+def trace(name='analysis', **labels):
+    """Collect every stage run inside the block into a Trace
+
+    When the block exits the trace is logged as one JSON line on the
+    ``resume_analyzer.metrics`` logger at INFO level.
+    """
+    active = Trace(name, labels)
+    token = _current_trace.set(active)
+    start = time.perf_counter()
+    try:
+        yield active
+    finally:
+        active.seconds = time.perf_counter() - start
+        _current_trace.reset(token)
+        _registry.observe_trace(active)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps(active.to_dict(), default=str))
+        path = os.environ.get('RESUME_ANALYZER_METRICS_FILE')
+        if path:
+            try:
+                _registry.write_prometheus(path)
+            except OSError as e:
+                logger.warning("Could not write metrics file %s: %s", path, e)
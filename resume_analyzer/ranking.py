@@ -0,0 +1,207 @@
+"""
+Vectorized scoring of many candidates against one role.
+
+Each candidate's skills are folded into a candidates x skills boolean
+matrix; match rates, ATS scores, shortlist probabilities and verdicts are
+then computed for the whole pool with NumPy array operations instead of a
+per-candidate Python loop. The formulas mirror ``calculate_ats_score`` and
+``calculate_shortlist_probability``.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from .analysis import analyze_formatting, analyze_projects, analyze_tech_skills, resolve_role
+from .cache import default_cache, hash_bytes, text_cache_key
+from .context import as_context
+from .extraction import DEFAULT_MAX_CHARS, DEFAULT_MAX_PAGES
+from .ingest import Upload
+from .jd_match import JD_SIMILARITY_FULL_MARKS, has_job_description, jd_matcher
+from .matcher import normalize_term
+from .sandbox import default_sandbox, extract_isolated
+
+
+@dataclass
+class CandidateScores:
+    """Scores for a pool of candidates, one array element per candidate"""
+    names: list
+    skills: list
+    skill_matrix: np.ndarray
+    ats_score: np.ndarray
+    skill_match_pct: np.ndarray
+    project_quality: np.ndarray
+    shortlist_prob: np.ndarray
+    verdict: np.ndarray
+    jd_similarity: np.ndarray = None
+
+    def to_records(self):
+        """One dict per candidate, in input order"""
+        return [
+            {
+                'candidate': name,
+                'ats_score': int(self.ats_score[i]),
+                'skill_match_pct': float(self.skill_match_pct[i]),
+                'project_quality': int(self.project_quality[i]),
+                'shortlist_prob': int(self.shortlist_prob[i]),
+                'verdict': str(self.verdict[i]),
+                'jd_similarity': None if self.jd_similarity is None else float(self.jd_similarity[i])
+            }
+            for i, name in enumerate(self.names)
+        ]
+
+
+def build_skill_matrix(contexts, skills):
+    """Boolean matrix with a row per candidate and a column per skill"""
+    canonical = contexts[0].taxonomy.matcher.canonical if contexts else normalize_term
+    columns = {}
+    for j, skill in enumerate(skills):
+        columns.setdefault(canonical(skill), []).append(j)
+    matrix = np.zeros((len(contexts), len(skills)), dtype=bool)
+    for i, ctx in enumerate(contexts):
+        for term in ctx.find_terms(skills):
+            matrix[i, columns[term]] = True
+    return matrix
+
+
+def _tiered(values, tiers, default):
+    """Map values to points with (lower_bound, points) tiers checked in order"""
+    return np.select([values >= bound for bound, _ in tiers], [points for _, points in tiers], default)
+
+
+def score_candidates(texts, role=None, names=None, job_description=None):
+    """Score resume texts (or contexts) against one role in a single vectorized pass
+
+    With a ``job_description``, every resume is compared to it with one
+    sparse matrix-vector product.
+    """
+    contexts = [as_context(text) for text in texts]
+    names = list(names) if names is not None else [str(i + 1) for i in range(len(contexts))]
+    _, required_skills, preferred_skills = resolve_role(role)
+    skills = required_skills + preferred_skills
+    n_required = len(required_skills)
+    n_preferred = len(preferred_skills)
+
+    matrix = build_skill_matrix(contexts, skills)
+    matched_required = matrix[:, :n_required].sum(axis=1)
+    matched_preferred = matrix[:, n_required:].sum(axis=1)
+
+    # Per-document features come from the cached analyzers
+    formatting = np.array([analyze_formatting(ctx)[0] for ctx in contexts], dtype=float)
+    skill_counts = np.array([len(analyze_tech_skills(ctx)[0]) for ctx in contexts], dtype=float)
+    projects = [analyze_projects(ctx) for ctx in contexts]
+    project_counts = np.array([[len(p[0]), len(p[1]), len(p[2])] for p in projects], dtype=float).reshape(-1, 3)
+    word_counts = np.array([ctx.word_count for ctx in contexts])
+    indicators, actions, quantified = project_counts.T
+
+    # ATS score, as in calculate_ats_score
+    required_rate = matched_required / max(n_required, 1)
+    preferred_rate = matched_preferred / max(n_preferred, 1)
+    if has_job_description(job_description):
+        jd_similarity = jd_matcher(job_description).similarities([ctx.text for ctx in contexts])
+        jd_score = np.minimum(jd_similarity / JD_SIMILARITY_FULL_MARKS, 1) * 10
+        score = (required_rate * 15) + (preferred_rate * 5) + jd_score
+    else:
+        jd_similarity = None
+        score = (required_rate * 20) + (preferred_rate * 10)
+    score = score + np.minimum(formatting, 20)
+    score = score + np.minimum(skill_counts * 2, 20)
+    score = score + np.minimum(indicators * 5 + quantified * 3 + actions * 2, 20)
+    length_ok = (word_counts >= 300) & (word_counts <= 1000)
+    length_fair = ((word_counts >= 200) & (word_counts < 300)) | ((word_counts > 1000) & (word_counts <= 1500))
+    score = score + np.select([length_ok, length_fair], [10, 7], 3)
+    ats_score = np.minimum(np.trunc(score), 100).astype(int)
+
+    if skills:
+        skill_match_pct = (matched_required + matched_preferred) / len(skills) * 100
+    else:
+        skill_match_pct = np.full(len(contexts), 50.0)
+    project_quality = np.minimum(indicators * 20 + quantified * 15 + actions * 10, 100).astype(int)
+
+    # Shortlist probability, as in calculate_shortlist_probability
+    shortlist = (
+        ats_score
+        + _tiered(skill_match_pct, [(80, 10), (60, 5), (40, 0)], -10)
+        + _tiered(project_quality, [(80, 10), (60, 5), (40, 0)], -10)
+    )
+    shortlist_prob = np.clip(shortlist, 5, 95)
+    verdict = np.select([shortlist_prob >= 70, shortlist_prob >= 50], ["HIRE", "BORDERLINE"], "REJECT")
+
+    return CandidateScores(
+        names=names,
+        skills=skills,
+        skill_matrix=matrix,
+        ats_score=ats_score,
+        skill_match_pct=skill_match_pct.astype(float),
+        project_quality=project_quality,
+        shortlist_prob=shortlist_prob,
+        verdict=verdict,
+        jd_similarity=jd_similarity
+    )
+
+
+def _extract_upload(source, filename, max_pages, max_chars):
+    try:
+        return extract_isolated(source, filename, max_pages, max_chars)
+    except Exception as e:
+        return e
+
+
+def _source(upload, as_bytes):
+    """What to extract an upload from: its spooled buffer, or bytes a process pool can be sent"""
+    if isinstance(upload, Upload):
+        return upload.read_bytes() if as_bytes else upload.open()
+    return upload[1]
+
+
+def extract_texts(uploads, workers=None, cache=None, max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS):
+    """Extract text from ingested Uploads or (filename, bytes) pairs concurrently, within the page and character budgets
+
+    Files already in the cache are served from it; the rest are extracted
+    concurrently by the sandbox's workers (or a process pool when the
+    sandbox is disabled). An Upload is read from its spooled buffer, so
+    only the process pool needs its bytes in memory. Returns one entry per
+    upload: the text, or the exception (usually an ExtractionFailure)
+    raised while extracting it.
+    """
+    cache = cache or default_cache()
+    results = [None] * len(uploads)
+    names = []
+    keys = []
+    pending = []
+    for i, upload in enumerate(uploads):
+        if isinstance(upload, Upload):
+            filename, digest = upload.name, upload.digest
+        else:
+            filename, data = upload
+            digest = hash_bytes(data)
+        names.append(filename)
+        keys.append(text_cache_key(digest, filename, max_pages, max_chars))
+        text = cache.get(keys[i])
+        if text is None:
+            pending.append(i)
+        else:
+            results[i] = text
+
+    workers = min(workers or os.cpu_count() or 1, len(pending))
+    if workers > 1:
+        # Sandbox workers are subprocesses already, so threads only wait on them
+        sandboxed = default_sandbox() is not None
+        executor = ThreadPoolExecutor if sandboxed else ProcessPoolExecutor
+        with executor(workers) as pool:
+            futures = [
+                (i, pool.submit(_extract_upload, _source(uploads[i], as_bytes=not sandboxed), names[i], max_pages, max_chars))
+                for i in pending
+            ]
+            extracted = [(i, future.result()) for i, future in futures]
+    else:
+        extracted = [(i, _extract_upload(_source(uploads[i], as_bytes=False), names[i], max_pages, max_chars)) for i in pending]
+
+    for i, text in extracted:
+        results[i] = text
+        if not isinstance(text, Exception):
+            # Seed the cache so drill-down reports do not extract again
+            cache.put(keys[i], text)
+    return results
@@ -0,0 +1,74 @@
+"""
+Line-level comparison of two analyses of a resume.
+
+When a candidate re-uploads an edited resume, ``diff_reports`` lists the
+lines that were added or removed, what the rules found on each line and
+how many project-quality points the line earned, so the lines that moved
+the score can be shown next to the new report::
+
+    for change in diff_reports(previous_report, report):
+        if change.points:
+            print(change.kind, change.points, change.line)
+
+Line categories come from the rule set's per-line memo, so lines already
+seen in either analysis are not scanned again.
+"""
+
+import difflib
+from dataclasses import dataclass
+
+from .rules import default_rules
+
+# Project-quality points a line earns, as counted by calculate_project_quality
+PROJECT_POINTS = {'project': 20, 'quantified': 15, 'action_verb': 10}
+
+
+@dataclass
+class LineChange:
+    """One line added to or removed from a resume"""
+    kind: str
+    line: str
+    categories: frozenset
+    points: int
+
+
+def _line_labels(report):
+    """Scored labels ('project', 'quantified', 'action_verb') of each line of a report"""
+    labels = {}
+    for line in report.project_indicators or []:
+        labels.setdefault(line, set()).add('project')
+    for line, _ in report.quantified or []:
+        labels.setdefault(line, set()).add('quantified')
+    for _, line in report.action_usage or []:
+        labels.setdefault(line, set()).add('action_verb')
+    return labels
+
+
+def diff_lines(old_text, new_text):
+    """('removed' | 'added', line) for each non-empty line that differs, in document order"""
+    old_lines = [line.strip() for line in (old_text or "").split('\n') if line.strip()]
+    new_lines = [line.strip() for line in (new_text or "").split('\n') if line.strip()]
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    changes = []
+    for tag, old_start, old_end, new_start, new_end in matcher.get_opcodes():
+        if tag == 'equal':
+            continue
+        changes.extend(('removed', line) for line in old_lines[old_start:old_end])
+        changes.extend(('added', line) for line in new_lines[new_start:new_end])
+    return changes
+
+
+def diff_reports(old_report, new_report):
+    """LineChange for every line added or removed between two reports of a resume"""
+    changes = diff_lines(old_report.text, new_report.text)
+    if not changes:
+        return []
+    old_labels = _line_labels(old_report)
+    new_labels = _line_labels(new_report)
+    classes = default_rules().classify_lines([line.lower() for _, line in changes])
+    result = []
+    for (kind, line), categories in zip(changes, classes):
+        labels = (new_labels if kind == 'added' else old_labels).get(line, set())
+        points = sum(PROJECT_POINTS[label] for label in labels)
+        result.append(LineChange(kind, line, categories | labels, points))
+    return result
@@ -0,0 +1,153 @@
+"""
+Declarative line-classification rules.
+
+Every per-line check the analyzers make (weak phrasing, strong phrasing,
+quantified results, project indicators) is a row in ``LINE_RULES``. The
+table is compiled once: the rules of each category become one alternation
+that is searched across the whole document, jumping to the next line after
+each hit. Classifying a document therefore costs one scan per category
+whatever the number of rules or lines, and the analyzers share the result.
+``classify_lines`` also remembers the categories of every line it has seen,
+so re-classifying a revised resume only scans its edited lines. Only this
+rule pass is incremental: the skill matcher and the analyzers that read
+the categories still go over the whole document::
+
+    rules = default_rules()
+    for line, categories in zip(text.split('\\n'), rules.classify(text.lower())):
+        if 'weak' in categories and 'strong' not in categories:
+            print("rewrite:", line)
+"""
+
+import re
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+
+from .data import PROJECT_KEYWORDS
+
+# Rules are matched against the whole document, so they must not cross line
+# breaks: use this instead of '\s', and exclude '\n' from negated classes
+_SPACE = r'[^\S\n]'
+
+# Lines remembered by classify_lines, and the longest line worth remembering
+LINE_MEMO_SIZE = 20_000
+MAX_MEMO_LINE = 1_000
+
+
+@dataclass(frozen=True)
+class LineRule:
+    """One pattern and the category a matching line falls into"""
+    name: str
+    category: str
+    pattern: str
+
+
+LINE_RULES = (
+    # Weak phrasing
+    LineRule('passive_duty', 'weak', r'responsible for|duties include|task was|job involved'),
+    LineRule('supporting_role', 'weak', r'helped|assisted|participated in'),
+    LineRule('vague_quantity', 'weak', r'some|various|different'),
+    LineRule('no_leading_bullet', 'weak', r'^[^•\-\*\n]*[a-z]'),
+    # Strong phrasing
+    LineRule('ownership_verb', 'strong', r'developed|created|designed|implemented|led|managed'),
+    LineRule('impact_metric', 'strong', rf'\d+%|\$\d+|\d+{_SPACE}*(?:users|clients|hours|days)'),
+    LineRule('improvement_verb', 'strong', r'improved|optimized|increased|decreased|reduced'),
+    # Quantified results
+    LineRule('quantity', 'quantified', rf'\d+%|\$\d+|\d+{_SPACE}*(?:x|times|users|clients)'),
+    # Project indicators
+    LineRule('project_keyword', 'project', '|'.join(re.escape(keyword) for keyword in PROJECT_KEYWORDS)),
+    # Any number at all, for suggesting a metric
+    LineRule('number', 'number', r'\d'),
+    # Bullet characters anywhere on the line
+    LineRule('bullet_marker', 'bullet', r'[•\-\*·○▪›→]'),
+)
+
+
+class LineRuleSet:
+    """Compiled form of a rule table"""
+
+    def __init__(self, rules=LINE_RULES, memo_size=LINE_MEMO_SIZE):
+        self.rules = tuple(rules)
+        self.memo_size = memo_size
+        self._memo = OrderedDict()
+        self._memo_lock = threading.Lock()
+        self.categories = tuple(dict.fromkeys(rule.category for rule in self.rules))
+        self.patterns = {
+            category: re.compile(
+                '|'.join(f'(?:{rule.pattern})' for rule in self.rules if rule.category == category), re.MULTILINE
+            )
+            for category in self.categories
+        }
+
+    def classify(self, text_lower, line_starts=None):
+        """Frozenset of matched categories for each line of lowercased text
+
+        ``line_starts`` may carry the offset of every line when the caller
+        already has them.
+        """
+        if line_starts is None:
+            line_starts = [0]
+            line_starts.extend(match.end() for match in re.finditer('\n', text_lower))
+        hits = {}
+        for category, pattern in self.patterns.items():
+            match = pattern.search(text_lower)
+            while match:
+                # One hit classifies the line; resume the search on the next one
+                line = bisect_right(line_starts, match.start()) - 1
+                hits.setdefault(line, []).append(category)
+                if line + 1 >= len(line_starts):
+                    break
+                match = pattern.search(text_lower, line_starts[line + 1])
+        empty = frozenset()
+        classes = [empty] * len(line_starts)
+        for line, categories in hits.items():
+            classes[line] = frozenset(categories)
+        return classes
+
+    def classify_lines(self, lines_lower):
+        """Like ``classify`` for a list of lines, reusing the result for any line seen before
+
+        Lines are looked up by content, so repeated uploads of a resume with
+        a few edits only scan the new or changed lines, joined into one text.
+        """
+        classes = [None] * len(lines_lower)
+        missing = {}
+        memo = self._memo
+        with self._memo_lock:
+            for i, line in enumerate(lines_lower):
+                categories = memo.get(line)
+                if categories is None:
+                    missing.setdefault(line, []).append(i)
+                else:
+                    memo.move_to_end(line)
+                    classes[i] = categories
+        if not missing:
+            return classes
+        new_lines = list(missing)
+        new_classes = self.classify('\n'.join(new_lines))
+        with self._memo_lock:
+            for line, categories in zip(new_lines, new_classes):
+                for i in missing[line]:
+                    classes[i] = categories
+                if len(line) <= MAX_MEMO_LINE:
+                    memo[line] = categories
+            while len(memo) > self.memo_size:
+                memo.popitem(last=False)
+        return classes
+
+    def clear_memo(self):
+        """Forget every remembered line"""
+        with self._memo_lock:
+            self._memo.clear()
+
+    def findall(self, category, text_lower):
+        """Every non-overlapping match of one category's rules in the text"""
+        return self.patterns[category].findall(text_lower)
+
+
+@lru_cache(maxsize=1)
+def default_rules():
+    """Rule set compiled from ``LINE_RULES``"""
+    return LineRuleSet()
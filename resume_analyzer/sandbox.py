@@ -0,0 +1,408 @@
+"""
+Isolated extraction workers.
+
+A malformed PDF can keep PyPDF2 busy for minutes or grow its memory
+without bound. Extraction therefore runs in long-lived worker subprocesses,
+each started with an address-space limit (RLIMIT_AS), and every document
+gets a wall-clock timeout. A worker that times out or runs out of memory is
+killed and replaced, and the caller gets an ``ExtractionFailure`` saying
+which of these happened, so one bad file costs one failed record instead
+of a frozen session or batch::
+
+    try:
+        text = extract_isolated(data, 'cv.pdf')
+    except ExtractionFailure as e:
+        print(e.kind, e)    # 'timeout', 'oom', 'parse_error' or 'crash', and why
+
+Workers are plain subprocesses talking over pipes, so they can be started
+from Streamlit, from batch pool workers and from the HTTP service's
+workers alike. ``RESUME_ANALYZER_EXTRACT_TIMEOUT`` (seconds, default 30),
+``RESUME_ANALYZER_EXTRACT_MEMORY_MB`` (default 1024) and
+``RESUME_ANALYZER_EXTRACT_WORKERS`` (default: CPU count) set the limits; set
+``RESUME_ANALYZER_SANDBOX=0`` to extract in-process instead.
+
+A long PDF extracted with ``workers`` > 1 is split into page ranges: one
+worker reads its page count, then each range goes to a worker of its own,
+under the same timeout and memory limit as a whole document.
+"""
+
+import argparse
+import atexit
+import logging
+import os
+import pickle
+import queue
+import signal
+import struct
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from io import BytesIO
+
+from .extraction import (DEFAULT_MAX_CHARS, DEFAULT_MAX_PAGES, extract_page_range, extract_text,
+                         extract_text_from_file, join_pdf_pages, plan_pdf_shards)
+
+# Ways an extraction can fail
+FAILURE_KINDS = ('timeout', 'oom', 'parse_error', 'crash')
+
+# Bytes of a document sent to a worker per write
+CHUNK_BYTES = 64 * 1024
+
+# Seconds a new worker may take to start; not counted against the document
+STARTUP_SECONDS = 60.0
+
+_MB = 1024 * 1024
+_HEADER = struct.Struct('>Q')
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionFailure(Exception):
+    """Text could not be extracted from a document; ``kind`` is one of FAILURE_KINDS"""
+
+    def __init__(self, kind, message):
+        super().__init__(message)
+        self.kind = kind
+        self.message = message
+
+    def __reduce__(self):
+        # Keeps the kind when the failure crosses a process pool
+        return type(self), (self.kind, self.message)
+
+
+@dataclass(frozen=True)
+class SandboxLimits:
+    """Per-document wall-clock and memory limits, and how many workers may run at once"""
+    timeout: float = 30.0
+    memory_mb: int = 1024
+    workers: int = os.cpu_count() or 1
+
+    @classmethod
+    def from_env(cls):
+        """Limits from ``RESUME_ANALYZER_EXTRACT_TIMEOUT``, ``_EXTRACT_MEMORY_MB`` and ``_EXTRACT_WORKERS``"""
+        defaults = cls()
+        return cls(
+            timeout=float(os.environ.get('RESUME_ANALYZER_EXTRACT_TIMEOUT', defaults.timeout)),
+            memory_mb=int(os.environ.get('RESUME_ANALYZER_EXTRACT_MEMORY_MB', defaults.memory_mb)),
+            workers=max(int(os.environ.get('RESUME_ANALYZER_EXTRACT_WORKERS', defaults.workers)), 1)
+        )
+
+
+def _write_frame(stream, payload):
+    stream.write(_HEADER.pack(len(payload)))
+    stream.write(payload)
+
+
+def _read_exact(stream, size):
+    data = stream.read(size)
+    if len(data) < size:
+        raise EOFError
+    return data
+
+
+def _read_frame(stream):
+    return _read_exact(stream, _HEADER.unpack(_read_exact(stream, _HEADER.size))[0])
+
+
+class _Worker:
+    """One extraction subprocess and its pipes"""
+
+    def __init__(self, memory_mb):
+        package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [package_root, os.environ.get('PYTHONPATH')])))
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'resume_analyzer.sandbox', '--memory-mb', str(memory_mb)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env,
+            # Own process group, so page-extraction processes it starts are killed with it
+            start_new_session=os.name == 'posix'
+        )
+        self.ready = False
+        # Replies are read by a thread so waiting for one can time out on
+        # every platform (select() does not work on Windows pipes)
+        self._replies = queue.SimpleQueue()
+        threading.Thread(target=self._read_replies, daemon=True).start()
+
+    def _read_replies(self):
+        stdout = self.process.stdout
+        while True:
+            try:
+                reply = pickle.loads(_read_frame(stdout))
+            except (EOFError, OSError, ValueError, pickle.UnpicklingError):
+                self._replies.put(None)
+                return
+            self._replies.put(reply)
+
+    def _send(self, source, size, request):
+        stdin = self.process.stdin
+        _write_frame(stdin, pickle.dumps(request, protocol=pickle.HIGHEST_PROTOCOL))
+        stdin.write(_HEADER.pack(size))
+        while True:
+            chunk = source.read(CHUNK_BYTES)
+            if not chunk:
+                break
+            stdin.write(chunk)
+        stdin.flush()
+
+    def _receive(self, deadline):
+        """Wait for the next reply until ``deadline``; None if the worker died"""
+        try:
+            return self._replies.get(timeout=max(deadline - time.monotonic(), 0))
+        except queue.Empty:
+            raise TimeoutError from None
+
+    def call(self, source, size, request, timeout):
+        """Send a document and return the worker's ``(status, value)`` reply
+
+        Raises TimeoutError when no reply comes within ``timeout`` seconds,
+        and returns None when the worker exits without replying.
+        """
+        if not self.ready:
+            if self._receive(time.monotonic() + STARTUP_SECONDS) is None:
+                return None
+            self.ready = True
+        deadline = time.monotonic() + timeout
+        try:
+            self._send(source, size, request)
+        except (BrokenPipeError, ValueError):
+            return None
+        return self._receive(deadline)
+
+    def exit_failure(self):
+        """How a worker that exited without replying failed"""
+        returncode = self.process.wait()
+        # The kernel's OOM killer sends SIGKILL
+        if returncode == -signal.SIGKILL:
+            return 'oom', "the extraction worker was killed, most likely for running out of memory"
+        return 'crash', f"the extraction worker exited with status {returncode}"
+
+    def kill(self):
+        if os.name == 'posix':
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        elif self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+
+class ExtractionSandbox:
+    """A set of extraction subprocesses that enforce SandboxLimits on every document
+
+    Safe to share between threads: up to ``limits.workers`` documents are
+    extracted at once and further callers wait for a free worker.
+    """
+
+    def __init__(self, limits=None):
+        self.limits = limits or SandboxLimits.from_env()
+        self.restarts = 0
+        self._owner = os.getpid()
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.limits.workers)
+
+    def _checkout(self):
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.process.poll() is None:
+                    return worker
+                # Exited while idle (killed from outside); not the next document's fault
+                worker.kill()
+        return _Worker(self.limits.memory_mb)
+
+    def _checkin(self, worker):
+        with self._lock:
+            self._idle.append(worker)
+
+    def _replace(self, worker):
+        """Kill a failed worker and start its replacement right away"""
+        worker.kill()
+        with self._lock:
+            self.restarts += 1
+        self._checkin(_Worker(self.limits.memory_mb))
+
+    def extract(self, source, filename, max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS, workers=None):
+        """Extract the text of a document (bytes or a binary file object) in a worker
+
+        Raises ExtractionFailure when the document cannot be parsed or the
+        worker times out, runs out of memory or crashes. With ``workers`` > 1
+        a long PDF's page ranges are extracted by up to that many workers
+        (at most ``limits.workers``) at once.
+        """
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source = BytesIO(source)
+        shards = min(workers or 1, self.limits.workers)
+        if shards < 2 or not filename.lower().endswith('.pdf'):
+            shards = None
+        status, value = self._call(source, ('extract', filename, max_pages, max_chars, shards))
+        if status != 'shards':
+            return value
+        ranges, total_pages = value
+        source.seek(0)
+        data = source.read()
+        # Each range takes a worker slot of its own; this thread holds none while it waits
+        with ThreadPoolExecutor(len(ranges)) as pool:
+            futures = [pool.submit(self._call, BytesIO(data), ('pages', start, stop)) for start, stop in ranges]
+            pages = [page for future in futures for page in future.result()[1]]
+        return join_pdf_pages(pages, total_pages, max_chars).text
+
+    def _call(self, source, request):
+        """Send one request and its document to a worker; the ``(status, value)`` reply unless it failed"""
+        source.seek(0, os.SEEK_END)
+        size = source.tell()
+        source.seek(0)
+        with self._slots:
+            worker = self._checkout()
+            try:
+                reply = worker.call(source, size, request, self.limits.timeout)
+            except TimeoutError:
+                self._replace(worker)
+                raise ExtractionFailure('timeout', f"extraction took longer than {self.limits.timeout:g} s")
+            except BaseException:
+                self._replace(worker)
+                raise
+            if reply is None:
+                kind, message = worker.exit_failure()
+                self._replace(worker)
+                raise ExtractionFailure(kind, message)
+            status, value = reply
+            if status == 'oom':
+                # The worker exits after a MemoryError; start a fresh one
+                self._replace(worker)
+                raise ExtractionFailure('oom', f"extraction needed more than {self.limits.memory_mb} MB")
+            self._checkin(worker)
+            if status == 'parse_error':
+                raise ExtractionFailure('parse_error', value)
+            return status, value
+
+    def close(self):
+        """Stop all idle workers; a forked child leaves its parent's workers alone"""
+        if os.getpid() != self._owner:
+            return
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.kill()
+
+
+_default_sandbox = None
+_default_lock = threading.Lock()
+
+
+def _forget_default_sandbox():
+    # A forked child would share the parent's worker pipes; it starts workers of its own
+    global _default_sandbox, _default_lock
+    _default_sandbox = None
+    _default_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_default_sandbox)
+
+
+def default_sandbox():
+    """Process-wide sandbox configured from the environment, or None when ``RESUME_ANALYZER_SANDBOX=0``"""
+    global _default_sandbox
+    if os.environ.get('RESUME_ANALYZER_SANDBOX', '1').lower() in ('0', 'false', 'off', 'no'):
+        return None
+    with _default_lock:
+        if _default_sandbox is None:
+            _default_sandbox = ExtractionSandbox()
+            atexit.register(_default_sandbox.close)
+        return _default_sandbox
+
+
+def extract_isolated(source, filename, max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS, workers=None):
+    """Extract text through the default sandbox, or in-process when it is disabled
+
+    Either way, failures are raised as ExtractionFailure. ``workers``
+    enables page-parallel extraction of long PDFs.
+    """
+    sandbox = default_sandbox()
+    if sandbox is not None:
+        return sandbox.extract(source, filename, max_pages, max_chars, workers)
+    try:
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return extract_text(bytes(source), filename, max_pages, max_chars, workers)
+        return extract_text_from_file(source, max_pages, max_chars, workers)
+    except MemoryError:
+        raise ExtractionFailure('oom', "ran out of memory during extraction")
+    except Exception as e:
+        raise ExtractionFailure('parse_error', f"{type(e).__name__}: {e}") from e
+
+
+def _handle(request, data):
+    """Answer one request: extract a document, or plan or extract a PDF's page ranges
+
+    Pages are always extracted serially here: page processes started by a
+    worker would escape its memory limit.
+    """
+    if request[0] == 'pages':
+        _, start, stop = request
+        return 'ok', extract_page_range(data, start, stop)
+    _, filename, max_pages, max_chars, shards = request
+    if shards:
+        ranges, total_pages = plan_pdf_shards(data, max_pages, shards)
+        if ranges:
+            return 'shards', (ranges, total_pages)
+    return 'ok', extract_text(data, filename, max_pages, max_chars, workers=None)
+
+
+def serve(stdin, stdout, memory_mb=None):
+    """Worker loop: extract each document sent on ``stdin`` and reply on ``stdout`` until EOF"""
+    if memory_mb:
+        try:
+            import resource
+            limit = memory_mb * _MB
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ImportError, ValueError, OSError) as e:
+            logger.warning("Could not limit extraction worker memory: %s", e)
+    _write_frame(stdout, pickle.dumps(('ready', None)))
+    stdout.flush()
+    while True:
+        try:
+            request = pickle.loads(_read_frame(stdin))
+            data = _read_frame(stdin)
+        except EOFError:
+            return 0
+        try:
+            reply = _handle(request, data)
+        except MemoryError:
+            reply = ('oom', None)
+        except Exception as e:
+            reply = ('parse_error', f"{type(e).__name__}: {e}")
+        del data
+        _write_frame(stdout, pickle.dumps(reply, protocol=pickle.HIGHEST_PROTOCOL))
+        stdout.flush()
+        if reply[0] == 'oom':
+            return 1
+
+
+def build_parser():
+    """Create the command-line parser"""
+    parser = argparse.ArgumentParser(description="Extraction worker started by ExtractionSandbox; speaks a binary protocol on stdin/stdout.")
+    parser.add_argument('--memory-mb', type=int, default=None, help="address-space limit in MB")
+    return parser
+
+
+def main(argv=None):
+    """Worker entry point"""
+    args = build_parser().parse_args(argv)
+    stdin = sys.stdin.buffer
+    # Replies get a private copy of stdout; anything a parser prints goes to stderr
+    stdout = os.fdopen(os.dup(sys.stdout.fileno()), 'wb')
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    return serve(stdin, stdout, args.memory_mb)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,565 @@
+"""
+Local HTTP scoring service.
+
+A small asyncio HTTP/1.1 server (standard library only) that accepts a
+resume and a role and returns the analysis report as JSON. Extraction and
+scoring run in a process pool so the event loop only parses requests. The
+number of requests admitted at once is bounded; beyond it the service
+answers 429 straight away instead of queueing without limit, so a proxy
+can spread load across several instances::
+
+    python -m resume_analyzer.service --port 8000 --workers 4
+
+    curl -s localhost:8000/analyze -H 'Content-Type: application/json' \\
+        -d '{"text": "...", "role": "Data Scientist"}'
+    curl -s --data-binary @cv.pdf 'localhost:8000/analyze?filename=cv.pdf&role=Data+Scientist'
+
+``GET /health`` reports load for health checks and ``GET /metrics`` serves
+the request timings in the Prometheus text format. With ``--jobs-db`` the
+service also takes bulk jobs (see ``resume_analyzer.jobs``): ``POST /jobs``
+returns a job id at once, ``GET /jobs/<id>`` reports progress and
+``GET /jobs/<id>/results?after=0&limit=100`` pages through the records.
+"""
+
+import argparse
+import asyncio
+import base64
+import binascii
+import json
+import logging
+import os
+import signal
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import partial
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from .analysis import resolve_role
+from .batch import SUPPORTED_EXTENSIONS, disk_cache
+from .cache import cached_analyze, cached_extract_text, default_cache, hash_bytes
+from .ingest import UploadLimits, UploadTooLarge
+from .jobs import JobRunner, JobStore
+from .metrics import default_registry, enable_log_lines, stage, trace
+from .sandbox import ExtractionFailure
+
+DEFAULT_MAX_BODY_BYTES = 10 * 1024 * 1024
+DEFAULT_MAX_HEADER_BYTES = 16 * 1024
+DEFAULT_TIMEOUT = 60.0
+DEFAULT_MAX_JOB_BYTES = 256 * 1024 * 1024
+
+# Admitted requests (reading, queued or scoring) per worker process
+PENDING_PER_WORKER = 4
+
+# Seconds a client may take to send its headers and body
+READ_TIMEOUT = 30.0
+
+# Seconds the job runner sleeps when no job has work left
+JOB_POLL_SECONDS = 5.0
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPError(Exception):
+    """Request failure carrying the HTTP status to answer with"""
+
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = HTTPStatus(status)
+        self.message = message
+        self.headers = headers or {}
+
+
+@dataclass
+class Request:
+    """One parsed HTTP request"""
+    method: str
+    path: str
+    query: dict
+    headers: dict
+    version: str
+    body: bytes = None
+
+    @property
+    def keep_alive(self):
+        connection = self.headers.get('connection', '').lower()
+        if self.version == 'HTTP/1.0':
+            return connection == 'keep-alive'
+        return connection != 'close'
+
+
+def analyze_upload(data, filename, role=None, job_description=None, cache_dir=None):
+    """Extract and score one upload; runs in a worker process
+
+    Returns the report as a dict, or None when no text could be extracted.
+    """
+    cache = disk_cache(cache_dir) if cache_dir else default_cache()
+    digest = hash_bytes(data)
+    text = cached_extract_text(data, filename, cache, digest)
+    if not text or not text.strip():
+        return None
+    return cached_analyze(data, filename, role, cache, digest, job_description=job_description).to_dict()
+
+
+def _query_value(query, name):
+    values = query.get(name)
+    return values[0] if values else None
+
+
+def _json_body(request):
+    content_type = request.headers.get('content-type', '').split(';')[0].strip().lower()
+    if content_type != 'application/json':
+        return None
+    try:
+        payload = json.loads(request.body)
+    except (UnicodeDecodeError, ValueError) as e:
+        raise HTTPError(400, f"Invalid JSON body: {e}")
+    if not isinstance(payload, dict):
+        raise HTTPError(400, "JSON body must be an object")
+    return payload
+
+
+def _json_upload(entry):
+    """(data, filename) from a JSON object with ``text`` or a base64 ``file``"""
+    if not isinstance(entry, dict):
+        raise HTTPError(400, "Each upload must be a JSON object")
+    if isinstance(entry.get('text'), str):
+        # Pasted text is always parsed as plain text, whatever it is called
+        filename = entry.get('filename') if isinstance(entry.get('filename'), str) else 'resume'
+        if not filename.lower().endswith('.txt'):
+            filename += '.txt'
+        return entry['text'].encode('utf-8'), filename
+    if isinstance(entry.get('file'), str):
+        filename = entry.get('filename')
+        if not isinstance(filename, str) or not filename:
+            raise HTTPError(400, "'filename' is required with 'file'")
+        try:
+            return base64.b64decode(entry['file'], validate=True), filename
+        except (binascii.Error, ValueError):
+            raise HTTPError(400, f"'file' of {filename} is not valid base64")
+    raise HTTPError(400, "Uploads need 'text' or 'file'")
+
+
+def _check_filename(filename):
+    if not isinstance(filename, str) or not filename.lower().endswith(SUPPORTED_EXTENSIONS):
+        raise HTTPError(415, f"Unsupported file type: {filename} (expected {', '.join(SUPPORTED_EXTENSIONS)})")
+    return os.path.basename(filename)
+
+
+def _check_options(role, job_description):
+    if role is not None and not isinstance(role, (str, dict)):
+        raise HTTPError(400, "'role' must be a role name or an object of skill lists")
+    if job_description is not None and not isinstance(job_description, str):
+        raise HTTPError(400, "'job_description' must be a string")
+    if isinstance(role, dict):
+        if not isinstance(role.get('name', ""), str):
+            raise HTTPError(400, "'role.name' must be a string")
+        for key in ('required_skills', 'preferred_skills'):
+            skills = role.get(key, [])
+            if not isinstance(skills, list) or not all(isinstance(skill, str) and skill.strip() for skill in skills):
+                raise HTTPError(400, f"'role.{key}' must be a list of non-empty strings")
+    try:
+        resolve_role(role)
+    except (ValueError, AttributeError, TypeError) as e:
+        raise HTTPError(400, str(e))
+
+
+def parse_analyze_request(request):
+    """(data, filename, role, job_description) from a JSON or raw-bytes upload
+
+    JSON bodies carry either ``text`` or a base64 ``file`` with its
+    ``filename``, plus optional ``role`` (a role name or a dict of skill
+    lists) and ``job_description``. Any other body is the file itself, named
+    by the ``filename`` query parameter; ``role`` and ``job_description``
+    then come from the query string too.
+    """
+    payload = _json_body(request)
+    if payload is not None:
+        data, filename = _json_upload(payload)
+        role = payload.get('role')
+        job_description = payload.get('job_description')
+    else:
+        filename = _query_value(request.query, 'filename') or request.headers.get('x-filename')
+        if not filename:
+            raise HTTPError(400, "Raw uploads need a 'filename' query parameter")
+        data = request.body
+        role = _query_value(request.query, 'role')
+        job_description = _query_value(request.query, 'job_description')
+    filename = _check_filename(filename)
+    _check_options(role, job_description)
+    return data, filename, role, job_description
+
+
+def parse_job_request(request, limits=None):
+    """(items, role, job_description) from a JSON job submission
+
+    The body is ``{"files": [...], "role": ..., "job_description": ...}``
+    where each file is an upload object as accepted by ``/analyze``. Each
+    file must be within the byte limit of ``limits`` (default: from the
+    environment), or the job is rejected with 413.
+    """
+    limits = limits or UploadLimits.from_env()
+    payload = _json_body(request)
+    if payload is None:
+        raise HTTPError(415, "Job submissions must be application/json")
+    files = payload.get('files')
+    if not isinstance(files, list) or not files:
+        raise HTTPError(400, "'files' must be a non-empty list")
+    items = []
+    for entry in files:
+        data, filename = _json_upload(entry)
+        try:
+            limits.check_size(len(data), filename)
+        except UploadTooLarge as e:
+            raise HTTPError(413, str(e))
+        items.append((_check_filename(filename), data))
+    role = payload.get('role')
+    job_description = payload.get('job_description')
+    _check_options(role, job_description)
+    return items, role, job_description
+
+
+class ScoringService:
+    """HTTP front end over a process pool of analyzers
+
+    At most ``max_pending`` requests are admitted at once, counting those
+    still uploading, waiting for a worker and being scored; a worker keeps
+    its slot until it finishes, even when the client was already answered
+    with a timeout. With ``jobs_db`` set, bulk jobs submitted to ``/jobs``
+    are stored there and scored by a background thread on the same pool,
+    at most ``workers`` items at a time. A job submission holds a slot too
+    while it is read, parsed and stored, which happens off the event loop.
+    """
+
+    def __init__(self, workers=None, max_pending=None, max_body_bytes=DEFAULT_MAX_BODY_BYTES,
+                 timeout=DEFAULT_TIMEOUT, cache_dir=None, jobs_db=None, max_job_bytes=DEFAULT_MAX_JOB_BYTES):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * PENDING_PER_WORKER
+        self.max_body_bytes = max_body_bytes
+        self.timeout = timeout
+        self.cache_dir = cache_dir
+        self.pending = 0
+        self.served = 0
+        self.rejected = 0
+        self.max_job_bytes = max_job_bytes
+        self.upload_limits = UploadLimits.from_env()
+        self.jobs = JobStore(jobs_db) if jobs_db else None
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._job_thread = None
+        self._job_stop = threading.Event()
+        self._job_wakeup = threading.Event()
+
+    def _get_pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(self.workers)
+            return self._pool
+
+    def _reset_pool(self):
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run_jobs(self):
+        """Background thread: score pending job items until the service stops"""
+        while not self._job_stop.is_set():
+            try:
+                JobRunner(self.jobs, self._get_pool(), self.workers, self.cache_dir).run_pending(self._job_stop)
+            except Exception:
+                # Typically a crashed pool; unscored items stay pending and are retried
+                logger.exception("Job runner failed")
+                self._reset_pool()
+            self._job_wakeup.wait(JOB_POLL_SECONDS)
+            self._job_wakeup.clear()
+
+    def close(self):
+        """Stop the job runner and the worker processes"""
+        if self._job_thread is not None:
+            self._job_stop.set()
+            self._job_wakeup.set()
+            self._job_thread.join()
+            self._job_thread = None
+        self._reset_pool()
+        if self.jobs is not None:
+            self.jobs.close()
+
+    def health(self):
+        """Load figures reported by ``GET /health``"""
+        return {
+            'status': 'ok',
+            'workers': self.workers,
+            'pending': self.pending,
+            'max_pending': self.max_pending,
+            'served': self.served,
+            'rejected': self.rejected
+        }
+
+    async def _read_request(self, reader):
+        """Parse the request line and headers, or return None at end of stream"""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), READ_TIMEOUT)
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            raise HTTPError(431, "Request headers too large")
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, version = lines[0].split(' ')
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+        url = urlsplit(target)
+        return Request(method.upper(), url.path, parse_qs(url.query), headers, version)
+
+    async def _read_body(self, request, reader, limit=None):
+        limit = limit or self.max_body_bytes
+        if 'chunked' in request.headers.get('transfer-encoding', '').lower():
+            raise HTTPError(411, "Chunked uploads are not supported; send Content-Length")
+        try:
+            length = int(request.headers['content-length'])
+        except (KeyError, ValueError):
+            raise HTTPError(411, "Content-Length is required")
+        if length < 0:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length > limit:
+            raise HTTPError(413, f"Upload of {length} bytes exceeds the {limit} byte limit")
+        with stage('read_body', bytes=length):
+            try:
+                request.body = await asyncio.wait_for(reader.readexactly(length), READ_TIMEOUT)
+            except asyncio.TimeoutError:
+                raise HTTPError(408, "Timed out reading the request body")
+
+    def _admit(self):
+        """Take a pending slot, or answer 429 when all are taken"""
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPError(429, "Too many requests in flight", {'Retry-After': '1'})
+        self.pending += 1
+
+    def _release(self, _future=None):
+        self.pending -= 1
+
+    async def _analyze(self, request, reader):
+        self._admit()
+        scheduled = False
+        try:
+            with trace('service', path=request.path):
+                await self._read_body(request, reader)
+                data, filename, role, job_description = parse_analyze_request(request)
+                loop = asyncio.get_running_loop()
+                job = partial(analyze_upload, data, filename, role, job_description, self.cache_dir)
+                with stage('score', bytes=len(data)):
+                    future = loop.run_in_executor(self._get_pool(), job)
+                    # The slot is held until the worker is done, not until the client is answered
+                    future.add_done_callback(self._release)
+                    scheduled = True
+                    try:
+                        report = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+                    except asyncio.TimeoutError:
+                        raise HTTPError(504, f"Scoring took longer than {self.timeout:g} s")
+                    except BrokenProcessPool:
+                        self._reset_pool()
+                        raise HTTPError(503, "Worker pool crashed; retry the request", {'Retry-After': '1'})
+                    except ExtractionFailure as e:
+                        raise HTTPError(422, f"Could not read {filename} ({e.kind}): {e}")
+                    except Exception as e:
+                        raise HTTPError(422, f"Could not analyze {filename}: {type(e).__name__}: {e}")
+        finally:
+            if not scheduled:
+                self._release()
+        if report is None:
+            raise HTTPError(422, "No text could be extracted from the file")
+        self.served += 1
+        return 200, report
+
+    def _submit_job(self, request):
+        """Parse and store a job submission; runs in a thread"""
+        items, role, job_description = parse_job_request(request, self.upload_limits)
+        return self.jobs.submit(items, role, job_description), len(items)
+
+    def _job_progress(self, job_id):
+        try:
+            return self.jobs.progress(job_id)
+        except KeyError:
+            raise HTTPError(404, f"No such job: {job_id}")
+
+    async def _jobs(self, request, reader):
+        """``/jobs``, ``/jobs/<id>`` and ``/jobs/<id>/results``"""
+        if self.jobs is None:
+            raise HTTPError(404, "Jobs are disabled; start the service with --jobs-db")
+        parts = request.path.strip('/').split('/')
+        if len(parts) == 1:
+            if request.method == 'GET':
+                return 200, [progress.to_dict() for progress in self.jobs.list_jobs()]
+            if request.method != 'POST':
+                raise HTTPError(405, "Use GET or POST", {'Allow': 'GET, POST'})
+            self._admit()
+            try:
+                await self._read_body(request, reader, self.max_job_bytes)
+                # Decoding and storing a large job would stall every other request on the loop
+                job_id, total = await asyncio.get_running_loop().run_in_executor(None, self._submit_job, request)
+            finally:
+                self._release()
+            self._job_wakeup.set()
+            return 202, {'job_id': job_id, 'total': total, 'status': f"/jobs/{job_id}", 'results': f"/jobs/{job_id}/results"}
+        job_id = parts[1]
+        if len(parts) == 2:
+            if request.method == 'DELETE':
+                self._job_progress(job_id)
+                self.jobs.cancel(job_id)
+                return 200, self._job_progress(job_id).to_dict()
+            if request.method != 'GET':
+                raise HTTPError(405, "Use GET or DELETE", {'Allow': 'GET, DELETE'})
+            return 200, self._job_progress(job_id).to_dict()
+        if len(parts) == 3 and parts[2] == 'results':
+            if request.method != 'GET':
+                raise HTTPError(405, "Use GET", {'Allow': 'GET'})
+            self._job_progress(job_id)
+            try:
+                after = int(_query_value(request.query, 'after') or 0)
+                limit = min(int(_query_value(request.query, 'limit') or 100), 1000)
+            except ValueError:
+                raise HTTPError(400, "'after' and 'limit' must be integers")
+            status = _query_value(request.query, 'status')
+            if status not in (None, 'done', 'failed'):
+                raise HTTPError(400, "'status' must be 'done' or 'failed'")
+            records, next_after = self.jobs.results(job_id, after, limit, status)
+            return 200, {'records': records, 'next_after': next_after}
+        raise HTTPError(404, f"No such endpoint: {request.path}")
+
+    async def handle(self, request, reader):
+        """Route a request to (status, JSON-serializable body or text)"""
+        if request.path == '/analyze':
+            if request.method != 'POST':
+                raise HTTPError(405, "Use POST", {'Allow': 'POST'})
+            return await self._analyze(request, reader)
+        if request.path == '/jobs' or request.path.startswith('/jobs/'):
+            return await self._jobs(request, reader)
+        if request.path == '/health':
+            if request.method != 'GET':
+                raise HTTPError(405, "Use GET", {'Allow': 'GET'})
+            return 200, self.health()
+        if request.path == '/metrics':
+            if request.method != 'GET':
+                raise HTTPError(405, "Use GET", {'Allow': 'GET'})
+            return 200, default_registry().render_prometheus()
+        raise HTTPError(404, f"No such endpoint: {request.path}")
+
+    async def _respond(self, writer, status, body, headers=None, keep_alive=True):
+        status = HTTPStatus(status)
+        if isinstance(body, str):
+            payload, content_type = body.encode('utf-8'), 'text/plain; version=0.0.4; charset=utf-8'
+        else:
+            payload, content_type = json.dumps(body).encode('utf-8'), 'application/json'
+        lines = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(payload)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + payload)
+        await writer.drain()
+
+    async def handle_connection(self, reader, writer):
+        """Serve requests on one connection until it closes"""
+        try:
+            while True:
+                request = None
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    status, body = await self.handle(request, reader)
+                    headers = {}
+                except HTTPError as e:
+                    status, body, headers = e.status, {'error': e.message}, e.headers
+                keep_alive = request is not None and request.keep_alive
+                # An unread body would be parsed as the next request
+                if request is not None and request.body is None and request.headers.get('content-length', '0') != '0':
+                    keep_alive = False
+                await self._respond(writer, status, body, headers, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            # The client went away or stalled mid-request
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=8000):
+        """Start listening and return the asyncio server"""
+        self._get_pool()
+        if self.jobs is not None and self._job_thread is None:
+            self._job_stop.clear()
+            self._job_thread = threading.Thread(target=self._run_jobs, name='job-runner', daemon=True)
+            self._job_thread.start()
+        return await asyncio.start_server(self.handle_connection, host, port, limit=DEFAULT_MAX_HEADER_BYTES)
+
+    async def serve_forever(self, host='127.0.0.1', port=8000):
+        """Listen until cancelled or sent SIGTERM"""
+        server = await self.start(host, port)
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        except (NotImplementedError, RuntimeError):
+            pass  # no signal handlers on this platform or thread
+        addresses = ", ".join(f"{sock.getsockname()[0]}:{sock.getsockname()[1]}" for sock in server.sockets)
+        print(f"Scoring service listening on {addresses} with {self.workers} workers", file=sys.stderr)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.close()
+
+
+def build_parser():
+    """Create the command-line parser"""
+    parser = argparse.ArgumentParser(description="Serve resume analysis over HTTP.")
+    parser.add_argument('--host', default='127.0.0.1', help="interface to bind (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8000, help="port to listen on (default: 8000)")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--max-pending', type=int, default=None,
+                        help=f"requests admitted at once before answering 429 (default: {PENDING_PER_WORKER} per worker)")
+    parser.add_argument('--max-body-mb', type=float, default=DEFAULT_MAX_BODY_BYTES / (1024 * 1024),
+                        help="largest accepted upload in MB (default: 10)")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help="seconds to wait for a worker (default: 60)")
+    parser.add_argument('--cache-dir', help="reuse results for identical uploads from this cache directory")
+    parser.add_argument('--jobs-db', help="SQLite database that enables bulk jobs at /jobs (created if missing)")
+    parser.add_argument('--max-job-mb', type=float, default=DEFAULT_MAX_JOB_BYTES / (1024 * 1024),
+                        help="largest accepted job submission in MB (default: 256)")
+    parser.add_argument('--log-metrics', action='store_true', help="write per-request timings to stderr as JSON lines")
+    return parser
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    args = build_parser().parse_args(argv)
+    if args.log_metrics:
+        enable_log_lines()
+    service = ScoringService(
+        workers=args.workers,
+        max_pending=args.max_pending,
+        max_body_bytes=int(args.max_body_mb * 1024 * 1024),
+        timeout=args.timeout,
+        cache_dir=args.cache_dir,
+        jobs_db=args.jobs_db,
+        max_job_bytes=int(args.max_job_mb * 1024 * 1024)
+    )
+    try:
+        asyncio.run(service.serve_forever(args.host, args.port))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,358 @@
+"""
+Inverted index and boolean search over analyzed resumes.
+
+Each normalized skill, action verb and seniority keyword found at analysis
+time maps to a posting list of the resumes that contain it. Posting lists
+are stored as delta-encoded varints and decoded with NumPy, so a query such
+as ``python AND kubernetes AND NOT intern`` over a large corpus is a handful
+of sorted-array intersections (NumPy is imported on first query, so
+processes that only collect index terms do not load it)::
+
+    python -m resume_analyzer.skill_index index.pkl "python AND (aws OR gcp) AND NOT intern"
+"""
+
+import argparse
+import os
+import pickle
+import re
+import sys
+import tempfile
+
+from .data import JUNIOR_KEYWORDS, SENIOR_KEYWORDS
+from .matcher import default_matcher, find_terms, normalize_term
+
+# Bump whenever the on-disk layout changes
+INDEX_VERSION = 1
+
+# Parentheses, "quoted phrases" or bare words
+_TOKEN_PATTERN = re.compile(r'\(|\)|"[^"]*"|[^\s()"]+')
+_OPERATORS = {'AND', 'OR', 'NOT'}
+
+
+def encode_varint(value, out):
+    """Append a non-negative integer to ``out`` as a little-endian base-128 varint"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def encode_postings(doc_ids):
+    """Encode sorted document ids as varint deltas"""
+    out = bytearray()
+    previous = 0
+    for doc_id in doc_ids:
+        encode_varint(doc_id - previous, out)
+        previous = doc_id
+    return out
+
+
+def decode_postings(blob):
+    """Decode a varint delta posting list into a sorted int64 array"""
+    import numpy as np
+
+    data = np.frombuffer(bytes(blob), dtype=np.uint8)
+    if not len(data):
+        return np.empty(0, dtype=np.int64)
+    last_byte = data < 0x80
+    starts = np.flatnonzero(np.concatenate(([True], last_byte[:-1])))
+    # Position of every byte within its varint gives its 7-bit shift
+    varint_of_byte = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, len(data))))
+    shifts = (np.arange(len(data)) - starts[varint_of_byte]) * 7
+    deltas = np.add.reduceat((data & 0x7F).astype(np.int64) << shifts, starts)
+    return np.cumsum(deltas)
+
+
+def index_terms(report):
+    """Normalized terms a report is indexed under
+
+    Skills found in the resume, matched role skills, the action verbs that
+    open its lines and any seniority keywords (such as 'intern' or 'lead').
+    """
+    terms = set(report.found_skills)
+    terms.update(report.keyword_match['matched_required'])
+    terms.update(report.keyword_match['matched_preferred'])
+    terms.update(verb for verb, _ in report.action_usage)
+    if report.text:
+        terms |= find_terms(report.text.lower(), JUNIOR_KEYWORDS + SENIOR_KEYWORDS)
+    canonical = default_matcher().canonical
+    return {canonical(term) for term in terms}
+
+
+def tokenize_query(query):
+    """Split a query into operators, parentheses and normalized terms
+
+    Returns (kind, value) pairs where kind is 'op', 'paren' or 'term'.
+    Operators are case-insensitive; quote multi-word terms ("machine learning").
+    Skill aliases ("k8s") are replaced by the skill they stand for.
+    """
+    canonical = default_matcher().canonical
+    tokens = []
+    for raw in _TOKEN_PATTERN.findall(query):
+        if raw in '()':
+            tokens.append(('paren', raw))
+        elif raw.startswith('"'):
+            tokens.append(('term', canonical(raw.strip('"'))))
+        elif raw.upper() in _OPERATORS:
+            tokens.append(('op', raw.upper()))
+        else:
+            tokens.append(('term', canonical(raw)))
+    return tokens
+
+
+class _QueryParser:
+    """Recursive-descent parser producing a nested tuple tree
+
+    Grammar (NOT binds tightest, adjacent terms are ANDed)::
+
+        or_expr  := and_expr ('OR' and_expr)*
+        and_expr := not_expr (['AND'] not_expr)*
+        not_expr := 'NOT' not_expr | '(' or_expr ')' | term
+    """
+
+    def __init__(self, query):
+        self.query = query
+        self.tokens = tokenize_query(query)
+        self.position = 0
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def _take(self):
+        token = self._peek()
+        self.position += 1
+        return token
+
+    def _error(self, message):
+        return ValueError(f"Invalid query {self.query!r}: {message}")
+
+    def parse(self):
+        if not self.tokens:
+            raise self._error("query is empty")
+        tree = self._or_expr()
+        if self.position < len(self.tokens):
+            raise self._error(f"unexpected {self._peek()[1]!r}")
+        return tree
+
+    def _or_expr(self):
+        operands = [self._and_expr()]
+        while self._peek() == ('op', 'OR'):
+            self._take()
+            operands.append(self._and_expr())
+        return operands[0] if len(operands) == 1 else ('or', operands)
+
+    def _and_expr(self):
+        operands = [self._not_expr()]
+        while True:
+            kind, value = self._peek()
+            if (kind, value) == ('op', 'AND'):
+                self._take()
+            elif not (kind == 'term' or (kind, value) in (('op', 'NOT'), ('paren', '('))):
+                break
+            operands.append(self._not_expr())
+        return operands[0] if len(operands) == 1 else ('and', operands)
+
+    def _not_expr(self):
+        kind, value = self._take()
+        if (kind, value) == ('op', 'NOT'):
+            return ('not', self._not_expr())
+        if (kind, value) == ('paren', '('):
+            tree = self._or_expr()
+            if self._take() != ('paren', ')'):
+                raise self._error("missing ')'")
+            return tree
+        if kind == 'term':
+            return ('term', value)
+        raise self._error("unexpected end of query" if kind is None else f"unexpected {value!r}")
+
+
+def parse_query(query):
+    """Parse a boolean query into a tree of ('and'|'or', [...]), ('not', x) and ('term', t)"""
+    return _QueryParser(query).parse()
+
+
+class SkillIndex:
+    """Inverted index from normalized terms to resume ids
+
+    Resumes are added incrementally; adding an id again replaces its earlier
+    entry. Internally every add gets the next integer document number, so
+    posting lists only ever grow at the end and stay sorted.
+    """
+
+    def __init__(self):
+        self._doc_ids = []      # document number -> resume id
+        self._current = {}      # resume id -> live document number
+        self._postings = {}     # term -> bytearray of varint deltas
+        self._last = {}         # term -> last document number in its list
+        self._decoded = {}      # term -> (encoded length, decoded array)
+        self._live = None
+
+    def __len__(self):
+        return len(self._current)
+
+    def __contains__(self, resume_id):
+        return resume_id in self._current
+
+    @property
+    def terms(self):
+        """All indexed terms"""
+        return set(self._postings)
+
+    def add(self, resume_id, terms):
+        """Index a resume under the given terms"""
+        doc = len(self._doc_ids)
+        self._doc_ids.append(resume_id)
+        self._current[resume_id] = doc
+        self._live = None
+        for term in {normalize_term(term) for term in terms}:
+            postings = self._postings.setdefault(term, bytearray())
+            encode_varint(doc - self._last.get(term, 0), postings)
+            self._last[term] = doc
+
+    def add_report(self, resume_id, report):
+        """Index an analysis report under the terms found at analysis time"""
+        self.add(resume_id, index_terms(report))
+
+    def remove(self, resume_id):
+        """Drop a resume from search results"""
+        if self._current.pop(resume_id, None) is not None:
+            self._live = None
+
+    def _live_docs(self):
+        """Sorted document numbers that have not been replaced or removed"""
+        import numpy as np
+
+        if self._live is None:
+            self._live = np.fromiter(sorted(self._current.values()), dtype=np.int64, count=len(self._current))
+        return self._live
+
+    def postings(self, term):
+        """Sorted document numbers (including replaced ones) indexed under a term"""
+        import numpy as np
+
+        term = normalize_term(term)
+        blob = self._postings.get(term)
+        if blob is None:
+            return np.empty(0, dtype=np.int64)
+        cached = self._decoded.get(term)
+        if cached is None or cached[0] != len(blob):
+            cached = (len(blob), decode_postings(blob))
+            self._decoded[term] = cached
+        return cached[1]
+
+    def document_frequency(self, term):
+        """Number of live resumes indexed under a term"""
+        import numpy as np
+
+        return len(np.intersect1d(self.postings(term), self._live_docs(), assume_unique=True))
+
+    def _evaluate(self, node):
+        import numpy as np
+
+        kind, value = node
+        if kind == 'term':
+            return self.postings(value)
+        if kind == 'not':
+            return np.setdiff1d(self._live_docs(), self._evaluate(value), assume_unique=True)
+        if kind == 'or':
+            result = self._evaluate(value[0])
+            for operand in value[1:]:
+                result = np.union1d(result, self._evaluate(operand))
+            return result
+        # AND: intersect the positive operands smallest first, then subtract
+        # the negated ones instead of materializing their complements
+        positives = [operand for operand in value if operand[0] != 'not']
+        negatives = [operand[1] for operand in value if operand[0] == 'not']
+        arrays = sorted((self._evaluate(operand) for operand in positives), key=len)
+        result = arrays[0] if arrays else self._live_docs()
+        for array in arrays[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, array, assume_unique=True)
+        for operand in negatives:
+            if not len(result):
+                break
+            result = np.setdiff1d(result, self._evaluate(operand), assume_unique=True)
+        return result
+
+    def search_docs(self, query):
+        """Live document numbers matching a boolean query"""
+        import numpy as np
+
+        tree = parse_query(query) if isinstance(query, str) else query
+        return np.intersect1d(self._evaluate(tree), self._live_docs(), assume_unique=True)
+
+    def search(self, query, limit=None):
+        """Resume ids matching a boolean query, in the order they were added"""
+        docs = self.search_docs(query)
+        if limit is not None:
+            docs = docs[:limit]
+        return [self._doc_ids[doc] for doc in docs]
+
+    def count(self, query):
+        """Number of resumes matching a boolean query"""
+        return len(self.search_docs(query))
+
+    def save(self, path):
+        """Write the index to ``path`` atomically"""
+        state = {
+            'version': INDEX_VERSION,
+            'doc_ids': self._doc_ids,
+            'current': self._current,
+            'postings': {term: bytes(blob) for term, blob in self._postings.items()},
+            'last': self._last
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Read an index written by ``save``"""
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        if state.get('version') != INDEX_VERSION:
+            raise ValueError(f"Unsupported index version {state.get('version')!r} in {path}")
+        index = cls()
+        index._doc_ids = state['doc_ids']
+        index._current = state['current']
+        index._postings = {term: bytearray(blob) for term, blob in state['postings'].items()}
+        index._last = state['last']
+        return index
+
+    @classmethod
+    def open(cls, path):
+        """Load ``path`` if it exists, otherwise start an empty index"""
+        return cls.load(path) if os.path.exists(path) else cls()
+
+
+def build_parser():
+    """Create the command-line parser"""
+    parser = argparse.ArgumentParser(description="Search a skill index written by the batch scorer.")
+    parser.add_argument('index', help="index file (see --index in resume_analyzer.batch)")
+    parser.add_argument('query', help='boolean query, e.g. \'python AND "machine learning" AND NOT intern\'')
+    parser.add_argument('-n', '--limit', type=int, default=None, help="print at most this many resume ids")
+    parser.add_argument('--count', action='store_true', help="print only the number of matches")
+    return parser
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    args = build_parser().parse_args(argv)
+    try:
+        index = SkillIndex.load(args.index)
+        if args.count:
+            print(index.count(args.query))
+        else:
+            for resume_id in index.search(args.query, args.limit):
+                print(resume_id)
+    except (OSError, ValueError) as e:
+        print(e, file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
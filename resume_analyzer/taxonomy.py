@@ -0,0 +1,325 @@
+"""
+Skills taxonomy: the skills, job roles and action verbs the analyzers match.
+
+The built-in tables in ``data`` are used unless ``RESUME_ANALYZER_TAXONOMY``
+names a JSON or CSV file:
+
+- JSON: ``{"tech_skills": {category: [skill, ...]}, "job_roles": {role:
+  {"required_skills": [...], "preferred_skills": [...]}}, "action_verbs":
+  {category: [verb, ...]}, "skill_aliases": {alias: skill}}``
+- CSV: a ``kind,group,term`` header, then one term per row. ``kind`` is
+  ``skill`` or ``verb`` (``group`` is the category), ``required`` or
+  ``preferred`` (``group`` is the role), or ``alias`` (``group`` is the
+  skill the alias stands for).
+
+A section missing from the file falls back to the built-in table.
+
+Compiling tens of thousands of terms takes seconds, so the compiled
+taxonomy (tables plus matcher trie) is pickled to a cache directory under
+the SHA-256 of the file, and every later process loads that artifact
+instead. The file is checked for changes at most once a second. The first
+caller to see a change compiles it and swaps it in with a single reference
+assignment, so Streamlit servers and batch workers pick it up without a
+restart, and analyses already running finish on the taxonomy they started
+with::
+
+    python -m resume_analyzer.taxonomy skills.csv    # compile and cache before deploying
+"""
+
+import argparse
+import csv
+import gc
+import hashlib
+import io
+import json
+import logging
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+from .data import ACTION_VERBS, JOB_ROLES, SKILL_ALIASES, TECH_SKILLS
+from .matcher import TermMatcher, normalize_term
+
+# Bump whenever the pickled layout of Taxonomy or TermMatcher changes
+ARTIFACT_VERSION = 2
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.resume_analyzer', 'taxonomy')
+
+# Seconds between checks of the taxonomy file for changes
+RELOAD_CHECK_SECONDS = 1.0
+
+logger = logging.getLogger(__name__)
+
+
+class Taxonomy:
+    """Skills, roles, action verbs and skill aliases, plus the matcher and lookups compiled from them"""
+
+    def __init__(self, tech_skills=TECH_SKILLS, job_roles=JOB_ROLES, action_verbs=ACTION_VERBS,
+                 skill_aliases=SKILL_ALIASES, version='builtin'):
+        self.tech_skills = tech_skills
+        self.job_roles = job_roles
+        self.action_verbs = action_verbs
+        self.skill_aliases = skill_aliases
+        self.version = version
+        self.action_verbs_all = [verb for verbs in action_verbs.values() for verb in verbs]
+        self.action_verb_terms = frozenset(normalize_term(verb) for verb in self.action_verbs_all)
+
+        # Every (category, skill) in table order, and the positions of each
+        # normalized skill in it, so found skills are looked up per match
+        # instead of scanning the whole table
+        self.skill_table = [(category, skill) for category, skills in tech_skills.items() for skill in skills]
+        self.skill_positions = {}
+        for position, (_, skill) in enumerate(self.skill_table):
+            self.skill_positions.setdefault(normalize_term(skill), []).append(position)
+
+        terms = set(self.skill_positions)
+        for role in job_roles.values():
+            terms.update(role['required_skills'])
+            terms.update(role['preferred_skills'])
+        terms.update(self.action_verbs_all)
+        self.matcher = TermMatcher(terms, skill_aliases)
+
+    def __repr__(self):
+        return f"Taxonomy(version={self.version[:12]!r}, terms={len(self.matcher.terms)}, roles={len(self.job_roles)})"
+
+
+@lru_cache(maxsize=1)
+def builtin_taxonomy():
+    """Taxonomy of the built-in tables in ``data``"""
+    return Taxonomy()
+
+
+def _parse_json(text):
+    tables = json.loads(text)
+    if not isinstance(tables, dict):
+        raise ValueError("taxonomy JSON must be an object")
+    tech_skills = tables.get('tech_skills')
+    job_roles = tables.get('job_roles')
+    action_verbs = tables.get('action_verbs')
+    skill_aliases = tables.get('skill_aliases')
+    sections = (
+        ('tech_skills', tech_skills), ('job_roles', job_roles), ('action_verbs', action_verbs), ('skill_aliases', skill_aliases)
+    )
+    for name, section in sections:
+        if section is not None and not isinstance(section, dict):
+            raise ValueError(f"taxonomy section {name!r} must be an object")
+    if job_roles is not None:
+        if not all(isinstance(skills, dict) for skills in job_roles.values()):
+            raise ValueError("each job role must be an object with required_skills and preferred_skills")
+        job_roles = {
+            role: {
+                'required_skills': skills.get('required_skills', []),
+                'preferred_skills': skills.get('preferred_skills', [])
+            }
+            for role, skills in job_roles.items()
+        }
+    return tech_skills, job_roles, action_verbs, skill_aliases
+
+
+def _parse_csv(text):
+    tech_skills = {}
+    job_roles = {}
+    action_verbs = {}
+    skill_aliases = {}
+    reader = csv.DictReader(io.StringIO(text), strict=True)
+    if not reader.fieldnames or not {'kind', 'group', 'term'} <= set(reader.fieldnames):
+        raise ValueError("taxonomy CSV needs a kind,group,term header")
+    for line, row in enumerate(reader, start=2):
+        kind = (row['kind'] or "").strip().lower()
+        group = (row['group'] or "").strip()
+        term = (row['term'] or "").strip()
+        if not term:
+            continue
+        if kind == 'skill':
+            tech_skills.setdefault(group, []).append(term)
+        elif kind == 'verb':
+            action_verbs.setdefault(group, []).append(term)
+        elif kind in ('required', 'preferred'):
+            role = job_roles.setdefault(group, {'required_skills': [], 'preferred_skills': []})
+            role[f'{kind}_skills'].append(term)
+        elif kind == 'alias':
+            skill_aliases[term] = group
+        else:
+            raise ValueError(f"line {line}: unknown kind {row['kind']!r}")
+    return tech_skills or None, job_roles or None, action_verbs or None, skill_aliases or None
+
+
+def _check_terms(section, group, terms):
+    if not isinstance(terms, list) or not all(isinstance(term, str) and term.strip() for term in terms):
+        raise ValueError(f"taxonomy {section} {group!r} must be a list of non-empty strings")
+
+
+def _check_tables(tech_skills, job_roles, action_verbs, skill_aliases):
+    """Raise ValueError unless every section holds strings where the Taxonomy expects them"""
+    for section, table in (('tech_skills', tech_skills), ('action_verbs', action_verbs)):
+        for group, terms in (table or {}).items():
+            _check_terms(section, group, terms)
+    for role, skills in (job_roles or {}).items():
+        _check_terms('job_roles', role, skills['required_skills'])
+        _check_terms('job_roles', role, skills['preferred_skills'])
+    for alias, skill in (skill_aliases or {}).items():
+        if not isinstance(skill, str) or not skill.strip():
+            raise ValueError(f"taxonomy skill_aliases {alias!r} must name a skill")
+
+
+def parse_taxonomy(data, filename):
+    """Taxonomy built from the bytes of a JSON or CSV file
+
+    Raises ValueError for a file that is malformed or has the wrong shape.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    text = data.decode('utf-8-sig')
+    if extension == '.json':
+        tables = _parse_json(text)
+    elif extension == '.csv':
+        try:
+            tables = _parse_csv(text)
+        except csv.Error as e:
+            raise ValueError(f"taxonomy CSV: {e}") from e
+    else:
+        raise ValueError(f"Unsupported taxonomy format: {extension or filename}")
+    _check_tables(*tables)
+    tech_skills, job_roles, action_verbs, skill_aliases = tables
+    return Taxonomy(
+        tech_skills if tech_skills is not None else TECH_SKILLS,
+        job_roles if job_roles is not None else JOB_ROLES,
+        action_verbs if action_verbs is not None else ACTION_VERBS,
+        skill_aliases if skill_aliases is not None else SKILL_ALIASES,
+        version=hashlib.sha256(data).hexdigest()
+    )
+
+
+def _load_artifact(path):
+    # Unpickling a large trie allocates millions of objects; collection passes
+    # in the middle of it would double the load time
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+        return None
+    finally:
+        if collecting:
+            gc.enable()
+
+
+def _save_artifact(path, taxonomy):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(taxonomy, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not cache compiled taxonomy at %s: %s", path, e)
+
+
+def load_taxonomy(path, cache_dir=None):
+    """Taxonomy for a JSON or CSV file, from its compiled artifact when one is cached"""
+    cache_dir = cache_dir or os.environ.get('RESUME_ANALYZER_TAXONOMY_CACHE') or DEFAULT_CACHE_DIR
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    artifact = os.path.join(cache_dir, f"taxonomy-v{ARTIFACT_VERSION}-{digest}.pkl")
+    taxonomy = _load_artifact(artifact)
+    if isinstance(taxonomy, Taxonomy) and taxonomy.version == digest:
+        return taxonomy
+    taxonomy = parse_taxonomy(data, path)
+    _save_artifact(artifact, taxonomy)
+    return taxonomy
+
+
+@dataclass(frozen=True)
+class _Loaded:
+    path: str
+    signature: tuple
+    taxonomy: Taxonomy
+    next_check: float
+
+
+_loaded = None
+_reload_lock = threading.Lock()
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def current_taxonomy():
+    """The taxonomy in effect now
+
+    With ``RESUME_ANALYZER_TAXONOMY`` set, the file is re-checked at most
+    every ``RELOAD_CHECK_SECONDS``. While one thread compiles a changed
+    file, the others keep getting the previous taxonomy. A file that fails
+    to load keeps the previous taxonomy in place; only the first load
+    raises.
+    """
+    global _loaded
+    path = os.environ.get('RESUME_ANALYZER_TAXONOMY')
+    if not path:
+        return builtin_taxonomy()
+    loaded = _loaded
+    if loaded is not None and loaded.path == path and time.monotonic() < loaded.next_check:
+        return loaded.taxonomy
+    usable = loaded is not None and loaded.path == path
+    if not _reload_lock.acquire(blocking=not usable):
+        return loaded.taxonomy
+    try:
+        loaded = _loaded
+        usable = loaded is not None and loaded.path == path
+        signature = None
+        try:
+            signature = _signature(path)
+            if usable and signature == loaded.signature:
+                taxonomy = loaded.taxonomy
+            else:
+                taxonomy = load_taxonomy(path)
+                if usable:
+                    logger.info("Taxonomy %s reloaded: %r", path, taxonomy)
+        except Exception as e:
+            if not usable:
+                raise
+            logger.warning("Keeping the current taxonomy; %s failed to load: %s", path, e)
+            # Not retried until the file changes again
+            signature, taxonomy = signature or loaded.signature, loaded.taxonomy
+        _loaded = _Loaded(path, signature, taxonomy, time.monotonic() + RELOAD_CHECK_SECONDS)
+        return taxonomy
+    finally:
+        _reload_lock.release()
+
+
+def build_parser():
+    """Create the command-line parser"""
+    parser = argparse.ArgumentParser(description="Compile a skills taxonomy file and cache the result.")
+    parser.add_argument('path', help="taxonomy file (.json or .csv)")
+    parser.add_argument('--cache-dir', help="artifact directory (default: ~/.resume_analyzer/taxonomy)")
+    return parser
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    args = build_parser().parse_args(argv)
+    start = time.perf_counter()
+    try:
+        taxonomy = load_taxonomy(args.path, args.cache_dir)
+    except (OSError, ValueError) as e:
+        print(f"Could not load {args.path}: {e}", file=sys.stderr)
+        return 1
+    skills = sum(len(skills) for skills in taxonomy.tech_skills.values())
+    print(
+        f"{args.path}: {skills} skills, {len(taxonomy.matcher.aliases)} aliases, {len(taxonomy.job_roles)} roles, "
+        f"{len(taxonomy.action_verbs_all)} verbs, "
+        f"{len(taxonomy.matcher.terms)} terms in {time.perf_counter() - start:.2f} s (version {taxonomy.version[:12]})"
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,68 @@
+import os
+import subprocess
+import sys
+
+from benchmarks.corpus import generate_resume
+from resume_analyzer import ResumeReport, analyze_formatting, analyze_projects, analyze_resume, calculate_ats_score
+from resume_analyzer.analysis import ANALYSIS_STAGES, iter_analysis
+from resume_analyzer.cache import ResultCache, cached_analysis_stages
+from resume_analyzer.context import AnalysisContext
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESUME = "\n".join(generate_resume(7, skill_density=0.9))
+
+
+def test_analyze_resume_scores_text_and_file_bytes_alike():
+    report = analyze_resume(RESUME, 'Data Scientist')
+    assert isinstance(report, ResumeReport)
+    assert report.role == 'Data Scientist'
+    assert 0 <= report.ats_score <= 100
+    assert report.verdict in ("HIRE", "BORDERLINE", "REJECT")
+    assert report.found_skills and report.suggestions is not None
+    from_bytes = analyze_resume(RESUME.encode('utf-8'), 'Data Scientist', filename='cv.txt')
+    assert from_bytes.to_dict() == report.to_dict()
+
+
+def test_engine_imports_without_streamlit():
+    code = "import sys, resume_analyzer; resume_analyzer.analyze_resume('Python developer'); print('streamlit' in sys.modules)"
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+
+def test_analyzers_share_the_document_context():
+    ctx = AnalysisContext(RESUME)
+    projects = analyze_projects(ctx)
+    keyword_match = {'matched_required': [], 'missing_required': [], 'matched_preferred': [], 'missing_preferred': []}
+    score = calculate_ats_score(ctx, keyword_match, analyze_formatting(ctx)[0])
+    # The ATS score reused the memoized project analysis instead of running it again
+    assert ctx.results[('analyze_projects',)] is projects
+    assert analyze_projects(RESUME) == projects
+    assert calculate_ats_score(RESUME, keyword_match, analyze_formatting(RESUME)[0]) == score
+
+
+def test_iter_analysis_streams_stages_in_order_to_the_full_report():
+    job_description = "Looking for a Python engineer with SQL, AWS and machine learning experience."
+    for jd in (None, job_description):
+        seen = []
+        for name, report in iter_analysis(RESUME, 'Data Scientist', job_description=jd):
+            if name == 'score':
+                # The score card is ready before the slower sections
+                assert report.verdict is not None and not report.bullet_improvements
+            seen.append(name)
+        expected = [name for name in ANALYSIS_STAGES if jd or name != 'jd_similarity']
+        assert seen == expected
+        assert report.to_dict() == analyze_resume(RESUME, 'Data Scientist', job_description=jd).to_dict()
+
+
+def test_streamed_report_is_cached_once_complete():
+    cache = ResultCache()
+    data = RESUME.encode('utf-8')
+    stages = list(cached_analysis_stages(data, 'cv.txt', cache=cache))
+    assert [name for name, _ in stages] == [name for name in ANALYSIS_STAGES if name != 'jd_similarity']
+    again = list(cached_analysis_stages(data, 'cv.txt', cache=cache))
+    assert [name for name, _ in again] == ['report']
+    assert again[0][1].to_dict() == stages[-1][1].to_dict()
+    # A generator abandoned part-way caches nothing
+    partial = ResultCache()
+    next(cached_analysis_stages(data, 'cv.txt', cache=partial))
+    assert [name for name, _ in cached_analysis_stages(data, 'cv.txt', cache=partial)][0] == 'keywords'
@@ -0,0 +1,53 @@
+import os
+import zipfile
+
+import pytest
+
+from benchmarks.corpus import generate_resume, render_docx, render_pdf
+from resume_analyzer.archive import iter_archive_members, score_archive
+from resume_analyzer.batch import score_data
+from resume_analyzer.ingest import UploadTooLarge
+
+RESUMES = {
+    'cvs/b.txt': "\n".join(generate_resume(1)).encode('utf-8'),
+    'cvs/a.docx': render_docx(generate_resume(2)),
+    'cvs/c.pdf': render_pdf(generate_resume(3)),
+}
+
+
+@pytest.fixture
+def archive(tmp_path):
+    path = str(tmp_path / 'export.zip')
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('cvs/', b"")
+        zf.writestr('cvs/b.txt', RESUMES['cvs/b.txt'])
+        zf.writestr('__MACOSX/cvs/._b.txt', b"\x00\x05\x16\x07")
+        zf.writestr('cvs/.hidden.txt', b"not a resume")
+        zf.writestr('notes.md', b"# notes")
+        zf.writestr('cvs/a.docx', RESUMES['cvs/a.docx'])
+        # Compresses to almost nothing but decompresses past the member limit
+        zf.writestr('cvs/huge.txt', b"python " * 200_000)
+        zf.writestr('cvs/c.pdf', RESUMES['cvs/c.pdf'])
+    return path
+
+
+def test_members_are_yielded_in_archive_order_within_the_size_limit(archive):
+    members = list(iter_archive_members(archive, max_member_bytes=1024 * 1024))
+    assert [name for name, _ in members] == ['cvs/b.txt', 'cvs/a.docx', 'cvs/huge.txt', 'cvs/c.pdf']
+    for name, data in members:
+        if name == 'cvs/huge.txt':
+            assert isinstance(data, UploadTooLarge) and data.name == name
+        else:
+            assert data == RESUMES[name]
+
+
+def test_score_archive_matches_scoring_each_member(archive):
+    records = list(score_archive(archive, workers=1, max_member_bytes=1024 * 1024))
+    assert [record['path'] for record in records] == [
+        os.path.join(archive, name) for name in ('cvs/b.txt', 'cvs/a.docx', 'cvs/huge.txt', 'cvs/c.pdf')
+    ]
+    assert records[2]['error'].startswith("UploadTooLarge: cvs/huge.txt is larger than")
+    for record, name in zip(records[:2] + records[3:], ('cvs/b.txt', 'cvs/a.docx', 'cvs/c.pdf')):
+        assert record == score_data(RESUMES[name], os.path.join(archive, name))
+    parallel = list(score_archive(archive, workers=2, depth=1, max_member_bytes=1024 * 1024))
+    assert parallel == records
@@ -0,0 +1,28 @@
+import json
+
+from resume_analyzer.batch import main, run_batch, score_file
+
+
+def test_unreadable_files_become_error_records(tmp_path):
+    missing = str(tmp_path / 'missing.pdf')
+    assert score_file(missing)['error'].startswith("FileNotFoundError")
+    corrupt = tmp_path / 'corrupt.pdf'
+    corrupt.write_bytes(b"not a pdf")
+    record = score_file(str(corrupt))
+    assert record['path'] == str(corrupt) and record['failure'] == 'parse_error'
+    empty = tmp_path / 'empty.txt'
+    empty.write_bytes(b"   ")
+    assert score_file(str(empty))['error'] == "No text could be extracted"
+
+
+def test_batch_writes_one_record_per_file_in_order(tmp_path, capsys):
+    (tmp_path / 'b.txt').write_text("Python developer who built SQL pipelines", encoding='utf-8')
+    (tmp_path / 'a.pdf').write_bytes(b"broken")
+    (tmp_path / 'notes.md').write_text("ignored", encoding='utf-8')
+    out = tmp_path / 'scores.jsonl'
+    assert main([str(tmp_path), '--workers', '2', '-o', str(out)]) == 0
+    records = [json.loads(line) for line in out.read_text(encoding='utf-8').splitlines()]
+    assert [record['path'] for record in records] == [str(tmp_path / 'a.pdf'), str(tmp_path / 'b.txt')]
+    assert 'error' in records[0] and 'ats_score' in records[1]
+    assert "Scored 1 resumes, 1 failed" in capsys.readouterr().err
+    assert list(run_batch([str(tmp_path / 'b.txt')], workers=1))[0]['ats_score'] == records[1]['ats_score']
@@ -0,0 +1,50 @@
+import re
+
+import pytest
+
+from benchmarks.corpus import FORMATS, generate_corpus, generate_resume, render
+from benchmarks.run import BenchmarkResult, compare, percentile, summarize
+from resume_analyzer.extraction import extract_text
+
+
+def test_corpus_is_deterministic_for_a_seed():
+    first = generate_corpus(6, seed=3)
+    again = generate_corpus(6, seed=3)
+    assert [(d.filename, d.resume.text) for d in first] == [(d.filename, d.resume.text) for d in again]
+    assert [d.resume.text for d in generate_corpus(6, seed=4)] != [d.resume.text for d in first]
+
+
+def test_corpus_cycles_through_every_length_density_and_style():
+    documents = generate_corpus(36, formats=('txt',))
+    combinations = {(d.resume.length, d.resume.skill_density, d.resume.bullet_style) for d in documents}
+    assert len(combinations) == len(documents) == 3 * 3 * 4
+
+
+@pytest.mark.parametrize('file_format', FORMATS)
+def test_rendered_documents_extract_back_to_their_text(file_format):
+    lines = generate_resume(7, length='long')
+    extracted = extract_text(render(lines, file_format), f"cv.{file_format}")
+    # Rendering wraps long lines, moves lines across page breaks and turns
+    # bullet markers into list styles, so compare the words
+    assert sorted(re.findall(r"\w+", extracted)) == sorted(re.findall(r"\w+", "\n".join(lines)))
+
+
+def test_percentiles_use_nearest_rank():
+    values = [float(i) for i in range(1, 101)]
+    assert [percentile(values, pct) for pct in (50, 95, 99)] == [50.0, 95.0, 99.0]
+    assert percentile([], 50) == 0.0
+    result = summarize('x', [[0.002, 0.001], [0.004, 0.003]])
+    assert result.documents == 4 and result.best_p50_ms == pytest.approx(1.0)
+
+
+def _result(best_p50_ms):
+    return BenchmarkResult('pipeline', 10, 100.0, best_p50_ms, best_p50_ms, best_p50_ms, best_p50_ms)
+
+
+def test_compare_flags_slowdowns_and_changed_scores():
+    baseline = {'fingerprint': 'abc', 'calibration_ms': 10.0, 'results': [{'name': 'pipeline', 'best_p50_ms': 10.0}]}
+    assert compare([_result(10.5)], 'abc', baseline) == []
+    assert len(compare([_result(30.0)], 'abc', baseline)) == 1
+    # A machine running at half speed doubles what the baseline allows
+    assert compare([_result(19.0)], 'abc', baseline, calibration_ms=20.0) == []
+    assert compare([_result(10.0)], 'def', baseline) == ["pipeline scores for the benchmark corpus differ from the baseline"]
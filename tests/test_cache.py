@@ -0,0 +1,46 @@
+import os
+import threading
+
+from resume_analyzer.cache import DiskCache, ResultCache, cached_analyze, report_cache_key
+
+
+def test_disk_write_failures_are_not_raised(tmp_path, monkeypatch):
+    cache = DiskCache(str(tmp_path))
+
+    def disk_full(*args, **kwargs):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(os, 'replace', disk_full)
+    cache.put('key', 'value')
+    assert cache.get('key') is None
+    # The temporary file is cleaned up
+    assert not [name for _, _, names in os.walk(tmp_path) for name in names if name.endswith('.tmp')]
+
+
+def test_result_cache_counters_are_exact_across_threads():
+    cache = ResultCache()
+    cache.put('hit', 1)
+
+    def look_up():
+        for _ in range(2000):
+            cache.get('hit')
+            cache.get('miss')
+
+    threads = [threading.Thread(target=look_up) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cache.stats()['memory_hits'] == 8000
+    assert cache.stats()['misses'] == 8000
+
+
+def test_reports_are_cached_per_extraction_budget():
+    lines = ["Python developer", "Built data pipelines with SQL"] * 200
+    data = "\n".join(lines).encode('utf-8')
+    assert report_cache_key('d', 'cv.txt', max_pages=5, max_chars=100) != report_cache_key('d', 'cv.txt')
+    cache = ResultCache()
+    full = cached_analyze(data, 'cv.txt', cache=cache)
+    short = cached_analyze(data, 'cv.txt', cache=cache, max_chars=100)
+    assert short.word_count < full.word_count
+    assert cached_analyze(data, 'cv.txt', cache=cache).word_count == full.word_count
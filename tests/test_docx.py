@@ -0,0 +1,76 @@
+from io import BytesIO
+
+import docx
+from docx.enum.text import WD_BREAK
+from docx.oxml import parse_xml
+
+from resume_analyzer.extraction import extract_text
+
+_TEXT_BOX = (
+    '<w:r xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+    ' xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+    ' xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape"'
+    ' xmlns:v="urn:schemas-microsoft-com:vml">'
+    '<mc:AlternateContent>'
+    '<mc:Choice Requires="wps"><wps:txbx><w:txbxContent>'
+    '<w:p><w:r><w:t>Contact: jane@example.com</w:t></w:r></w:p>'
+    '</w:txbxContent></wps:txbx></mc:Choice>'
+    '<mc:Fallback><v:textbox><w:txbxContent>'
+    '<w:p><w:r><w:t>Contact: jane@example.com</w:t></w:r></w:p>'
+    '</w:txbxContent></v:textbox></mc:Fallback>'
+    '</mc:AlternateContent></w:r>'
+)
+
+
+def _document():
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = "Jane Doe - Data Engineer"
+    document.add_heading("EXPERIENCE", level=1)
+    document.add_paragraph("Built ETL pipelines in Python\tand SQL")
+    document.add_paragraph("Reduced costs by 30%", style='List Bullet')
+    paragraph = document.add_paragraph("First line")
+    paragraph.add_run().add_break()
+    paragraph.add_run("second line")
+    table = document.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "Skills"
+    table.cell(0, 1).text = "Python, Spark"
+    table.cell(1, 0).text = "Tools"
+    table.cell(1, 1).text = "Airflow"
+    table.cell(1, 1).add_paragraph("dbt")
+    document.add_paragraph("EDUCATION")
+    return document
+
+
+def _render(document):
+    buffer = BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def test_streaming_extraction_matches_python_docx():
+    document = _document()
+    lines = extract_text(_render(document), 'cv.docx').split("\n")
+    header = [paragraph.text for paragraph in document.sections[0].header.paragraphs]
+    body = [paragraph.text for paragraph in document.paragraphs]
+    rows = ["\t".join(" ".join(p.text for p in cell.paragraphs) for cell in row.cells) for row in document.tables[0].rows]
+    # python-docx lists body paragraphs and tables separately; in the file the table precedes the last paragraph
+    expected = header + "\n".join(body[:-1]).split("\n") + rows + body[-1:] + [""]
+    assert lines == expected
+
+
+def test_text_boxes_are_extracted_once():
+    document = _document()
+    paragraph = document.add_paragraph("Anchor")
+    paragraph._p.append(parse_xml(_TEXT_BOX))
+    text = extract_text(_render(document), 'cv.docx')
+    assert "Contact: jane@example.com" not in "".join(p.text for p in docx.Document(BytesIO(_render(document))).paragraphs)
+    assert text.count("Contact: jane@example.com") == 1
+    assert text.endswith("Contact: jane@example.com\nAnchor\n")
+
+
+def test_page_breaks_do_not_split_lines():
+    document = docx.Document()
+    paragraph = document.add_paragraph("Summary")
+    paragraph.add_run().add_break(WD_BREAK.PAGE)
+    paragraph.add_run(" continued")
+    assert extract_text(_render(document), 'cv.docx') == "Summary continued\n"
@@ -0,0 +1,55 @@
+from io import BytesIO
+
+import pytest
+
+from benchmarks.corpus import render_docx, render_pdf
+from resume_analyzer.extraction import PARALLEL_PAGE_THRESHOLD, extract_document, shard_page_ranges
+
+PAGES = 40
+LONG_PDF = render_pdf([f"Page {number} Python SQL" for number in range(PAGES)], lines_per_page=1)
+
+
+def _document(data, name):
+    buffer = BytesIO(data)
+    buffer.name = name
+    return buffer
+
+
+@pytest.mark.parametrize('max_pages, max_chars', [(None, None), (35, None), (None, 300), (50, 200_000)])
+def test_sharded_pdf_extraction_matches_serial(max_pages, max_chars):
+    assert len(shard_page_ranges(PAGES, max_pages, 4)) == 4
+    serial = extract_document(_document(LONG_PDF, 'long.pdf'), max_pages, max_chars)
+    sharded = extract_document(_document(LONG_PDF, 'long.pdf'), max_pages, max_chars, workers=4)
+    assert sharded.text == serial.text
+    assert (sharded.pages, sharded.total_pages, sharded.truncated) == (serial.pages, serial.total_pages, serial.truncated)
+    numbers = [int(line.split()[1]) for line in sharded.text.splitlines() if line.startswith("Page ")]
+    assert numbers == list(range(len(numbers)))
+
+
+def test_short_pdfs_are_not_sharded():
+    assert shard_page_ranges(PARALLEL_PAGE_THRESHOLD - 1, None, 4) == []
+    assert shard_page_ranges(PAGES, 10, 4) == []
+    assert shard_page_ranges(PAGES, None, 1) == []
+
+
+def test_pdf_extraction_stops_at_the_page_budget():
+    result = extract_document(_document(LONG_PDF, 'long.pdf'), max_pages=5, max_chars=None)
+    assert (result.pages, result.total_pages, result.truncated) == (5, PAGES, True)
+    assert result.text.splitlines()[-1].startswith("Page 4 ")
+
+
+def test_pdf_extraction_stops_reading_pages_once_the_character_budget_is_spent():
+    result = extract_document(_document(LONG_PDF, 'long.pdf'), max_pages=None, max_chars=50)
+    assert len(result.text) == 50 and result.truncated
+    assert result.pages < 5
+
+
+@pytest.mark.parametrize('name, data', [
+    ('cv.txt', ("Python developer\n" * 100).encode('utf-8')),
+    ('cv.docx', render_docx(["Python developer"] * 100)),
+])
+def test_text_and_docx_extraction_respect_the_character_budget(name, data):
+    full = extract_document(_document(data, name), max_chars=None)
+    cut = extract_document(_document(data, name), max_chars=40)
+    assert not full.truncated and cut.truncated
+    assert cut.text == full.text[:40]
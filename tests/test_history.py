@@ -0,0 +1,29 @@
+from types import SimpleNamespace
+
+from resume_analyzer.history import HistoryStore, candidate_key, default_history
+
+
+def report(text, score=70):
+    return SimpleNamespace(
+        text=text, role="Data Scientist", ats_score=score, skill_match_pct=50.0, project_quality=40,
+        shortlist_prob=60, verdict="BORDERLINE", found_skills=["python"]
+    )
+
+
+def test_candidate_is_never_the_file_name():
+    assert candidate_key(report("no email here"), document_hash="abc123") == "abc123"
+    assert candidate_key(report("Contact: Jane.Doe@Example.com"), document_hash="abc123") == "jane.doe@example.com"
+
+
+def test_history_is_opt_in(monkeypatch):
+    monkeypatch.delenv('RESUME_ANALYZER_HISTORY_DB', raising=False)
+    assert default_history() is None
+
+
+def test_same_file_name_does_not_merge_trends(tmp_path):
+    store = HistoryStore(str(tmp_path / 'history.db'))
+    first = store.record(report("first person", 60), "hash-1", filename="resume.pdf", analyzed_at=1)
+    second = store.record(report("second person", 80), "hash-2", filename="resume.pdf", analyzed_at=2)
+    assert first.candidate != second.candidate
+    assert len(store.trend(first.candidate, "Data Scientist")) == 1
+    store.close()
@@ -0,0 +1,66 @@
+import hashlib
+from io import BytesIO
+
+import pytest
+
+from benchmarks.corpus import generate_resume, render_docx
+from resume_analyzer.ingest import CHUNK_BYTES, UploadLimits, UploadTooLarge, extract_upload, ingest
+
+
+class _Source(BytesIO):
+    """In-memory upload that counts the bytes read from it"""
+
+    def __init__(self, data, name, size=None):
+        super().__init__(data)
+        self.name = name
+        self.bytes_read = 0
+        if size is not None:
+            self.size = size
+
+    def read(self, n=-1):
+        chunk = super().read(n)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def test_declared_size_over_the_limit_is_rejected_before_reading():
+    source = _Source(b"x" * 10, 'cv.pdf', size=5 * 1024 * 1024)
+    with pytest.raises(UploadTooLarge, match="cv.pdf is larger than the 1 MB upload limit"):
+        ingest(source, limits=UploadLimits(max_bytes=1024 * 1024))
+    assert source.bytes_read == 0
+
+
+def test_stream_over_the_limit_stops_once_the_limit_is_crossed():
+    source = _Source(b"x" * (CHUNK_BYTES * 20), 'cv.txt')
+    with pytest.raises(UploadTooLarge) as raised:
+        ingest(source, limits=UploadLimits(max_bytes=CHUNK_BYTES * 2 + 1))
+    assert raised.value.name == 'cv.txt' and raised.value.max_bytes == CHUNK_BYTES * 2 + 1
+    assert source.bytes_read == CHUNK_BYTES * 3
+
+
+@pytest.mark.parametrize('spool_bytes, spilled', [(1024 * 1024, False), (1024, True)])
+def test_uploads_spill_to_disk_past_the_spool_size(spool_bytes, spilled):
+    data = render_docx(generate_resume(3))
+    with ingest(_Source(data, 'cv.docx'), limits=UploadLimits(spool_bytes=spool_bytes)) as upload:
+        assert upload.spilled is spilled
+        assert (upload.name, upload.size) == ('cv.docx', len(data))
+        assert upload.digest == hashlib.sha256(data).hexdigest()
+        assert upload.read_bytes() == data
+        assert upload.open().name == 'cv.docx'
+        assert "EXPERIENCE" in extract_upload(upload)
+
+
+def test_character_budget_applies_to_ingested_uploads():
+    data = "\n".join(generate_resume(4, length='long')).encode('utf-8')
+    limits = UploadLimits(max_chars=100, spool_bytes=1024)
+    with ingest(_Source(data, 'cv.txt'), limits=limits) as upload:
+        assert extract_upload(upload, limits) == data.decode('utf-8')[:100]
+
+
+def test_limits_from_the_environment(monkeypatch):
+    monkeypatch.setenv('RESUME_ANALYZER_MAX_UPLOAD_MB', '0.5')
+    monkeypatch.setenv('RESUME_ANALYZER_MAX_PAGES', '3')
+    monkeypatch.setenv('RESUME_ANALYZER_SPOOL_MB', '2')
+    limits = UploadLimits.from_env()
+    assert (limits.max_bytes, limits.max_pages, limits.spool_bytes) == (512 * 1024, 3, 2 * 1024 * 1024)
+    assert limits.max_chars == UploadLimits().max_chars
@@ -0,0 +1,27 @@
+from resume_analyzer import analyze_resume
+from resume_analyzer.jd_match import has_job_description, jd_matcher
+
+RESUME = """Jane Doe
+jane@example.com
+SKILLS
+Python, SQL, Docker
+EXPERIENCE
+- Built a REST API in Python, reducing latency by 40%
+"""
+
+
+def test_stop_word_only_job_description_counts_as_absent():
+    assert not has_job_description("the and of")
+    assert not jd_matcher("the and of").has_terms
+
+
+def test_stop_word_only_job_description_is_ignored_by_analysis():
+    report = analyze_resume(RESUME, job_description="and the of")
+    assert report.jd_similarity is None
+    assert report.ats_score == analyze_resume(RESUME).ats_score
+
+
+def test_job_description_with_terms_is_scored():
+    assert has_job_description("Python developer with Docker")
+    report = analyze_resume(RESUME, job_description="Python developer with Docker")
+    assert report.jd_similarity > 0
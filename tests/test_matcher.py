@@ -0,0 +1,79 @@
+import pytest
+
+from resume_analyzer import analyze_resume, matcher
+from resume_analyzer.matcher import TermMatcher
+
+TERMS = ['r', 'go', 'c#', 'python', 'python 3', 'ci/cd', 'unit testing', 'testing', 'node.js']
+
+
+@pytest.fixture(params=['regex', 'walk'])
+def term_matcher(request, monkeypatch):
+    if request.param == 'walk':
+        monkeypatch.setattr(matcher, 'REGEX_MAX_TERMS', 0)
+    return TermMatcher(TERMS)
+
+
+@pytest.mark.parametrize('text', ["led r&d for the lab", "the go-to person for reviews", "r-based tooling"])
+def test_short_terms_are_not_found_in_compounds(term_matcher, text):
+    assert term_matcher.find_terms(text) == set()
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("r, python", {'r', 'python'}),
+    ("go developer", {'go'}),
+    ("r & python", {'r', 'python'}),
+    ("go-1.21 and c#-heavy work", {'go'}),
+    ("python-based unit testing", {'python', 'unit testing', 'testing'}),
+    ("node.js-based ci/cd", {'node.js', 'ci/cd'}),
+    ("react and google", set()),
+    ("python 3 and python", {'python', 'python 3'}),
+    ("python 3-based", {'python', 'python 3'}),
+])
+def test_boundaries(term_matcher, text, expected):
+    assert term_matcher.find_terms(text) == expected
+
+
+PREFIX_TERMS = ['sql', 'sql server', 'react', 'react native', 'go', 'go kit']
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("sql server and react native", {'sql', 'sql server', 'react', 'react native'}),
+    ("sql\nserver", {'sql', 'sql server'}),
+    ("go kit", {'go', 'go kit'}),
+    ("sql servers", {'sql'}),
+    ("sqlserver, mssql", {'sql server'}),
+])
+def test_terms_that_begin_longer_terms_are_reported_by_both_modes(monkeypatch, text, expected):
+    regex = TermMatcher(PREFIX_TERMS, aliases={'mssql': 'sql server', 'sqlserver': 'sql server'})
+    monkeypatch.setattr(matcher, 'REGEX_MAX_TERMS', 0)
+    walker = TermMatcher(PREFIX_TERMS, aliases={'mssql': 'sql server', 'sqlserver': 'sql server'})
+    assert regex.pattern is not None and walker.pattern is None
+    assert sorted(regex.finditer(text)) == sorted(walker.finditer(text))
+    assert regex.find_terms(text) == expected
+
+
+ALIASES = {'k8s': 'kubernetes', 'Postgres': 'postgresql', 'golang': 'go', 'node': 'node.js', 'py': 'unknown', 'python': 'go'}
+
+
+@pytest.mark.parametrize('walk', [False, True])
+def test_aliases_are_reported_as_the_skill_they_stand_for(monkeypatch, walk):
+    if walk:
+        monkeypatch.setattr(matcher, 'REGEX_MAX_TERMS', 0)
+    aliased = TermMatcher(TERMS + ['kubernetes', 'postgresql'], ALIASES)
+    # Aliases of unknown terms, and aliases that are terms themselves, are dropped
+    assert aliased.aliases == {'k8s': 'kubernetes', 'postgres': 'postgresql', 'golang': 'go', 'node': 'node.js'}
+    assert list(aliased.finditer("k8s, golang and postgres on node")) == [
+        (0, 'kubernetes'), (5, 'go'), (16, 'postgresql'), (28, 'node.js')
+    ]
+    assert aliased.find_terms("python with k8ss and nodes") == {'python'}
+    assert aliased.canonical(" K8S ") == 'kubernetes' and aliased.canonical('Python') == 'python'
+    assert 'Golang' in aliased and 'py' not in aliased
+
+
+def test_keyword_match_counts_aliases_on_either_side():
+    role = {'required_skills': ['Kubernetes', 'k8s', 'postgresql'], 'preferred_skills': ['golang', 'rust']}
+    report = analyze_resume("Ran Postgres and K8s clusters in Go", role)
+    assert report.keyword_match['matched_required'] == ['Kubernetes', 'k8s', 'postgresql']
+    assert report.keyword_match['matched_preferred'] == ['golang']
+    assert report.keyword_match['missing_preferred'] == ['rust']
+    assert 'kubernetes' in report.found_skills and 'k8s' not in report.found_skills
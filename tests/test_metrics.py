@@ -0,0 +1,80 @@
+import json
+import logging
+import re
+
+import pytest
+
+from benchmarks.corpus import generate_resume
+from resume_analyzer.cache import ResultCache, cached_analyze
+from resume_analyzer.metrics import default_registry, stage, trace
+
+
+@pytest.fixture
+def registry():
+    registry = default_registry()
+    registry.reset()
+    yield registry
+    registry.reset()
+
+
+def test_trace_records_nested_stages_in_start_order(registry):
+    with trace('analysis', file='cv.txt') as t:
+        with stage('outer', chars=100) as outer:
+            with stage('inner') as inner:
+                inner.cache_hit = True
+            outer.sizes['lines'] = 4
+        with pytest.raises(RuntimeError):
+            with stage('broken'):
+                raise RuntimeError("boom")
+
+    rows = t.stage_table()
+    assert [(row['stage'], row['depth']) for row in rows] == [('outer', 0), ('inner', 1), ('broken', 0)]
+    assert rows[0]['sizes'] == {'chars': 100, 'lines': 4}
+    assert rows[1]['cache_hit'] is True and rows[2]['failed'] is True
+    assert t.to_dict()['file'] == 'cv.txt'
+    snapshot = registry.snapshot()
+    assert snapshot['inner']['cache_hits'] == 1 and snapshot['broken']['failures'] == 1
+
+
+def test_cached_analysis_reports_cache_hits_per_stage(registry):
+    data = "\n".join(generate_resume(1)).encode('utf-8')
+    cache = ResultCache()
+    for _ in range(2):
+        with trace() as t:
+            cached_analyze(data, 'cv.txt', cache=cache)
+    names = [row['stage'] for row in t.stage_table()]
+    assert names == ['analyze']
+    snapshot = registry.snapshot()
+    assert snapshot['analyze']['cache_hits'] == 1 and snapshot['analyze']['cache_misses'] == 1
+    assert {'extract', 'context', 'calculate_ats_score'} <= set(snapshot)
+
+
+def test_prometheus_text_and_log_lines(registry, tmp_path, monkeypatch):
+    path = tmp_path / 'metrics.prom'
+    monkeypatch.setenv('RESUME_ANALYZER_METRICS_FILE', str(path))
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger = logging.getLogger('resume_analyzer.metrics')
+    logger.addHandler(handler)
+    level = logger.level
+    logger.setLevel(logging.INFO)
+    try:
+        with trace('analysis'):
+            with stage('context', chars=1200) as record:
+                record.cache_hit = False
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(level)
+
+    line = json.loads(records[-1].getMessage())
+    assert line['event'] == 'analysis' and line['stages'][0]['sizes'] == {'chars': 1200}
+    text = path.read_text()
+    assert text == registry.render_prometheus()
+    assert 'resume_analyzer_stage_seconds_count{stage="context"} 1' in text
+    assert 'resume_analyzer_stage_seconds_bucket{stage="context",le="+Inf"} 1' in text
+    assert 'resume_analyzer_trace_seconds_count{trace="analysis"} 1' in text
+    assert 'resume_analyzer_stage_cache_total{stage="context",result="miss"} 1' in text
+    assert 'resume_analyzer_stage_input_total{stage="context",unit="chars"} 1200' in text
+    buckets = [int(count) for count in re.findall(r'stage="context",le="[^"]+"} (\d+)', text)]
+    assert buckets == sorted(buckets)
@@ -0,0 +1,40 @@
+from io import BytesIO
+
+import pytest
+
+from benchmarks.corpus import generate_corpus
+from resume_analyzer import JOB_ROLES, analyze_resume
+from resume_analyzer.cache import ResultCache
+from resume_analyzer.ingest import UploadLimits, ingest
+from resume_analyzer.ranking import extract_texts, score_candidates
+
+TEXTS = [document.resume.text for document in generate_corpus(18, seed=3, formats=('txt',))] + ["", "Python"]
+JOB_DESCRIPTION = "We need a data scientist with Python, SQL and machine learning experience."
+
+
+def test_extract_texts_reads_spooled_uploads_within_budgets():
+    data = b"Python developer with SQL\n" * 1000
+    limits = UploadLimits(spool_bytes=1024, max_chars=100)
+    with ingest(BytesIO(data), name='cv.txt', limits=limits) as upload:
+        assert upload.spilled
+        cache = ResultCache()
+        texts = extract_texts([upload, ('copy.txt', data)], workers=2, cache=cache, max_chars=limits.max_chars)
+    assert texts == [data.decode('utf-8')[:100]] * 2
+    # The second extraction of the same bytes within the same budget was a cache hit
+    assert extract_texts([('again.txt', data)], cache=cache, max_chars=100) == texts[:1]
+    assert cache.stats()['memory_hits'] == 1
+
+
+@pytest.mark.parametrize('role', [None, *sorted(JOB_ROLES), {'name': "Custom", 'required_skills': ["k8s", "Go"]}])
+@pytest.mark.parametrize('job_description', [None, JOB_DESCRIPTION])
+def test_vectorized_scores_match_analyze_resume(role, job_description):
+    scores = score_candidates(TEXTS, role, job_description=job_description)
+    for i, text in enumerate(TEXTS):
+        report = analyze_resume(text, role, job_description=job_description)
+        assert scores.ats_score[i] == report.ats_score
+        assert scores.skill_match_pct[i] == pytest.approx(report.skill_match_pct)
+        assert scores.project_quality[i] == report.project_quality
+        assert scores.shortlist_prob[i] == report.shortlist_prob
+        assert scores.verdict[i] == report.verdict
+        if job_description:
+            assert scores.jd_similarity[i] == pytest.approx(report.jd_similarity)
@@ -0,0 +1,70 @@
+import re
+
+from benchmarks.corpus import BULLET_STYLES, generate_resume
+from resume_analyzer.data import PROJECT_KEYWORDS
+from resume_analyzer.rules import LineRuleSet, default_rules
+
+# The per-line checks the analyzers made before the rule table, verbatim
+_WEAK = [r'(responsible for|duties include|task was|job involved)', r'(helped|assisted|participated in)',
+         r'(some|various|different)', r'^[^•\-\*]*[a-z]']
+_STRONG = [r'(developed|created|designed|implemented|led|managed)', r'\d+%|\$\d+|\d+\s*(?:users|clients|hours|days)',
+           r'(improved|optimized|increased|decreased|reduced)']
+_QUANTITY = r'\d+%|\$\d+|\d+\s*(?:x|times|users|clients)'
+_BULLETS = ['•', '-', '*', '·', '○', '▪', '›', '→']
+
+EDGE_CASES = [
+    "", "   ", "• Led a team of 5", "Increased revenue 20%", "$5 saved", "3 x faster", "10\tusers served",
+    "Worked on a data project", "HELPED the team", "- some stuff", "→ arrow bullet", "*STAR*", "1 2 3",
+    "• 40 clients", "  ▪ responsible for deployment", "SKILLS", "python, sql", "Built it in 2 days",
+]
+
+
+def _reference(line):
+    line_lower = line.strip().lower()
+    categories = set()
+    if any(re.search(pattern, line_lower) for pattern in _WEAK):
+        categories.add('weak')
+    if any(re.search(pattern, line_lower) for pattern in _STRONG):
+        categories.add('strong')
+    if re.findall(_QUANTITY, line_lower):
+        categories.add('quantified')
+    if any(keyword in line_lower for keyword in PROJECT_KEYWORDS):
+        categories.add('project')
+    if re.search(r'\d', line_lower):
+        categories.add('number')
+    if any(bullet in line.strip() for bullet in _BULLETS):
+        categories.add('bullet')
+    return categories
+
+
+def _lines():
+    lines = list(EDGE_CASES)
+    for seed, style in enumerate(BULLET_STYLES * 3):
+        lines += generate_resume(seed, 'long', 0.5, style)
+    return lines
+
+
+def test_rule_table_matches_the_per_line_checks():
+    lines = _lines()
+    classes = LineRuleSet().classify("\n".join(lines).lower())
+    assert len(classes) == len(lines)
+    for line, categories in zip(lines, classes):
+        assert set(categories) == _reference(line), line
+
+
+def test_quantities_found_per_line_match_findall():
+    rules = default_rules()
+    for line in _lines():
+        line_lower = line.lower()
+        assert rules.findall('quantified', line_lower) == re.findall(_QUANTITY, line_lower)
+
+
+def test_memoized_classification_matches_a_fresh_scan():
+    rules = LineRuleSet(memo_size=50)
+    lines = [line.lower() for line in _lines()]
+    expected = rules.classify("\n".join(lines))
+    assert rules.classify_lines(lines) == expected
+    # Edited and reordered lines reuse what is remembered and scan the rest
+    revised = lines[::-1] + ["• reduced costs by 30%"]
+    assert rules.classify_lines(revised) == rules.classify("\n".join(revised))
+    assert len(rules._memo) <= 50
@@ -0,0 +1,79 @@
+import pytest
+
+from resume_analyzer.sandbox import ExtractionFailure, ExtractionSandbox, SandboxLimits
+
+
+@pytest.fixture
+def sandbox():
+    sandbox = ExtractionSandbox(SandboxLimits(timeout=30, workers=1))
+    yield sandbox
+    sandbox.close()
+
+
+def test_extracts_text(sandbox):
+    assert sandbox.extract(b"Python developer", 'cv.txt') == "Python developer"
+
+
+def test_parse_errors_are_classified_and_the_worker_is_reused(sandbox):
+    with pytest.raises(ExtractionFailure) as failure:
+        sandbox.extract(b"not a pdf", 'cv.pdf')
+    assert failure.value.kind == 'parse_error'
+    assert sandbox.extract(b"still working", 'cv.txt') == "still working"
+    assert sandbox.restarts == 0
+
+
+def test_timed_out_workers_are_replaced():
+    sandbox = ExtractionSandbox(SandboxLimits(timeout=0.000001, workers=1))
+    try:
+        with pytest.raises(ExtractionFailure) as failure:
+            sandbox.extract(b"x" * 10_000_000, 'cv.txt')
+        assert failure.value.kind == 'timeout'
+        assert sandbox.restarts == 1
+    finally:
+        sandbox.close()
+
+
+def test_long_pdfs_are_split_between_sandbox_workers(monkeypatch):
+    from benchmarks.corpus import render_pdf
+    from resume_analyzer import sandbox as sandbox_module
+    from resume_analyzer.extraction import extract_text
+
+    monkeypatch.delenv('RESUME_ANALYZER_SANDBOX', raising=False)
+    monkeypatch.setenv('RESUME_ANALYZER_EXTRACT_WORKERS', '4')
+    monkeypatch.setattr(sandbox_module, '_default_sandbox', None)
+    requests = []
+    call = sandbox_module._Worker.call
+
+    def recording_call(worker, source, size, request, timeout):
+        requests.append(request)
+        return call(worker, source, size, request, timeout)
+
+    monkeypatch.setattr(sandbox_module._Worker, 'call', recording_call)
+    data = render_pdf([f"Page {number} Python" for number in range(40)], lines_per_page=1)
+    try:
+        text = sandbox_module.extract_isolated(data, 'long.pdf', workers=4)
+    finally:
+        sandbox_module._default_sandbox.close()
+    assert sorted(request for request in requests if request[0] == 'pages') == [
+        ('pages', 0, 10), ('pages', 10, 20), ('pages', 20, 30), ('pages', 30, 40)
+    ]
+    assert text == extract_text(data, 'long.pdf')
+
+
+def _extract_in_child(data):
+    from resume_analyzer.sandbox import extract_isolated
+
+    return extract_isolated(data, 'cv.txt')
+
+
+def test_forked_children_start_their_own_default_sandbox(monkeypatch):
+    import multiprocessing
+
+    from resume_analyzer import sandbox as sandbox_module
+
+    monkeypatch.delenv('RESUME_ANALYZER_SANDBOX', raising=False)
+    parent = sandbox_module.default_sandbox()
+    assert parent.extract(b"parent", 'cv.txt') == "parent"
+    with multiprocessing.get_context('fork').Pool(2) as pool:
+        assert pool.map_async(_extract_in_child, [b"first", b"second"]).get(timeout=60) == ["first", "second"]
+    assert parent.extract(b"still the parent's", 'cv.txt') == "still the parent's"
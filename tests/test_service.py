@@ -0,0 +1,83 @@
+import asyncio
+import base64
+import json
+import threading
+
+import pytest
+
+from resume_analyzer.ingest import UploadLimits
+from resume_analyzer.service import HTTPError, Request, ScoringService, parse_analyze_request, parse_job_request
+
+
+def analyze_request(payload):
+    return Request('POST', '/analyze', {}, {'content-type': 'application/json'}, 'HTTP/1.1', json.dumps(payload).encode())
+
+
+@pytest.mark.parametrize('role', [
+    {'required_skills': "python"},
+    {'required_skills': ["python", 5]},
+    {'preferred_skills': [""]},
+    {'name': 5, 'required_skills': ["python"]},
+])
+def test_badly_typed_custom_roles_are_rejected(role):
+    with pytest.raises(HTTPError) as error:
+        parse_analyze_request(analyze_request({'text': "Python developer", 'role': role}))
+    assert error.value.status == 400
+
+
+def test_custom_role_with_skill_lists_is_accepted():
+    role = {'name': "Backend", 'required_skills': ["python"], 'preferred_skills': ["docker"]}
+    _, _, parsed_role, _ = parse_analyze_request(analyze_request({'text': "Python developer", 'role': role}))
+    assert parsed_role == role
+
+
+def job_request(files):
+    body = json.dumps({'files': files}).encode()
+    return Request('POST', '/jobs', {}, {'content-type': 'application/json', 'content-length': str(len(body))},
+                   'HTTP/1.1'), body
+
+
+def post_job(service, files):
+    request, body = job_request(files)
+
+    async def post():
+        reader = asyncio.StreamReader()
+        reader.feed_data(body)
+        reader.feed_eof()
+        return await service.handle(request, reader)
+
+    return asyncio.run(post())
+
+
+def test_job_items_over_the_upload_limit_are_rejected():
+    request, body = job_request([{'filename': 'cv.pdf', 'file': base64.b64encode(b"x" * 2048).decode()}])
+    request.body = body
+    with pytest.raises(HTTPError) as error:
+        parse_job_request(request, UploadLimits(max_bytes=1024))
+    assert error.value.status == 413
+
+
+def test_job_submissions_are_stored_off_the_event_loop_and_take_a_pending_slot(tmp_path):
+    service = ScoringService(workers=1, max_pending=1, jobs_db=str(tmp_path / 'jobs.db'))
+    threads = []
+    submit = service.jobs.submit
+
+    def recording_submit(*args):
+        threads.append(threading.current_thread())
+        assert service.pending == 1
+        return submit(*args)
+
+    service.jobs.submit = recording_submit
+    try:
+        status, body = post_job(service, [{'text': "Python developer"}])
+        assert status == 202 and body['total'] == 1
+        assert threads and threads[0] is not threading.main_thread()
+        assert service.pending == 0
+
+        service.pending = 1
+        with pytest.raises(HTTPError) as error:
+            post_job(service, [{'text': "Python developer"}])
+        assert error.value.status == 429
+    finally:
+        service.pending = 0
+        service.close()
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from resume_analyzer.skill_index import SkillIndex, decode_postings, encode_postings, parse_query
+
+
+def test_posting_lists_round_trip_through_varints():
+    rng = random.Random(0)
+    for _ in range(50):
+        ids = sorted({rng.randrange(1 << rng.randint(1, 40)) for _ in range(rng.randint(0, 20))})
+        assert decode_postings(encode_postings(ids)).tolist() == ids
+    assert decode_postings(encode_postings([0, 127, 128, 16_383, 16_384])).tolist() == [0, 127, 128, 16_383, 16_384]
+
+
+def test_not_binds_tightest_then_and_then_or():
+    term = lambda name: ('term', name)
+    assert parse_query('python aws OR gcp AND NOT intern') == ('or', [
+        ('and', [term('python'), term('aws')]),
+        ('and', [term('gcp'), ('not', term('intern'))])
+    ])
+    assert parse_query('NOT (python or "Machine  Learning")') == (
+        'not', ('or', [term('python'), term('machine learning')])
+    )
+    # Aliases are searched as the skill they stand for
+    assert parse_query('k8s') == term('kubernetes')
+
+
+@pytest.mark.parametrize('query', ["", "(python", "python AND", "OR python", "python )"])
+def test_malformed_queries_are_rejected(query):
+    with pytest.raises(ValueError):
+        parse_query(query)
+
+
+def test_search_matches_set_logic(tmp_path):
+    rng = random.Random(1)
+    vocabulary = ['python', 'sql', 'aws', 'gcp', 'intern', 'docker']
+    documents = {f"cv{i}": set(rng.sample(vocabulary, rng.randint(0, 4))) for i in range(200)}
+    index = SkillIndex()
+    for resume_id, terms in documents.items():
+        index.add(resume_id, terms)
+    # Re-adding replaces a resume's terms; removing drops it
+    documents['cv3'] = {'python', 'gcp'}
+    index.add('cv3', documents['cv3'])
+    index.remove('cv4')
+    del documents['cv4']
+    path = str(tmp_path / 'index.pkl')
+    index.save(path)
+    loaded = SkillIndex.load(path)
+
+    queries = {
+        'python AND sql': lambda terms: {'python', 'sql'} <= terms,
+        'python AND (aws OR gcp) AND NOT intern': lambda terms: 'python' in terms and bool(terms & {'aws', 'gcp'}) and 'intern' not in terms,
+        'NOT docker': lambda terms: 'docker' not in terms,
+        'rust OR intern': lambda terms: 'intern' in terms,
+    }
+    for query, predicate in queries.items():
+        expected = sorted((resume_id for resume_id, terms in documents.items() if predicate(terms)))
+        for searched in (index, loaded):
+            assert sorted(searched.search(query)) == expected
+            assert searched.count(query) == len(expected)
@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.corpus import render_pdf
+from benchmarks.startup import LAZY_MODULES, TARGETS, ModuleCost, StartupResult, check, measure, parse_importtime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize('target', TARGETS)
+def test_entry_points_do_not_import_heavy_libraries(target):
+    assert measure(target, runs=1).lazy_violations() == []
+
+
+def test_heavy_libraries_load_when_their_code_path_runs(tmp_path):
+    path = tmp_path / 'cv.pdf'
+    path.write_bytes(render_pdf(["Python developer"]))
+    code = (
+        "import sys\n"
+        "from resume_analyzer import analyze_resume\n"
+        "analyze_resume('Python developer')\n"
+        "before = sorted(name for name in ('PyPDF2', 'docx') if name in sys.modules)\n"
+        f"analyze_resume(open({str(path)!r}, 'rb').read(), filename='cv.pdf')\n"
+        "print(before, 'PyPDF2' in sys.modules, 'docx' in sys.modules)\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[] True False"
+
+
+def test_check_reports_eager_imports_and_slow_starts():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   numpy.core\n"
+        "import time:       300 |        420 | resume_analyzer\n"
+    )
+    modules = parse_importtime(stderr)
+    assert modules[1] == ModuleCost('resume_analyzer', 0.3, 0.42, 0)
+    assert modules[0].depth == 1
+    result = StartupResult('resume_analyzer', 200.0, 250.0, modules)
+    assert result.lazy_violations() == ['numpy'] and 'numpy' in LAZY_MODULES
+    problems = check([result], {'targets': {'resume_analyzer': {'import_ms': 100.0}}})
+    assert problems == [
+        "resume_analyzer imports numpy at startup",
+        "resume_analyzer: import 200.0 ms vs baseline 100.0 ms"
+    ]
+    assert check([StartupResult('resume_analyzer', 110.0, 150.0, [])], {'targets': {'resume_analyzer': {'import_ms': 100.0}}}) == []
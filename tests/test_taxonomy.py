@@ -0,0 +1,46 @@
+import json
+import os
+
+import pytest
+
+from resume_analyzer import taxonomy
+from resume_analyzer.taxonomy import current_taxonomy, parse_taxonomy
+
+BAD_JSON = [
+    {"tech_skills": {"x": 5}},
+    {"job_roles": {"r": {"required_skills": 5}}},
+    {"job_roles": {"r": {"required_skills": "python"}}},
+    {"action_verbs": {"a": [1]}},
+    {"skill_aliases": {"k": 5}},
+]
+
+
+@pytest.mark.parametrize('tables', BAD_JSON)
+def test_wrong_shape_json_is_a_value_error(tables):
+    with pytest.raises(ValueError):
+        parse_taxonomy(json.dumps(tables).encode(), 'skills.json')
+
+
+def test_malformed_csv_is_a_value_error():
+    with pytest.raises(ValueError):
+        parse_taxonomy(b'kind,group,term\nskill,"Languages,rust\n', 'skills.csv')
+
+
+def test_bad_reload_keeps_the_current_taxonomy(tmp_path, monkeypatch):
+    path = tmp_path / 'skills.json'
+    path.write_text(json.dumps({"tech_skills": {"Languages": ["rust"]}}))
+    monkeypatch.setenv('RESUME_ANALYZER_TAXONOMY', str(path))
+    monkeypatch.setenv('RESUME_ANALYZER_TAXONOMY_CACHE', str(tmp_path / 'cache'))
+    monkeypatch.setattr(taxonomy, '_loaded', None)
+    monkeypatch.setattr(taxonomy, 'RELOAD_CHECK_SECONDS', 0)
+    good = current_taxonomy()
+
+    path.write_text(json.dumps({"tech_skills": {"Languages": 5}}))
+    os.utime(path, ns=(1, 1))
+    assert current_taxonomy() is good
+
+    # The failed version is remembered, so it is not parsed again
+    calls = []
+    monkeypatch.setattr(taxonomy, 'load_taxonomy', lambda *args: calls.append(args))
+    assert current_taxonomy() is good
+    assert calls == []